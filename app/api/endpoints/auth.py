@@ -1,55 +1,39 @@
 from datetime import timedelta
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import HTTPBasic, HTTPBasicCredentials, OAuth2PasswordBearer
-from jose import JWTError, jwt
 
-from core.database import get_db
-from core.security import verify_password, create_access_token, get_password_hash
+from core.security import verify_password, token_verifier, verify_token
+from core.users import UserStore, get_user_store
 from core.config import settings
 
 router = APIRouter()
 security = HTTPBasic()
 
-# Simple user store for MVP (in production, use proper user management)
-USERS = {
-    "admin": {
-        "username": "admin",
-        "hashed_password": get_password_hash("admin"),
-        "full_name": "Administrator"
-    }
-}
-
 # OAuth2 scheme for JWT tokens
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
 
-def get_current_user(token: str = Depends(oauth2_scheme)):
-    """Dependency to get current user from JWT token"""
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None:
-            raise credentials_exception
-    except JWTError:
-        raise credentials_exception
+async def get_current_user(token: str = Depends(oauth2_scheme), users: UserStore = Depends(get_user_store)):
+    """Dependency to get current user from JWT token
 
-    user = USERS.get(username)
-    if user is None:
-        raise credentials_exception
+    Verified tokens are cached, so repeat requests skip the signature check.
+    Async so the hot path does not hop through the threadpool.
+    """
+    username = verify_token(token)
+    if username is None or await users.get_user(username) is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
 
     return username
 
 
 @router.post("/login")
-async def login(credentials: HTTPBasicCredentials = Depends(security)):
+async def login(credentials: HTTPBasicCredentials = Depends(security), users: UserStore = Depends(get_user_store)):
     """Login endpoint with basic auth"""
-    user = USERS.get(credentials.username)
+    user = await users.get_user(credentials.username)
 
     if not user or not verify_password(credentials.password, user["hashed_password"]):
         raise HTTPException(
@@ -59,16 +43,22 @@ async def login(credentials: HTTPBasicCredentials = Depends(security)):
         )
 
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
+    access_token = await token_verifier.issue(
         data={"sub": user["username"]}, expires_delta=access_token_expires
     )
 
     return {"access_token": access_token, "token_type": "bearer"}
 
+@router.post("/logout")
+async def logout(token: str = Depends(oauth2_scheme), current_user: str = Depends(get_current_user)):
+    """Revoke the token of the request"""
+    await token_verifier.revoke(token)
+    return {"detail": "Logged out"}
+
 @router.get("/me")
-async def read_users_me(current_user: str = Depends(get_current_user)):
+async def read_users_me(current_user: str = Depends(get_current_user), users: UserStore = Depends(get_user_store)):
     """Get current user info"""
-    user = USERS.get(current_user)
+    user = await users.get_user(current_user)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
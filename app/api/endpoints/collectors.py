@@ -0,0 +1,18 @@
+from typing import Any, Dict, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from api.endpoints.auth import get_current_user
+from collectors.registry import COSTS, get_registry
+
+router = APIRouter()
+
+@router.get("/")
+async def list_collectors(
+    entity_type: Optional[str] = Query(None),
+    max_cost: Optional[str] = Query(None),
+    current_user: str = Depends(get_current_user)
+) -> List[Dict[str, Any]]:
+    """List the registered collectors with their target, cost class and rate limit"""
+    if max_cost and max_cost not in COSTS:
+        raise HTTPException(status_code=400, detail=f"max_cost must be one of {', '.join(COSTS)}")
+    return [spec.to_dict() for spec in get_registry().specs(entity_type, max_cost)]
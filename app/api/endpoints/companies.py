@@ -1,8 +1,191 @@
-from fastapi import APIRouter
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.database import get_db
+from api.unit_of_work import get_unit_of_work
+from utils.bulk import detect_format, iter_records
+from utils.pagination import decode_cursor, next_cursor
+from utils.streaming import sse_stream
+from api.endpoints.auth import get_current_user
+from services.companies_service import CompaniesService
+from schemas.company import Company, CompanyCreate, CompanyUpdate
 
 router = APIRouter()
 
+@router.get("/", response_model=List[Company])
+async def read_companies(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: str = Depends(get_current_user)
+):
+    """Get all companies, paged with the cursor returned in X-Next-Cursor"""
+    try:
+        after_id = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    service = CompaniesService(db)
+    page = await service.get_companies(skip=skip, limit=limit, after_id=after_id)
+    cursor = next_cursor(page, limit)
+    if cursor:
+        response.headers["X-Next-Cursor"] = cursor
+    return page
+
+@router.get("/export")
+async def export_companies(
+    db: AsyncSession = Depends(get_db),
+    current_user: str = Depends(get_current_user)
+):
+    """Stream all companies as NDJSON"""
+    service = CompaniesService(db)
+    return StreamingResponse(service.export_companies(), media_type="application/x-ndjson")
+
+@router.post("/", response_model=Company)
+async def create_company(
+    company: CompanyCreate,
+    db: AsyncSession = Depends(get_unit_of_work),
+    current_user: str = Depends(get_current_user)
+):
+    """Create a new company"""
+    service = CompaniesService(db)
+    return await service.create_company(company)
+
+@router.post("/bulk")
+async def bulk_upsert_companies(
+    request: Request,
+    format: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: str = Depends(get_current_user)
+):
+    """Upsert companies from an NDJSON or CSV request body"""
+    try:
+        fmt = detect_format(request.headers.get("content-type"), format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    service = CompaniesService(db)
+    return await service.bulk_upsert_companies(iter_records(request.stream(), fmt))
+
+@router.get("/{company_id}", response_model=Company)
+async def read_company(
+    company_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: str = Depends(get_current_user)
+):
+    """Get company by ID"""
+    service = CompaniesService(db)
+    db_company = await service.get_company(company_id)
+    if db_company is None:
+        raise HTTPException(status_code=404, detail="Company not found")
+    return db_company
+
+@router.put("/{company_id}", response_model=Company)
+async def update_company(
+    company_id: int,
+    company: CompanyUpdate,
+    db: AsyncSession = Depends(get_unit_of_work),
+    current_user: str = Depends(get_current_user)
+):
+    """Update a company"""
+    service = CompaniesService(db)
+    db_company = await service.update_company(company_id, company)
+    if db_company is None:
+        raise HTTPException(status_code=404, detail="Company not found")
+    return db_company
+
+@router.delete("/{company_id}")
+async def delete_company(
+    company_id: int,
+    db: AsyncSession = Depends(get_unit_of_work),
+    current_user: str = Depends(get_current_user)
+):
+    """Delete a company"""
+    service = CompaniesService(db)
+    success = await service.delete_company(company_id)
+    if not success:
+        raise HTTPException(status_code=404, detail="Company not found")
+    return {"message": "Company deleted successfully"}
+
+# OSINT collection endpoints
+@router.post("/{company_id}/collect")
+async def collect_all_data(
+    company_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: str = Depends(get_current_user)
+):
+    """Run every applicable collector for a company concurrently"""
+    service = CompaniesService(db)
+    company = await service.get_company(company_id)
+    if not company:
+        raise HTTPException(status_code=404, detail="Company not found")
+
+    return await service.collect_all(company)
+
+@router.post("/{company_id}/collect/domain")
+async def collect_domain_data(
+    company_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: str = Depends(get_current_user)
+):
+    """Collect domain registration data for a company"""
+    service = CompaniesService(db)
+    company = await service.get_company(company_id)
+    if not company or not company.domain:
+        raise HTTPException(status_code=404, detail="Company not found or no domain")
+
+    result = await service.collect_domain_data(company.domain)
+    return result
+
+@router.post("/{company_id}/collect/ruc")
+async def collect_ruc_data(
+    company_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: str = Depends(get_current_user)
+):
+    """Collect RUC data for a company"""
+    service = CompaniesService(db)
+    company = await service.get_company(company_id)
+    if not company or not company.ruc:
+        raise HTTPException(status_code=404, detail="Company not found or no RUC")
+
+    result = await service.collect_ruc_data(company.ruc)
+    return result
+
+@router.post("/{company_id}/collect/social")
+async def collect_social_data(
+    company_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: str = Depends(get_current_user)
+):
+    """Collect social media profiles for a company"""
+    service = CompaniesService(db)
+    company = await service.get_company(company_id)
+    if not company or not company.name:
+        raise HTTPException(status_code=404, detail="Company not found or no name")
+
+    result = await service.collect_social_data(company.name)
+    return result
+
+@router.get("/{company_id}/collect/stream")
+async def stream_collection(
+    company_id: int,
+    collectors: Optional[List[str]] = Query(None),
+    db: AsyncSession = Depends(get_db),
+    current_user: str = Depends(get_current_user)
+):
+    """Stream each partial result of the applicable (or named) collectors as Server-Sent Events"""
+    service = CompaniesService(db)
+    company = await service.get_company(company_id)
+    if not company:
+        raise HTTPException(status_code=404, detail="Company not found")
 
-@router.get("/")
-async def root():
-	return {"message": "companies endpoint"}
+    return StreamingResponse(
+        sse_stream(service.stream_all(company, collectors)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
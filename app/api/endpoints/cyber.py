@@ -1,8 +1,197 @@
-from fastapi import APIRouter
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.database import get_db
+from api.unit_of_work import get_unit_of_work
+from utils.bulk import detect_format, iter_records
+from utils.pagination import decode_cursor, next_cursor
+from utils.streaming import sse_stream
+from api.endpoints.auth import get_current_user
+from services.cyber_service import CyberService, DuplicateDomainError
+from schemas.cyber import CyberAsset, CyberAssetCreate, CyberAssetUpdate
 
 router = APIRouter()
 
+@router.get("/", response_model=List[CyberAsset])
+async def read_cyber_assets(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: str = Depends(get_current_user)
+):
+    """Get all cyber assets, paged with the cursor returned in X-Next-Cursor"""
+    try:
+        after_id = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    service = CyberService(db)
+    page = await service.get_cyber_assets(skip=skip, limit=limit, after_id=after_id)
+    cursor = next_cursor(page, limit)
+    if cursor:
+        response.headers["X-Next-Cursor"] = cursor
+    return page
+
+@router.get("/export")
+async def export_cyber_assets(
+    db: AsyncSession = Depends(get_db),
+    current_user: str = Depends(get_current_user)
+):
+    """Stream all cyber assets as NDJSON"""
+    service = CyberService(db)
+    return StreamingResponse(service.export_cyber_assets(), media_type="application/x-ndjson")
+
+@router.post("/", response_model=CyberAsset)
+async def create_cyber_asset(
+    asset: CyberAssetCreate,
+    db: AsyncSession = Depends(get_unit_of_work),
+    current_user: str = Depends(get_current_user)
+):
+    """Create a new cyber asset"""
+    service = CyberService(db)
+    try:
+        return await service.create_cyber_asset(asset)
+    except DuplicateDomainError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+@router.post("/bulk")
+async def bulk_upsert_cyber_assets(
+    request: Request,
+    format: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: str = Depends(get_current_user)
+):
+    """Upsert cyber assets from an NDJSON or CSV request body"""
+    try:
+        fmt = detect_format(request.headers.get("content-type"), format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    service = CyberService(db)
+    return await service.bulk_upsert_cyber_assets(iter_records(request.stream(), fmt))
+
+@router.get("/{asset_id}", response_model=CyberAsset)
+async def read_cyber_asset(
+    asset_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: str = Depends(get_current_user)
+):
+    """Get cyber asset by ID"""
+    service = CyberService(db)
+    db_asset = await service.get_cyber_asset(asset_id)
+    if db_asset is None:
+        raise HTTPException(status_code=404, detail="Cyber asset not found")
+    return db_asset
+
+@router.put("/{asset_id}", response_model=CyberAsset)
+async def update_cyber_asset(
+    asset_id: int,
+    asset: CyberAssetUpdate,
+    db: AsyncSession = Depends(get_unit_of_work),
+    current_user: str = Depends(get_current_user)
+):
+    """Update a cyber asset"""
+    service = CyberService(db)
+    try:
+        db_asset = await service.update_cyber_asset(asset_id, asset)
+    except DuplicateDomainError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if db_asset is None:
+        raise HTTPException(status_code=404, detail="Cyber asset not found")
+    return db_asset
+
+@router.delete("/{asset_id}")
+async def delete_cyber_asset(
+    asset_id: int,
+    db: AsyncSession = Depends(get_unit_of_work),
+    current_user: str = Depends(get_current_user)
+):
+    """Delete a cyber asset"""
+    service = CyberService(db)
+    success = await service.delete_cyber_asset(asset_id)
+    if not success:
+        raise HTTPException(status_code=404, detail="Cyber asset not found")
+    return {"message": "Cyber asset deleted successfully"}
+
+# OSINT collection endpoints
+@router.post("/{asset_id}/collect")
+async def collect_all_data(
+    asset_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: str = Depends(get_current_user)
+):
+    """Run every applicable collector for a cyber asset concurrently"""
+    service = CyberService(db)
+    asset = await service.get_cyber_asset(asset_id)
+    if not asset:
+        raise HTTPException(status_code=404, detail="Cyber asset not found")
+
+    return await service.collect_all(asset)
+
+@router.post("/{asset_id}/collect/dns")
+async def collect_dns_data(
+    asset_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: str = Depends(get_current_user)
+):
+    """Collect DNS records for a cyber asset"""
+    service = CyberService(db)
+    asset = await service.get_cyber_asset(asset_id)
+    if not asset or not asset.domain:
+        raise HTTPException(status_code=404, detail="Cyber asset not found or no domain")
+
+    result = await service.collect_dns_data(asset.domain)
+    return result
+
+@router.post("/{asset_id}/collect/subdomains")
+async def collect_subdomain_data(
+    asset_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: str = Depends(get_current_user)
+):
+    """Enumerate subdomains for a cyber asset"""
+    service = CyberService(db)
+    asset = await service.get_cyber_asset(asset_id)
+    if not asset or not asset.domain:
+        raise HTTPException(status_code=404, detail="Cyber asset not found or no domain")
+
+    result = await service.collect_subdomain_data(asset.domain)
+    return result
+
+@router.post("/{asset_id}/collect/whois")
+async def collect_whois_data(
+    asset_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: str = Depends(get_current_user)
+):
+    """Collect WHOIS information for a cyber asset"""
+    service = CyberService(db)
+    asset = await service.get_cyber_asset(asset_id)
+    if not asset or not asset.domain:
+        raise HTTPException(status_code=404, detail="Cyber asset not found or no domain")
+
+    result = await service.collect_whois_data(asset.domain)
+    return result
+
+@router.get("/{asset_id}/collect/stream")
+async def stream_collection(
+    asset_id: int,
+    collectors: Optional[List[str]] = Query(None),
+    db: AsyncSession = Depends(get_db),
+    current_user: str = Depends(get_current_user)
+):
+    """Stream each partial result of the applicable (or named) collectors as Server-Sent Events"""
+    service = CyberService(db)
+    asset = await service.get_cyber_asset(asset_id)
+    if not asset:
+        raise HTTPException(status_code=404, detail="Cyber asset not found")
 
-@router.get("/")
-async def root():
-	return {"message": "cyber endpoint"}
+    return StreamingResponse(
+        sse_stream(service.stream_all(asset, collectors)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
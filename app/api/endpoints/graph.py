@@ -0,0 +1,28 @@
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from core.database import get_db
+from api.endpoints.auth import get_current_user
+from services.graph_service import GraphService
+from schemas.graph import EdgeType, Graph
+
+router = APIRouter()
+
+@router.get("/{entity_type}/{entity_id}", response_model=Graph)
+async def read_graph(
+    entity_type: Literal["person", "company", "cyber_asset"],
+    entity_id: int,
+    depth: int = Query(2, ge=1, le=settings.GRAPH_MAX_DEPTH),
+    edge_types: Optional[List[EdgeType]] = Query(None),
+    max_nodes: int = Query(settings.GRAPH_DEFAULT_MAX_NODES, ge=1, le=settings.GRAPH_MAX_NODES),
+    db: AsyncSession = Depends(get_db),
+    current_user: str = Depends(get_current_user)
+):
+    """Get the subgraph of entities linked to an entity within depth hops"""
+    service = GraphService(db)
+    graph = await service.traverse(entity_type, entity_id, depth=depth, edge_types=edge_types, max_nodes=max_nodes)
+    if graph is None:
+        raise HTTPException(status_code=404, detail="Entity not found")
+    return graph
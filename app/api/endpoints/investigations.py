@@ -1,13 +1,246 @@
-from fastapi import APIRouter
+import asyncio
+from datetime import datetime
+from typing import AsyncIterator, List, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from core.database import get_db
+from api.unit_of_work import get_unit_of_work
+from utils.pagination import decode_cursor, encode_cursor, next_cursor
+from utils.streaming import sse_event
+from api.endpoints.auth import get_current_user
+from services.investigation_service import InvestigationService
+from schemas.finding import Finding, FindingCreate
+from schemas.investigation import (
+    Investigation, InvestigationCreate, InvestigationUpdate,
+    InvestigationRun, InvestigationTarget, InvestigationTargetCreate,
+)
+from schemas.job import Job
+from tasks.jobs import job_queue, FINISHED_STATES, INVESTIGATION
 
 router = APIRouter()
 
+def _after_id(cursor: Optional[str]) -> Optional[int]:
+    try:
+        return decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+async def _get_investigation_or_404(service: InvestigationService, investigation_id: int):
+    db_investigation = await service.get_investigation(investigation_id)
+    if db_investigation is None:
+        raise HTTPException(status_code=404, detail="Investigation not found")
+    return db_investigation
+
+@router.get("/", response_model=List[Investigation])
+async def read_investigations(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: str = Depends(get_current_user)
+):
+    """Get all investigations, paged with the cursor returned in X-Next-Cursor"""
+    after_id = _after_id(cursor)
+    service = InvestigationService(db)
+    page = await service.get_investigations(skip=skip, limit=limit, after_id=after_id)
+    cursor = next_cursor(page, limit)
+    if cursor:
+        response.headers["X-Next-Cursor"] = cursor
+    return page
+
+@router.post("/", response_model=Investigation)
+async def create_investigation(
+    investigation: InvestigationCreate,
+    db: AsyncSession = Depends(get_unit_of_work),
+    current_user: str = Depends(get_current_user)
+):
+    """Create a new investigation"""
+    service = InvestigationService(db)
+    return await service.create_investigation(investigation)
+
+@router.get("/{investigation_id}", response_model=Investigation)
+async def read_investigation(
+    investigation_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: str = Depends(get_current_user)
+):
+    """Get investigation by ID"""
+    service = InvestigationService(db)
+    return await _get_investigation_or_404(service, investigation_id)
+
+@router.put("/{investigation_id}", response_model=Investigation)
+async def update_investigation(
+    investigation_id: int,
+    investigation: InvestigationUpdate,
+    db: AsyncSession = Depends(get_unit_of_work),
+    current_user: str = Depends(get_current_user)
+):
+    """Update an investigation"""
+    service = InvestigationService(db)
+    db_investigation = await service.update_investigation(investigation_id, investigation)
+    if db_investigation is None:
+        raise HTTPException(status_code=404, detail="Investigation not found")
+    return db_investigation
+
+@router.delete("/{investigation_id}")
+async def delete_investigation(
+    investigation_id: int,
+    db: AsyncSession = Depends(get_unit_of_work),
+    current_user: str = Depends(get_current_user)
+):
+    """Delete an investigation with its targets and findings"""
+    service = InvestigationService(db)
+    success = await service.delete_investigation(investigation_id)
+    if not success:
+        raise HTTPException(status_code=404, detail="Investigation not found")
+    return {"message": "Investigation deleted successfully"}
+
+@router.get("/{investigation_id}/targets", response_model=List[InvestigationTarget])
+async def read_targets(
+    investigation_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: str = Depends(get_current_user)
+):
+    """Get the entities targeted by an investigation"""
+    service = InvestigationService(db)
+    await _get_investigation_or_404(service, investigation_id)
+    return await service.get_targets(investigation_id)
+
+@router.post("/{investigation_id}/targets", response_model=InvestigationTarget)
+async def add_target(
+    investigation_id: int,
+    target: InvestigationTargetCreate,
+    db: AsyncSession = Depends(get_unit_of_work),
+    current_user: str = Depends(get_current_user)
+):
+    """Link a person, company or cyber asset to an investigation"""
+    service = InvestigationService(db)
+    await _get_investigation_or_404(service, investigation_id)
+    db_target = await service.add_target(investigation_id, target.entity_type, target.entity_id)
+    if db_target is None:
+        raise HTTPException(status_code=404, detail="Target entity not found")
+    return db_target
+
+@router.delete("/{investigation_id}/targets/{target_id}")
+async def remove_target(
+    investigation_id: int,
+    target_id: int,
+    db: AsyncSession = Depends(get_unit_of_work),
+    current_user: str = Depends(get_current_user)
+):
+    """Unlink a target from an investigation"""
+    service = InvestigationService(db)
+    if not await service.remove_target(investigation_id, target_id):
+        raise HTTPException(status_code=404, detail="Target not found")
+    return {"message": "Target removed successfully"}
+
+@router.post("/{investigation_id}/run", response_model=Job, status_code=status.HTTP_202_ACCEPTED)
+async def run_investigation(
+    investigation_id: int,
+    run: Optional[InvestigationRun] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: str = Depends(get_current_user)
+):
+    """Queue a collection run over every target of an investigation
+
+    Follow it with GET /{investigation_id}/events, or poll the job.
+    """
+    service = InvestigationService(db)
+    await _get_investigation_or_404(service, investigation_id)
+    return await job_queue.submit(INVESTIGATION, investigation_id, run.collectors if run else None)
+
+async def _progress_events(investigation_id: int, job_id: Optional[int], after_id: Optional[int]) -> AsyncIterator[str]:
+    """Stream new findings and job status changes until the run is over"""
+    last_status = None
+    while True:
+        async with job_queue.session_factory() as session:
+            findings = await InvestigationService(session).get_findings(
+                investigation_id, after_id=after_id, limit=settings.EXPORT_BATCH_SIZE
+            )
+        for finding in findings:
+            after_id = finding.id
+            yield sse_event("finding", Finding.model_validate(finding, from_attributes=True).model_dump_json(), id=encode_cursor(finding.id))
+
+        job = await job_queue.get(job_id) if job_id is not None else None
+        if job is not None and job.status != last_status:
+            last_status = job.status
+            yield sse_event("status", {"job_id": job.id, "status": job.status, "error": job.error})
+
+        if findings:
+            continue
+        if job is None or job.status in FINISHED_STATES:
+            yield sse_event("end", {"job_id": job_id, "status": last_status})
+            return
+        await asyncio.sleep(settings.JOBS_POLL_INTERVAL)
+
+@router.get("/{investigation_id}/events")
+async def stream_investigation_events(
+    investigation_id: int,
+    job_id: Optional[int] = None,
+    cursor: Optional[str] = None,
+    last_event_id: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db),
+    current_user: str = Depends(get_current_user)
+):
+    """Stream the findings and status of a run as Server-Sent Events
+
+    Follows job_id, or the latest run of the investigation. A reconnecting
+    client resumes after the Last-Event-ID it received.
+    """
+    after_id = _after_id(last_event_id or cursor)
+    service = InvestigationService(db)
+    await _get_investigation_or_404(service, investigation_id)
+    if job_id is None:
+        latest = await job_queue.latest(INVESTIGATION, investigation_id)
+        job_id = latest.id if latest else None
+
+    return StreamingResponse(
+        _progress_events(investigation_id, job_id, after_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.get("/{investigation_id}/findings", response_model=List[Finding])
+async def read_findings(
+    investigation_id: int,
+    response: Response,
+    collector: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    db: AsyncSession = Depends(get_db),
+    current_user: str = Depends(get_current_user)
+):
+    """Get the findings of an investigation, paged with the cursor returned in X-Next-Cursor
 
-@router.get("/")
-async def root():
-    return {"message": "investigations endpoint"}
+    Polling with the cursor of the last page returns only newer findings.
+    """
+    after_id = _after_id(cursor)
+    service = InvestigationService(db)
+    await _get_investigation_or_404(service, investigation_id)
 
+    page = await service.get_findings(
+        investigation_id, collector=collector, since=since, until=until, after_id=after_id, limit=limit
+    )
+    # Also set on a short page, so a client can poll for findings appended later
+    last = page[-1].id if page else after_id
+    if last is not None:
+        response.headers["X-Next-Cursor"] = encode_cursor(last)
+    return page
 
-@router.get("/status")
-async def status():
-    return {"status": "ok"}
+@router.post("/{investigation_id}/findings", response_model=Finding)
+async def create_finding(
+    investigation_id: int,
+    finding: FindingCreate,
+    db: AsyncSession = Depends(get_unit_of_work),
+    current_user: str = Depends(get_current_user)
+):
+    """Append a finding to an investigation"""
+    service = InvestigationService(db)
+    await _get_investigation_or_404(service, investigation_id)
+    return await service.add_finding(investigation_id, finding)
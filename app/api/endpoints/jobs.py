@@ -0,0 +1,50 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from api.endpoints.auth import get_current_user
+from schemas.job import Job, JobCreate, JobResult
+from tasks.jobs import job_queue, FINISHED_STATES
+
+router = APIRouter()
+
+@router.post("/", response_model=Job, status_code=status.HTTP_202_ACCEPTED)
+async def submit_job(
+    job: JobCreate,
+    current_user: str = Depends(get_current_user)
+):
+    """Queue a collection job for an entity"""
+    return await job_queue.submit(job.entity_type, job.entity_id, job.collectors)
+
+@router.get("/{job_id}", response_model=Job)
+async def read_job(
+    job_id: int,
+    current_user: str = Depends(get_current_user)
+):
+    """Get the status of a job"""
+    db_job = await job_queue.get(job_id)
+    if db_job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return db_job
+
+@router.get("/{job_id}/result", response_model=JobResult)
+async def read_job_result(
+    job_id: int,
+    current_user: str = Depends(get_current_user)
+):
+    """Get the result of a finished job"""
+    db_job = await job_queue.get(job_id)
+    if db_job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if db_job.status not in FINISHED_STATES:
+        raise HTTPException(status_code=409, detail=f"Job is {db_job.status}")
+    return db_job
+
+@router.post("/{job_id}/cancel", response_model=Job)
+async def cancel_job(
+    job_id: int,
+    current_user: str = Depends(get_current_user)
+):
+    """Cancel a queued or running job"""
+    db_job = await job_queue.cancel(job_id)
+    if db_job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return db_job
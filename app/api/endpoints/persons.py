@@ -1,8 +1,13 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.database import get_db
+from api.unit_of_work import get_unit_of_work
+from utils.bulk import detect_format, iter_records
+from utils.pagination import decode_cursor, next_cursor
+from utils.streaming import sse_stream
 from api.endpoints.auth import get_current_user
 from services.person_service import PersonService
 from schemas.person import Person, PersonCreate, PersonUpdate
@@ -11,25 +16,61 @@ router = APIRouter()
 
 @router.get("/", response_model=List[Person])
 async def read_persons(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     db: AsyncSession = Depends(get_db),
     current_user: str = Depends(get_current_user)
 ):
-    """Get all persons"""
+    """Get all persons, paged with the cursor returned in X-Next-Cursor"""
+    try:
+        after_id = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
     service = PersonService(db)
-    return await service.get_persons(skip=skip, limit=limit)
+    page = await service.get_persons(skip=skip, limit=limit, after_id=after_id)
+    cursor = next_cursor(page, limit)
+    if cursor:
+        response.headers["X-Next-Cursor"] = cursor
+    return page
+
+@router.get("/export")
+async def export_persons(
+    db: AsyncSession = Depends(get_db),
+    current_user: str = Depends(get_current_user)
+):
+    """Stream all persons as NDJSON"""
+    service = PersonService(db)
+    return StreamingResponse(service.export_persons(), media_type="application/x-ndjson")
 
 @router.post("/", response_model=Person)
 async def create_person(
     person: PersonCreate,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_unit_of_work),
     current_user: str = Depends(get_current_user)
 ):
     """Create a new person"""
     service = PersonService(db)
     return await service.create_person(person)
 
+@router.post("/bulk")
+async def bulk_upsert_persons(
+    request: Request,
+    format: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: str = Depends(get_current_user)
+):
+    """Upsert persons from an NDJSON or CSV request body"""
+    try:
+        fmt = detect_format(request.headers.get("content-type"), format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    service = PersonService(db)
+    return await service.bulk_upsert_persons(iter_records(request.stream(), fmt))
+
 @router.get("/{person_id}", response_model=Person)
 async def read_person(
     person_id: int,
@@ -47,7 +88,7 @@ async def read_person(
 async def update_person(
     person_id: int,
     person: PersonUpdate,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_unit_of_work),
     current_user: str = Depends(get_current_user)
 ):
     """Update a person"""
@@ -60,7 +101,7 @@ async def update_person(
 @router.delete("/{person_id}")
 async def delete_person(
     person_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_unit_of_work),
     current_user: str = Depends(get_current_user)
 ):
     """Delete a person"""
@@ -114,4 +155,37 @@ async def collect_username_data(
         raise HTTPException(status_code=404, detail="Person not found or no username")
 
     result = await service.collect_username_data(person.username)
-    return result
\ No newline at end of file
+    return result
+
+@router.post("/{person_id}/collect")
+async def collect_all_data(
+    person_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: str = Depends(get_current_user)
+):
+    """Run every applicable collector for a person concurrently"""
+    service = PersonService(db)
+    person = await service.get_person(person_id)
+    if not person:
+        raise HTTPException(status_code=404, detail="Person not found")
+
+    return await service.collect_all(person)
+
+@router.get("/{person_id}/collect/stream")
+async def stream_collection(
+    person_id: int,
+    collectors: Optional[List[str]] = Query(None),
+    db: AsyncSession = Depends(get_db),
+    current_user: str = Depends(get_current_user)
+):
+    """Stream each partial result of the applicable (or named) collectors as Server-Sent Events"""
+    service = PersonService(db)
+    person = await service.get_person(person_id)
+    if not person:
+        raise HTTPException(status_code=404, detail="Person not found")
+
+    return StreamingResponse(
+        sse_stream(service.stream_all(person, collectors)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
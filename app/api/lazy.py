@@ -0,0 +1,48 @@
+import asyncio
+import importlib
+import threading
+from fastapi import FastAPI
+
+class LazyRouter:
+    """Include an APIRouter in the app on the first request under its prefix
+
+    Importing the routers imports every endpoint, service and schema, most
+    of a process's start time. Deferring it lets the app answer /health and
+    /metrics as soon as it starts; the import then runs once, in a thread,
+    when the first API request arrives or when preload() is called.
+    """
+
+    def __init__(self, app: FastAPI, path: str, prefix: str):
+        self.app = app
+        self.path = path
+        self.prefix = prefix
+        self.loaded = False
+        self._lock = threading.Lock()
+
+    def load(self):
+        with self._lock:
+            if self.loaded:
+                return
+            module_name, _, attribute = self.path.partition(":")
+            router = getattr(importlib.import_module(module_name), attribute)
+            self.app.include_router(router, prefix=self.prefix)
+            # The OpenAPI schema is cached on first use and lacks these routes
+            self.app.openapi_schema = None
+            self.loaded = True
+
+    async def preload(self):
+        """Import the routers off the event loop"""
+        await asyncio.to_thread(self.load)
+
+class LazyRouterMiddleware:
+    """Load a LazyRouter before the first request that needs it"""
+
+    def __init__(self, app, router: LazyRouter):
+        self.app = app
+        self.router = router
+
+    async def __call__(self, scope, receive, send):
+        router = self.router
+        if not router.loaded and scope["type"] in ("http", "websocket") and scope["path"].startswith(router.prefix):
+            await router.preload()
+        await self.app(scope, receive, send)
@@ -0,0 +1,46 @@
+from typing import TYPE_CHECKING, AsyncIterator
+from fastapi import Request
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+# Request scope key of the units of work opened by get_unit_of_work
+SCOPE_KEY = "osint.units_of_work"
+
+async def get_unit_of_work(request: Request) -> AsyncIterator["AsyncSession"]:
+    """Session whose writes commit once for the whole request
+
+    Service calls only flush; UnitOfWorkMiddleware commits just before the
+    response starts, so a client never sees a success that was not stored.
+    A request that raises is rolled back.
+    """
+    # Imported here so that the middleware does not load the database at startup
+    from core.database import AsyncSessionLocal, UnitOfWork
+
+    async with AsyncSessionLocal() as session:
+        async with UnitOfWork(session) as unit:
+            request.scope.setdefault(SCOPE_KEY, []).append(unit)
+            yield session
+
+class UnitOfWorkMiddleware:
+    """Commit the units of work of a request when its response starts
+
+    The cleanup of yield dependencies runs after the response has been sent,
+    too late to report a failed commit, so the commit happens here instead.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_after_commit(message):
+            if message["type"] == "http.response.start":
+                for unit in scope.get(SCOPE_KEY, ()):
+                    await unit.commit()
+            await send(message)
+
+        await self.app(scope, receive, send_after_commit)
@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from api.endpoints import auth, persons, companies, cyber, investigations
+from api.endpoints import auth, persons, companies, cyber, investigations, jobs, graph, collectors
 
 api_router = APIRouter()
 
@@ -9,4 +9,7 @@ api_router.include_router(auth.router, prefix="/auth", tags=["authentication"])
 api_router.include_router(persons.router, prefix="/persons", tags=["persons"])
 api_router.include_router(companies.router, prefix="/companies", tags=["companies"])
 api_router.include_router(cyber.router, prefix="/cyber", tags=["cyber"])
-api_router.include_router(investigations.router, prefix="/investigations", tags=["investigations"])
\ No newline at end of file
+api_router.include_router(investigations.router, prefix="/investigations", tags=["investigations"])
+api_router.include_router(jobs.router, prefix="/jobs", tags=["jobs"])
+api_router.include_router(graph.router, prefix="/graph", tags=["graph"])
+api_router.include_router(collectors.router, prefix="/collectors", tags=["collectors"])
\ No newline at end of file
@@ -1,14 +1,49 @@
-from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
 import asyncio
-from utils.http_client import HttpClient
-from core.logging import logger
+import contextvars
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, Any, Optional, AsyncIterator, Callable
+from utils.http_client import HttpClient, get_http_client
+from utils.cache import ResultCache, SQLiteCacheBackend
+from utils.resilience import CircuitOpenError, call_with_resilience, is_retryable
+from core.config import settings
+from core.logging import get_logger
+from core.metrics import COLLECTOR_DURATION, COLLECTOR_RUNS
+
+logger = get_logger(__name__)
+
+# Results of all collectors, shared by every service and worker task, and
+# by every process through the shared state file when there is one
+_cache_path = settings.COLLECTOR_CACHE_PATH or settings.SHARED_STATE_PATH
+collector_cache = ResultCache(
+    max_entries=settings.COLLECTOR_CACHE_MAX_ENTRIES,
+    max_bytes=settings.COLLECTOR_CACHE_MAX_BYTES,
+    backend=SQLiteCacheBackend(_cache_path) if _cache_path else None,
+)
+
+# Receives the partial results of the collection running in the current task.
+# Tasks copy their context, so it follows the collection into the single-flight
+# and timeout tasks it runs under.
+_partial_sink: contextvars.ContextVar[Optional[Callable[[Dict[str, Any]], None]]] = contextvars.ContextVar(
+    "collector_partial_sink", default=None
+)
+
+def set_partial_sink(sink: Optional[Callable[[Dict[str, Any]], None]]):
+    """Send the partial results of collections started from this task to sink"""
+    _partial_sink.set(sink)
 
 class BaseCollector(ABC):
     """Base class for OSINT data collectors"""
 
+    # Default time budget of one collect() call when run by the orchestrator
+    timeout: Optional[float] = None
+    # Seconds a result stays cached (None uses COLLECTOR_CACHE_TTL, 0 disables)
+    cache_ttl: Optional[float] = None
+    # Name of the upstream service for rate limits and circuit breaking (defaults to the class name)
+    upstream: Optional[str] = None
+
     def __init__(self, http_client: Optional[HttpClient] = None):
-        self.http_client = http_client or HttpClient()
+        self.http_client = http_client or get_http_client()
         self.name = self.__class__.__name__
 
     @abstractmethod
@@ -16,13 +51,83 @@ class BaseCollector(ABC):
         """Collect data for the given target"""
         pass
 
+    async def run(self, target: str) -> Dict[str, Any]:
+        """Collect data for the target, served from the result cache when possible
+
+        Concurrent calls for the same collector and target share a single
+        collection. Results carrying an error are never cached.
+        """
+        ttl = self.cache_ttl_seconds()
+        key = self.cache_key(target)
+        if not ttl or key is None:
+            return await self.collect_with_retry(target)
+        return await collector_cache.get_or_set(
+            key, ttl, lambda: self.collect_with_retry(target), cacheable=self._is_cacheable
+        )
+
+    def emit_partial(self, item: Dict[str, Any]):
+        """Publish a partial result (a subdomain, a platform hit...) as soon as it is known"""
+        sink = _partial_sink.get()
+        if sink is not None:
+            sink(item)
+
+    async def stream(self, target: str) -> AsyncIterator[Dict[str, Any]]:
+        """Yield {"event": "partial", ...} items while collecting, then the {"event": "result", ...}
+
+        Partial results are only seen when this call does the collection; a
+        cached or already running collection yields just the result.
+        """
+        events: asyncio.Queue = asyncio.Queue()
+
+        async def collect():
+            set_partial_sink(lambda item: events.put_nowait({"event": "partial", "data": item}))
+            try:
+                result = await self.run(target)
+            except Exception as e:
+                result = {"error": f"Collection failed: {str(e)}"}
+            events.put_nowait({"event": "result", "data": result})
+
+        task = asyncio.create_task(collect())
+        try:
+            while True:
+                event = await events.get()
+                yield event
+                if event["event"] == "result":
+                    return
+        finally:
+            task.cancel()
+
+    def cache_ttl_seconds(self) -> float:
+        if not settings.COLLECTOR_CACHE_ENABLED:
+            return 0
+        if self.name in settings.COLLECTOR_CACHE_TTLS:
+            return settings.COLLECTOR_CACHE_TTLS[self.name]
+        return settings.COLLECTOR_CACHE_TTL if self.cache_ttl is None else self.cache_ttl
+
+    def cache_key(self, target: str) -> Optional[str]:
+        """Key of a target in the result cache, None when it must not be cached"""
+        return f"{self.name}:{self.normalize_target(target)}"
+
+    def normalize_target(self, target: str) -> str:
+        return target.strip().lower()
+
+    @staticmethod
+    def _is_cacheable(result: Any) -> bool:
+        return isinstance(result, dict) and not result.get("error")
+
     async def _safe_request(self, url: str, **kwargs) -> Optional[Dict[str, Any]]:
-        """Make a safe HTTP request with error handling"""
+        """Make a safe HTTP request with error handling
+
+        Retryable upstream failures are raised so that collect_with_retry
+        can back off and trip the circuit breaker; other failures return None.
+        """
         try:
-            response = await self.http_client.get(url, **kwargs)
+            response = await self.http_client.get(url, raise_for_status=True, **kwargs)
             return response
         except Exception as e:
-            logger.error(f"Error in {self.name} collecting from {url}: {str(e)}")
+            if is_retryable(e):
+                raise
+            logger.error("Error in %s collecting from %s: %s", self.name, url, e)
             return None
 
     def _validate_target(self, target: str) -> bool:
@@ -31,18 +136,25 @@ class BaseCollector(ABC):
             return False
         return True
 
-    async def collect_with_retry(self, target: str, max_retries: int = 3) -> Dict[str, Any]:
-        """Collect data with retry logic"""
-        for attempt in range(max_retries):
-            try:
-                if not self._validate_target(target):
-                    return {"error": "Invalid target"}
+    async def collect_with_retry(self, target: str, max_retries: Optional[int] = None) -> Dict[str, Any]:
+        """Collect data under the upstream's rate limit, retry policy and circuit breaker"""
+        if not self._validate_target(target):
+            return {"error": "Invalid target"}
 
-                result = await self.collect(target)
-                return result
-            except Exception as e:
-                logger.warning(f"Attempt {attempt + 1} failed for {self.name}: {str(e)}")
-                if attempt < max_retries - 1:
-                    await asyncio.sleep(2 ** attempt)  # Exponential backoff
-                else:
-                    return {"error": f"Collection failed after {max_retries} attempts: {str(e)}"}
\ No newline at end of file
+        upstream = self.upstream or self.name
+        started = time.perf_counter()
+        outcome = "cancelled"
+        try:
+            result = await call_with_resilience(upstream, lambda: self.collect(target), max_attempts=max_retries)
+            outcome = "error" if isinstance(result, dict) and result.get("error") else "ok"
+            return result
+        except CircuitOpenError as e:
+            outcome = "error"
+            return {"error": str(e), "circuit_open": True}
+        except Exception as e:
+            outcome = "error"
+            return {"error": f"Collection failed: {str(e)}"}
+        finally:
+            # Cancellation (an orchestrator timeout) skips the except clauses
+            COLLECTOR_DURATION.labels(self.name).observe(time.perf_counter() - started)
+            COLLECTOR_RUNS.labels(self.name, outcome).inc()
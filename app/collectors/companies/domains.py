@@ -1,7 +1,9 @@
 from typing import Dict, Any
 from collectors.base import BaseCollector
 from utils.validators import DataValidator
-from core.logging import logger
+from core.logging import get_logger
+
+logger = get_logger(__name__)
 
 class DomainCollector(BaseCollector):
     """Collector for company domain information"""
@@ -34,10 +36,10 @@ class DomainCollector(BaseCollector):
             }
 
             results.update(mock_data)
-            logger.info(f"Collected domain data for {target}")
+            logger.info("Collected domain data for %s", target)
 
         except Exception as e:
-            logger.error(f"Error collecting domain data for {target}: {str(e)}")
+            logger.error("Error collecting domain data for %s: %s", target, e)
             results["error"] = str(e)
 
         return results
\ No newline at end of file
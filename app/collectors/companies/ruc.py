@@ -1,7 +1,9 @@
 from typing import Dict, Any
 from collectors.base import BaseCollector
 from utils.validators import DataValidator
-from core.logging import logger
+from core.logging import get_logger
+
+logger = get_logger(__name__)
 
 class RUCCollector(BaseCollector):
     """Collector for RUC (Paraguay tax ID) information"""
@@ -32,10 +34,10 @@ class RUCCollector(BaseCollector):
             }
 
             results.update(mock_data)
-            logger.info(f"Collected RUC data for {target}")
+            logger.info("Collected RUC data for %s", target)
 
         except Exception as e:
-            logger.error(f"Error collecting RUC data for {target}: {str(e)}")
+            logger.error("Error collecting RUC data for %s: %s", target, e)
             results["error"] = str(e)
 
         return results
\ No newline at end of file
@@ -1,7 +1,10 @@
+import asyncio
 from typing import Dict, Any, List
 from collectors.base import BaseCollector
 from utils.parsers import DataParser
-from core.logging import logger
+from core.logging import get_logger
+
+logger = get_logger(__name__)
 
 class SocialMediaCollector(BaseCollector):
     """Collector for company social media profiles"""
@@ -17,21 +20,28 @@ class SocialMediaCollector(BaseCollector):
         platforms = ["linkedin", "twitter", "facebook", "instagram", "youtube"]
 
         try:
-            for platform in platforms:
-                profile_data = await self._check_company_profile(target, platform)
+            checks = await asyncio.gather(
+                *(self._check_and_emit(target, platform) for platform in platforms)
+            )
+            for platform, profile_data in zip(platforms, checks):
                 if profile_data and profile_data.get("exists"):
                     results["social_profiles"][platform] = profile_data
                     results["found_profiles"].append(platform)
 
             results["profile_count"] = len(results["found_profiles"])
-            logger.info(f"Collected social media data for {target}")
+            logger.info("Collected social media data for %s", target)
 
         except Exception as e:
-            logger.error(f"Error collecting social media data for {target}: {str(e)}")
+            logger.error("Error collecting social media data for %s: %s", target, e)
             results["error"] = str(e)
 
         return results
 
+    async def _check_and_emit(self, company_name: str, platform: str) -> Dict[str, Any]:
+        profile_data = await self._check_company_profile(company_name, platform)
+        self.emit_partial({"platform": platform, "profile": profile_data})
+        return profile_data
+
     async def _check_company_profile(self, company_name: str, platform: str) -> Dict[str, Any]:
         """Check if company has a profile on a specific platform"""
         # For MVP, simulate checks
@@ -1,12 +1,24 @@
-import dns.resolver
-from typing import Dict, Any, List
+import asyncio
+import dns.asyncresolver
+from typing import Dict, Any, List, Optional
 from collectors.base import BaseCollector
+from utils.dns_resolver import get_resolver
+from utils.http_client import HttpClient
 from utils.validators import DataValidator
-from core.logging import logger
+from core.logging import get_logger
+
+logger = get_logger(__name__)
 
 class DNSCollector(BaseCollector):
     """Collector for DNS records"""
 
+    record_types = ['A', 'AAAA', 'MX', 'TXT', 'CNAME', 'NS']
+    cache_ttl = 300.0
+
+    def __init__(self, http_client: Optional[HttpClient] = None, resolver: Optional[dns.asyncresolver.Resolver] = None):
+        super().__init__(http_client)
+        self.resolver = resolver or get_resolver()
+
     async def collect(self, target: str) -> Dict[str, Any]:
         """Collect DNS records for a domain"""
         if not DataValidator.validate_domain(target):
@@ -20,11 +32,11 @@ class DNSCollector(BaseCollector):
         }
 
         try:
-            # Query different DNS record types
-            record_types = ['A', 'AAAA', 'MX', 'TXT', 'CNAME', 'NS']
-
-            for record_type in record_types:
-                records = await self._query_dns(target, record_type)
+            # Query all record types concurrently
+            answers = await asyncio.gather(
+                *(self._query_dns(target, record_type) for record_type in self.record_types)
+            )
+            for record_type, records in zip(self.record_types, answers):
                 if records:
                     results["records"][record_type] = records
 
@@ -36,10 +48,10 @@ class DNSCollector(BaseCollector):
             mx_records = results["records"].get("MX", [])
             results["mx_records"] = [str(r) for r in mx_records]
 
-            logger.info(f"Collected DNS data for {target}")
+            logger.info("Collected DNS data for %s", target)
 
         except Exception as e:
-            logger.error(f"Error collecting DNS data for {target}: {str(e)}")
+            logger.error("Error collecting DNS data for %s: %s", target, e)
             results["error"] = str(e)
 
         return results
@@ -47,9 +59,10 @@ class DNSCollector(BaseCollector):
     async def _query_dns(self, domain: str, record_type: str) -> List[str]:
         """Query specific DNS record type"""
         try:
-            resolver = dns.resolver.Resolver()
-            answers = resolver.resolve(domain, record_type)
-            return [str(rdata) for rdata in answers]
+            answers = await self.resolver.resolve(domain, record_type)
+            records = [str(rdata) for rdata in answers]
+            self.emit_partial({"record_type": record_type, "records": records})
+            return records
         except Exception as e:
-            logger.debug(f"No {record_type} records for {domain}: {str(e)}")
-            return []
\ No newline at end of file
+            logger.debug("No %s records for %s: %s", record_type, domain, e)
+            return []
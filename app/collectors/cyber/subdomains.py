@@ -1,10 +1,48 @@
-from typing import Dict, Any, List
+import asyncio
+import secrets
+import dns.asyncresolver
+from typing import Dict, Any, List, Optional, Set, AsyncIterator, Iterable, Union
 from collectors.base import BaseCollector
+from core.config import settings
+from utils.dns_resolver import get_resolver
+from utils.http_client import HttpClient
 from utils.validators import DataValidator
-from core.logging import logger
+from core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Common subdomain prefixes checked when no wordlist is configured
+COMMON_PREFIXES = [
+    'www', 'mail', 'ftp', 'admin', 'api', 'dev', 'test', 'staging',
+    'blog', 'shop', 'app', 'mobile', 'm', 'secure', 'ssl', 'vpn',
+    'remote', 'portal', 'webmail', 'email', 'smtp', 'pop', 'imap'
+]
+
+Wordlist = Union[str, Iterable[str]]
 
 class SubdomainCollector(BaseCollector):
-    """Collector for subdomain enumeration"""
+    """Collector for subdomain enumeration
+
+    Candidate names are resolved by a fixed pool of async workers, so at most
+    ``concurrency`` queries are in flight at once. Wordlists given as a path
+    are streamed from disk in batches and never loaded whole into memory.
+    """
+
+    timeout = 300.0
+    cache_ttl = 3600.0
+    _read_batch_size = 1000
+
+    def __init__(
+        self,
+        http_client: Optional[HttpClient] = None,
+        resolver: Optional[dns.asyncresolver.Resolver] = None,
+        concurrency: Optional[int] = None,
+        wordlist: Optional[Wordlist] = None,
+    ):
+        super().__init__(http_client)
+        self.resolver = resolver or get_resolver()
+        self.concurrency = max(1, concurrency or settings.SUBDOMAIN_CONCURRENCY)
+        self.wordlist = wordlist or settings.SUBDOMAIN_WORDLIST or COMMON_PREFIXES
 
     async def collect(self, target: str) -> Dict[str, Any]:
         """Enumerate subdomains for a domain"""
@@ -15,41 +53,136 @@ class SubdomainCollector(BaseCollector):
             "domain": target,
             "subdomains": [],
             "active_subdomains": [],
+            "addresses": {},
+            "wildcard": [],
             "total_found": 0
         }
 
         try:
-            # Common subdomain prefixes to check
-            common_prefixes = [
-                'www', 'mail', 'ftp', 'admin', 'api', 'dev', 'test', 'staging',
-                'blog', 'shop', 'app', 'mobile', 'm', 'secure', 'ssl', 'vpn',
-                'remote', 'portal', 'webmail', 'email', 'smtp', 'pop', 'imap'
-            ]
+            results["wildcard"] = sorted(await self._detect_wildcard(target))
 
-            found_subdomains = []
+            async for found in self.enumerate(target, wildcard=set(results["wildcard"])):
+                self.emit_partial(found)
+                results["subdomains"].append(found["subdomain"])
+                results["active_subdomains"].append(found["subdomain"])
+                results["addresses"][found["subdomain"]] = found["addresses"]
 
-            for prefix in common_prefixes:
-                subdomain = f"{prefix}.{target}"
-                if await self._check_subdomain_exists(subdomain):
-                    found_subdomains.append(subdomain)
-                    results["active_subdomains"].append(subdomain)
+            results["total_found"] = len(results["subdomains"])
 
-            results["subdomains"] = found_subdomains
-            results["total_found"] = len(found_subdomains)
-
-            logger.info(f"Found {len(found_subdomains)} subdomains for {target}")
+            logger.info("Found %s subdomains for %s", results['total_found'], target)
 
         except Exception as e:
-            logger.error(f"Error collecting subdomains for {target}: {str(e)}")
+            logger.error("Error collecting subdomains for %s: %s", target, e)
             results["error"] = str(e)
 
         return results
 
+    def cache_key(self, target: str) -> Optional[str]:
+        # Results depend on the wordlist; in-memory wordlists are not cached
+        if self.wordlist is COMMON_PREFIXES:
+            return f"{super().cache_key(target)}:builtin"
+        if isinstance(self.wordlist, str):
+            return f"{super().cache_key(target)}:{self.wordlist}"
+        return None
+
+    async def enumerate(
+        self,
+        domain: str,
+        wordlist: Optional[Wordlist] = None,
+        wildcard: Optional[Set[str]] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield each resolving subdomain as soon as it is found
+
+        Hits whose addresses are all wildcard addresses are dropped. When
+        ``wildcard`` is not given it is detected first.
+        """
+        if wildcard is None:
+            wildcard = await self._detect_wildcard(domain)
+
+        candidates: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        found: asyncio.Queue = asyncio.Queue()
+        done = object()
+
+        async def produce():
+            try:
+                async for word in self._iter_words(wordlist or self.wordlist):
+                    await candidates.put(word)
+            finally:
+                for _ in range(self.concurrency):
+                    await candidates.put(done)
+
+        async def work():
+            try:
+                while True:
+                    word = await candidates.get()
+                    if word is done:
+                        break
+                    subdomain = f"{word}.{domain}"
+                    addresses = await self._resolve(subdomain)
+                    if addresses and not (wildcard and set(addresses) <= wildcard):
+                        await found.put({"subdomain": subdomain, "addresses": addresses})
+            finally:
+                await found.put(done)
+
+        tasks = [asyncio.create_task(produce())]
+        tasks += [asyncio.create_task(work()) for _ in range(self.concurrency)]
+        try:
+            running = self.concurrency
+            while running:
+                item = await found.get()
+                if item is done:
+                    running -= 1
+                    continue
+                yield item
+            await tasks[0]
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _iter_words(self, wordlist: Wordlist) -> AsyncIterator[str]:
+        """Iterate normalized candidate labels from a path or an iterable"""
+        if isinstance(wordlist, str):
+            with open(wordlist, "r", encoding="utf-8", errors="ignore") as handle:
+                while True:
+                    lines = await asyncio.to_thread(handle.readlines, self._read_batch_size * 16)
+                    if not lines:
+                        break
+                    for line in lines:
+                        word = self._normalize_word(line)
+                        if word:
+                            yield word
+        else:
+            for line in wordlist:
+                word = self._normalize_word(line)
+                if word:
+                    yield word
+
+    @staticmethod
+    def _normalize_word(line: str) -> Optional[str]:
+        word = line.strip().lower().strip(".")
+        if not word or word.startswith("#"):
+            return None
+        return word
+
+    async def _detect_wildcard(self, domain: str) -> Set[str]:
+        """Return the addresses random labels under the domain resolve to"""
+        probes = [f"{secrets.token_hex(8)}.{domain}" for _ in range(settings.SUBDOMAIN_WILDCARD_PROBES)]
+        answers = await asyncio.gather(*(self._resolve(probe) for probe in probes))
+        wildcard = {address for addresses in answers for address in addresses}
+        if wildcard:
+            logger.info("Wildcard DNS detected for %s: %s", domain, sorted(wildcard))
+        return wildcard
+
+    async def _resolve(self, name: str) -> List[str]:
+        """Resolve a name to its A records, empty when it does not exist"""
+        try:
+            answers = await self.resolver.resolve(name, "A")
+            return sorted(str(rdata) for rdata in answers)
+        except Exception as e:
+            logger.debug("No A records for %s: %s", name, e)
+            return []
+
     async def _check_subdomain_exists(self, subdomain: str) -> bool:
         """Check if a subdomain exists by attempting DNS resolution"""
-        try:
-            import socket
-            socket.gethostbyname(subdomain)
-            return True
-        except socket.gaierror:
-            return False
\ No newline at end of file
+        return bool(await self._resolve(subdomain))
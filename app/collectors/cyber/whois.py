@@ -1,13 +1,29 @@
+import asyncio
 import whois
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any
 from collectors.base import BaseCollector
+from core.config import settings
+from utils.cache import TTLCache
 from utils.validators import DataValidator
 from utils.parsers import DataParser
-from core.logging import logger
+from utils.resilience import get_rate_limiter
+from core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# python-whois is blocking, so lookups run on a bounded pool of threads
+_executor = ThreadPoolExecutor(max_workers=settings.WHOIS_MAX_WORKERS, thread_name_prefix="whois")
+
+# Parsed WHOIS records keyed by registrable domain
+_whois_cache = TTLCache(maxsize=settings.WHOIS_CACHE_SIZE, ttl=settings.WHOIS_CACHE_TTL)
 
 class WhoisCollector(BaseCollector):
     """Collector for WHOIS information"""
 
+    cache_ttl = 3600.0
+    upstream = "whois"
+
     async def collect(self, target: str) -> Dict[str, Any]:
         """Collect WHOIS information for a domain"""
         if not DataValidator.validate_domain(target):
@@ -26,30 +42,53 @@ class WhoisCollector(BaseCollector):
         }
 
         try:
-            # Query WHOIS information
-            w = whois.whois(target)
-
-            if w:
-                results.update({
-                    "registrar": w.registrar,
-                    "creation_date": str(w.creation_date) if w.creation_date else None,
-                    "expiration_date": str(w.expiration_date) if w.expiration_date else None,
-                    "updated_date": str(w.updated_date) if w.updated_date else None,
-                    "name_servers": w.name_servers or [],
-                    "status": w.status or [],
-                    "emails": w.emails or [],
-                    "raw_whois": str(w)
-                })
-
-                # Parse additional info from raw WHOIS
-                if results["raw_whois"]:
-                    parsed = DataParser.parse_whois(results["raw_whois"])
-                    results.update(parsed)
-
-            logger.info(f"Collected WHOIS data for {target}")
+            # Subdomains share the WHOIS record of their registrable domain
+            registrable = DataParser.registrable_domain(target)
+            record = _whois_cache.get(registrable)
+            if record is None:
+                record = await self._lookup(registrable)
+                _whois_cache.set(registrable, record)
+            results.update(record)
+            results["domain"] = target
+
+            logger.info("Collected WHOIS data for %s", target)
 
+        except OSError:
+            # Network failures are transient; let the retry policy handle them
+            raise
         except Exception as e:
-            logger.error(f"Error collecting WHOIS data for {target}: {str(e)}")
+            logger.error("Error collecting WHOIS data for %s: %s", target, e)
             results["error"] = str(e)
 
-        return results
\ No newline at end of file
+        return results
+
+    async def _lookup(self, domain: str) -> Dict[str, Any]:
+        """Query WHOIS off the event loop and parse the answer once"""
+        # The registry server is chosen by python-whois from the public suffix
+        server = domain.split('.', 1)[-1]
+        limiter = get_rate_limiter(
+            f"whois:{server}", rate=1.0 / settings.WHOIS_RATE_LIMIT_INTERVAL, burst=1
+        )
+        await limiter.acquire()
+        loop = asyncio.get_running_loop()
+        w = await loop.run_in_executor(_executor, whois.whois, domain)
+
+        record: Dict[str, Any] = {}
+        if w:
+            record.update({
+                "registrar": w.registrar,
+                "creation_date": str(w.creation_date) if w.creation_date else None,
+                "expiration_date": str(w.expiration_date) if w.expiration_date else None,
+                "updated_date": str(w.updated_date) if w.updated_date else None,
+                "name_servers": w.name_servers or [],
+                "status": w.status or [],
+                "emails": w.emails or [],
+                "raw_whois": str(w)
+            })
+
+            # Parse additional info from raw WHOIS
+            if record["raw_whois"]:
+                parsed = DataParser.parse_whois(record["raw_whois"])
+                record.update(parsed)
+
+        return record
@@ -0,0 +1,130 @@
+import asyncio
+import time
+from typing import Dict, Any, Optional, Tuple, AsyncIterator
+from collectors.base import BaseCollector, set_partial_sink
+from core.config import settings
+from core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# A collection plan maps a result name to the collector and target to run
+CollectionPlan = Dict[str, Tuple[BaseCollector, str]]
+
+class CollectorOrchestrator:
+    """Run many collectors concurrently under one global concurrency budget
+
+    Every collector runs as its own task, so the total latency of a plan is
+    bounded by its slowest collector instead of the sum of all of them. A
+    collector that fails or exceeds its timeout is reported on its own and
+    does not affect the others.
+    """
+
+    def __init__(self, max_concurrency: Optional[int] = None, default_timeout: Optional[float] = None):
+        self.max_concurrency = max_concurrency or settings.COLLECTOR_MAX_CONCURRENCY
+        self.default_timeout = default_timeout or settings.COLLECTOR_TIMEOUT
+        self._budget: Optional[asyncio.Semaphore] = None
+        self._budget_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._budget is None or self._budget_loop is not loop:
+            self._budget = asyncio.Semaphore(self.max_concurrency)
+            self._budget_loop = loop
+        return self._budget
+
+    def timeout_for(self, name: str, collector: BaseCollector) -> float:
+        """Resolve the timeout of a collector: settings override, class default, global default"""
+        overrides = settings.COLLECTOR_TIMEOUTS
+        for key in (name, collector.name):
+            if key in overrides:
+                return overrides[key]
+        return collector.timeout or self.default_timeout
+
+    async def _run(self, name: str, collector: BaseCollector, target: str, timeout: float) -> Dict[str, Any]:
+        async with self._semaphore():
+            started = time.perf_counter()
+            try:
+                result = await asyncio.wait_for(collector.run(target), timeout)
+                status = "error" if isinstance(result, dict) and result.get("error") else "ok"
+                return {"status": status, "result": result, "elapsed": time.perf_counter() - started}
+            except asyncio.TimeoutError:
+                logger.warning("Collector %s timed out after %ss for %s", name, timeout, target)
+                return {"status": "timeout", "error": f"Timed out after {timeout}s", "elapsed": time.perf_counter() - started}
+            except Exception as e:
+                logger.error("Collector %s failed for %s: %s", name, target, e)
+                return {"status": "error", "error": str(e), "elapsed": time.perf_counter() - started}
+
+    async def iter_collect(
+        self, plan: CollectionPlan, timeouts: Optional[Dict[str, float]] = None
+    ) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """Yield (name, outcome) pairs in completion order"""
+        timeouts = timeouts or {}
+        tasks = {
+            asyncio.create_task(
+                self._run(name, collector, target, timeouts.get(name) or self.timeout_for(name, collector))
+            ): name
+            for name, (collector, target) in plan.items()
+        }
+        try:
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield tasks[task], task.result()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def iter_stream(
+        self, plan: CollectionPlan, timeouts: Optional[Dict[str, float]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield the partial results of every collector as they are found, then its outcome
+
+        Items are {"event": "partial" | "result", "collector": name, "data": ...};
+        a "result" carries the same outcome iter_collect() yields.
+        """
+        timeouts = timeouts or {}
+        events: asyncio.Queue = asyncio.Queue()
+
+        async def run(name: str, collector: BaseCollector, target: str):
+            set_partial_sink(lambda item: events.put_nowait({"event": "partial", "collector": name, "data": item}))
+            outcome = await self._run(name, collector, target, timeouts.get(name) or self.timeout_for(name, collector))
+            events.put_nowait({"event": "result", "collector": name, "data": outcome})
+
+        tasks = [asyncio.create_task(run(name, collector, target)) for name, (collector, target) in plan.items()]
+        try:
+            remaining = len(tasks)
+            while remaining:
+                event = await events.get()
+                if event["event"] == "result":
+                    remaining -= 1
+                yield event
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def collect_all(
+        self, plan: CollectionPlan, timeouts: Optional[Dict[str, float]] = None
+    ) -> Dict[str, Any]:
+        """Run a plan and return partial results, errors and timeouts"""
+        started = time.perf_counter()
+        summary: Dict[str, Any] = {"results": {}, "errors": {}, "timed_out": [], "timings": {}}
+        async for name, outcome in self.iter_collect(plan, timeouts):
+            summary["timings"][name] = round(outcome["elapsed"], 4)
+            if outcome["status"] == "timeout":
+                summary["timed_out"].append(name)
+                summary["errors"][name] = outcome["error"]
+            elif outcome["status"] == "ok":
+                summary["results"][name] = outcome["result"]
+            else:
+                summary["errors"][name] = outcome["result"]["error"] if "result" in outcome else outcome["error"]
+        summary["complete"] = not summary["errors"]
+        summary["elapsed"] = round(time.perf_counter() - started, 4)
+        return summary
+
+# Shared orchestrator so the concurrency budget is global to the process
+orchestrator = CollectorOrchestrator()
+
+def get_orchestrator() -> CollectorOrchestrator:
+    """Return the shared collector orchestrator"""
+    return orchestrator
@@ -1,7 +1,9 @@
 from typing import Dict, Any, List
 from collectors.base import BaseCollector
 from utils.validators import DataValidator
-from core.logging import logger
+from core.logging import get_logger
+
+logger = get_logger(__name__)
 
 class EmailCollector(BaseCollector):
     """Collector for email-related OSINT data"""
@@ -34,10 +36,10 @@ class EmailCollector(BaseCollector):
             results["pwned"] = len(mock_breaches) > 0
             results["breach_count"] = len(mock_breaches)
 
-            logger.info(f"Collected email data for {target}")
+            logger.info("Collected email data for %s", target)
 
         except Exception as e:
-            logger.error(f"Error collecting email data for {target}: {str(e)}")
+            logger.error("Error collecting email data for %s: %s", target, e)
             results["error"] = str(e)
 
         return results
\ No newline at end of file
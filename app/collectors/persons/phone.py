@@ -1,11 +1,16 @@
 from typing import Dict, Any
 from collectors.base import BaseCollector
-from utils.validators import DataValidator
-from core.logging import logger
+from utils.validators import PHONE_SEPARATORS_PATTERN, DataValidator
+from core.logging import get_logger
+
+logger = get_logger(__name__)
 
 class PhoneCollector(BaseCollector):
     """Collector for phone number OSINT data"""
 
+    def normalize_target(self, target: str) -> str:
+        return PHONE_SEPARATORS_PATTERN.sub('', target.strip())
+
     async def collect(self, target: str) -> Dict[str, Any]:
         """Collect phone number information"""
         if not DataValidator.validate_phone(target):
@@ -28,10 +33,10 @@ class PhoneCollector(BaseCollector):
             }
 
             results.update(mock_data)
-            logger.info(f"Collected phone data for {target}")
+            logger.info("Collected phone data for %s", target)
 
         except Exception as e:
-            logger.error(f"Error collecting phone data for {target}: {str(e)}")
+            logger.error("Error collecting phone data for %s: %s", target, e)
             results["error"] = str(e)
 
         return results
\ No newline at end of file
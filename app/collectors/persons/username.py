@@ -1,7 +1,10 @@
+import asyncio
 from typing import Dict, Any, List
 from collectors.base import BaseCollector
 from utils.validators import DataValidator
-from core.logging import logger
+from core.logging import get_logger
+
+logger = get_logger(__name__)
 
 class UsernameCollector(BaseCollector):
     """Collector for username OSINT data"""
@@ -20,21 +23,28 @@ class UsernameCollector(BaseCollector):
         platforms = ["twitter", "instagram", "github", "linkedin"]
 
         try:
-            for platform in platforms:
-                profile_data = await self._check_platform(target, platform)
+            checks = await asyncio.gather(
+                *(self._check_and_emit(target, platform) for platform in platforms)
+            )
+            for platform, profile_data in zip(platforms, checks):
                 if profile_data:
                     results["platforms"][platform] = profile_data
                     results["found_profiles"].append(platform)
 
             results["profile_count"] = len(results["found_profiles"])
-            logger.info(f"Collected username data for {target}")
+            logger.info("Collected username data for %s", target)
 
         except Exception as e:
-            logger.error(f"Error collecting username data for {target}: {str(e)}")
+            logger.error("Error collecting username data for %s: %s", target, e)
             results["error"] = str(e)
 
         return results
 
+    async def _check_and_emit(self, username: str, platform: str) -> Dict[str, Any]:
+        profile_data = await self._check_platform(username, platform)
+        self.emit_partial({"platform": platform, "profile": profile_data})
+        return profile_data
+
     async def _check_platform(self, username: str, platform: str) -> Dict[str, Any]:
         """Check if username exists on a specific platform"""
         # For MVP, simulate checks
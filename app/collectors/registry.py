@@ -0,0 +1,171 @@
+import importlib
+from importlib.metadata import entry_points
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Type
+from core.config import settings
+from core.logging import get_logger
+
+if TYPE_CHECKING:
+    from collectors.base import BaseCollector
+    from collectors.orchestrator import CollectionPlan
+    from utils.http_client import HttpClient
+
+logger = get_logger(__name__)
+
+# Entry point group under which installed packages register CollectorSpecs
+ENTRY_POINT_GROUP = "osint.collectors"
+
+# Cost classes, cheapest first: a local parse, a few upstream queries, a
+# brute force or a slow, rate limited upstream
+COSTS = ("low", "medium", "high")
+
+class CollectorSpec:
+    """What a collector does and where it lives, known without importing it"""
+
+    def __init__(
+        self,
+        name: str,
+        path: str,
+        entity_type: str,
+        target_field: str,
+        cost: str = "low",
+        upstream: Optional[str] = None,
+        description: str = "",
+    ):
+        if cost not in COSTS:
+            raise ValueError(f"Unknown cost class {cost}, expected one of {', '.join(COSTS)}")
+        self.name = name
+        self.path = path
+        self.entity_type = entity_type
+        self.target_field = target_field
+        self.cost = cost
+        self.upstream = upstream or path.rpartition(":")[2]
+        self.description = description
+
+    @property
+    def rate_limit(self) -> float:
+        """Calls per second allowed to the upstream, 0 when unlimited"""
+        return settings.RATE_LIMITS.get(self.upstream, settings.RATE_LIMIT_DEFAULT)
+
+    def target(self, entity: Any) -> Optional[str]:
+        return getattr(entity, self.target_field, None)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "entity_type": self.entity_type,
+            "target_field": self.target_field,
+            "cost": self.cost,
+            "upstream": self.upstream,
+            "rate_limit": self.rate_limit,
+            "description": self.description,
+        }
+
+class CollectorRegistry:
+    """The collectors of each entity type, imported on first use
+
+    Specs name a collector class as ``"module:Class"``, so registering one
+    costs nothing and a process only pays for the DNS, WHOIS or phone
+    libraries of the collectors it actually runs. Packages can add
+    collectors through the ``osint.collectors`` entry point group, each
+    entry point resolving to a CollectorSpec or a list of them.
+    """
+
+    def __init__(self, specs: Iterable[CollectorSpec] = (), entry_point_group: Optional[str] = ENTRY_POINT_GROUP):
+        self._specs: Dict[str, Dict[str, CollectorSpec]] = {}
+        self._classes: Dict[str, Type["BaseCollector"]] = {}
+        self.entry_point_group = entry_point_group
+        self._discovered = entry_point_group is None
+        for spec in specs:
+            self.register(spec)
+
+    def register(self, spec: CollectorSpec):
+        self._specs.setdefault(spec.entity_type, {})[spec.name] = spec
+
+    def _discover(self):
+        if self._discovered:
+            return
+        self._discovered = True
+        for entry_point in entry_points(group=self.entry_point_group):
+            try:
+                loaded = entry_point.load()
+            except Exception as e:
+                logger.error("Could not load collector entry point %s: %s", entry_point.name, e)
+                continue
+            for spec in loaded if isinstance(loaded, (list, tuple)) else [loaded]:
+                self.register(spec)
+
+    def specs(self, entity_type: Optional[str] = None, max_cost: Optional[str] = None) -> List[CollectorSpec]:
+        """Registered collectors, optionally of one entity type and up to a cost class"""
+        self._discover()
+        groups = [self._specs.get(entity_type, {})] if entity_type else self._specs.values()
+        specs = [spec for group in groups for spec in group.values()]
+        if max_cost:
+            specs = [spec for spec in specs if COSTS.index(spec.cost) <= COSTS.index(max_cost)]
+        return specs
+
+    def get(self, entity_type: str, name: str) -> CollectorSpec:
+        self._discover()
+        try:
+            return self._specs[entity_type][name]
+        except KeyError:
+            raise LookupError(f"No collector {name} for {entity_type}") from None
+
+    def load(self, spec: CollectorSpec) -> Type["BaseCollector"]:
+        """Import the collector class of a spec, once"""
+        collector_class = self._classes.get(spec.path)
+        if collector_class is None:
+            module_name, _, class_name = spec.path.partition(":")
+            collector_class = getattr(importlib.import_module(module_name), class_name)
+            self._classes[spec.path] = collector_class
+        return collector_class
+
+    def create(self, entity_type: str, name: str, http_client: Optional["HttpClient"] = None) -> "BaseCollector":
+        return self.load(self.get(entity_type, name))(http_client)
+
+    def plan(
+        self,
+        entity_type: str,
+        entity: Any,
+        http_client: Optional["HttpClient"] = None,
+        names: Optional[Iterable[str]] = None,
+        max_cost: Optional[str] = None,
+    ) -> "CollectionPlan":
+        """Collectors applicable to an entity, keyed by result name
+
+        A collector applies when the entity has a value in its target field.
+        Only the collectors in the plan are imported.
+        """
+        names = set(names) if names else None
+        plan: "CollectionPlan" = {}
+        for spec in self.specs(entity_type, max_cost):
+            if names is not None and spec.name not in names:
+                continue
+            target = spec.target(entity)
+            if target:
+                plan[spec.name] = (self.load(spec)(http_client), target)
+        return plan
+
+registry = CollectorRegistry([
+    CollectorSpec("email", "collectors.persons.email:EmailCollector", "person", "email",
+                  description="Email-related OSINT data"),
+    CollectorSpec("phone", "collectors.persons.phone:PhoneCollector", "person", "phone",
+                  description="Phone number OSINT data"),
+    CollectorSpec("username", "collectors.persons.username:UsernameCollector", "person", "username", cost="medium",
+                  description="Username OSINT data"),
+    CollectorSpec("domain", "collectors.companies.domains:DomainCollector", "company", "domain",
+                  description="Company domain information"),
+    CollectorSpec("ruc", "collectors.companies.ruc:RUCCollector", "company", "ruc", cost="medium",
+                  description="RUC (Paraguay tax ID) information"),
+    CollectorSpec("social", "collectors.companies.socials:SocialMediaCollector", "company", "name", cost="medium",
+                  description="Company social media profiles"),
+    CollectorSpec("dns", "collectors.cyber.dns:DNSCollector", "cyber_asset", "domain",
+                  description="DNS records"),
+    CollectorSpec("subdomains", "collectors.cyber.subdomains:SubdomainCollector", "cyber_asset", "domain", cost="high",
+                  description="Subdomain enumeration"),
+    CollectorSpec("whois", "collectors.cyber.whois:WhoisCollector", "cyber_asset", "domain", cost="high",
+                  upstream="whois", description="WHOIS information"),
+])
+
+def get_registry() -> CollectorRegistry:
+    """Return the shared collector registry"""
+    return registry
@@ -1,23 +1,134 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Dict, List, Optional
 
 class Settings(BaseSettings):
     # Database
     DATABASE_URL: str = "sqlite:///./osint.db"
 
+    # Database engine tuning
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800  # Seconds before a server connection is replaced
+    DB_POOL_PRE_PING: bool = True  # Check server connections before handing them out
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_CACHE_SIZE_KB: int = 64 * 1024  # Page cache per connection
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    SQLITE_TEMP_STORE: str = "MEMORY"
+
     # Security
     SECRET_KEY: str = "your-secret-key-here"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    TOKEN_CACHE_SIZE: int = 10000  # Verified tokens kept to skip signature checks
+    TOKEN_CACHE_TTL: float = 300.0  # Never longer than the token's own expiry
+    USER_CACHE_TTL: float = 60.0  # User lookups cached by CachedUserStore
+    REVOCATION_REFRESH_INTERVAL: float = 1.0  # Seconds before a logout in another worker process applies here
 
     # API
     API_V1_STR: str = "/api/v1"
     SERVER_NAME: str = "OSINT API"
     SERVER_HOST: str = "localhost"
     SERVER_PORT: int = 8000
+    API_LAZY_ROUTERS: bool = True  # Import the endpoints after startup instead of before it
+    SERVER_WORKERS: int = 0  # Processes serving the API, 0 means one per CPU
+
+    # State shared by the worker processes of a server: users, token
+    # revocations, collector results and rate limits. A SQLite file; unset
+    # keeps it in each process, which is only correct with one worker
+    SHARED_STATE_PATH: Optional[str] = None
+
+    # HTTP client (shared connection pool)
+    HTTP_TIMEOUT: int = 30
+    HTTP_POOL_LIMIT: int = 100
+    HTTP_POOL_LIMIT_PER_HOST: int = 10
+    HTTP_KEEPALIVE_TIMEOUT: float = 30.0
+    HTTP_DNS_CACHE_TTL: int = 300
+
+    # DNS resolution (empty nameserver list means use the system resolver)
+    DNS_NAMESERVERS: List[str] = []
+    DNS_PORT: int = 53
+    DNS_TIMEOUT: float = 2.0
+    DNS_LIFETIME: float = 5.0
+
+    # Subdomain brute-forcing
+    SUBDOMAIN_CONCURRENCY: int = 200
+    SUBDOMAIN_WORDLIST: Optional[str] = None  # Path to a wordlist, one label per line
+    SUBDOMAIN_WILDCARD_PROBES: int = 3
+
+    # WHOIS lookups
+    WHOIS_MAX_WORKERS: int = 8
+    WHOIS_RATE_LIMIT_INTERVAL: float = 1.0  # Seconds between queries to one registry server
+    WHOIS_CACHE_TTL: float = 3600.0
+    WHOIS_CACHE_SIZE: int = 4096
+
+    # Collector orchestration
+    COLLECTOR_MAX_CONCURRENCY: int = 32  # Collectors running at once across the process
+    COLLECTOR_TIMEOUT: float = 60.0
+    COLLECTOR_TIMEOUTS: Dict[str, float] = {}  # Per-collector overrides, by plan or class name
+
+    # Collector result cache
+    COLLECTOR_CACHE_ENABLED: bool = True
+    COLLECTOR_CACHE_TTL: float = 600.0
+    COLLECTOR_CACHE_TTLS: Dict[str, float] = {}  # Per-collector overrides, by class name
+    COLLECTOR_CACHE_MAX_ENTRIES: int = 10000
+    COLLECTOR_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    COLLECTOR_CACHE_PATH: Optional[str] = None  # SQLite file to persist results across restarts
+
+    # Resilience of upstream calls
+    RETRY_MAX_ATTEMPTS: int = 3
+    RETRY_BASE_DELAY: float = 0.5
+    RETRY_MAX_DELAY: float = 30.0
+    RATE_LIMIT_DEFAULT: float = 0.0  # Calls per second per upstream, 0 means unlimited
+    RATE_LIMIT_BURST: int = 5
+    RATE_LIMITS: Dict[str, float] = {}  # Per-upstream overrides, by upstream name
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD: int = 5
+    CIRCUIT_BREAKER_RESET_TIMEOUT: float = 30.0
+
+    # Bulk ingestion
+    BULK_CHUNK_SIZE: int = 1000  # Rows written and committed per transaction
+    BULK_MAX_ERRORS: int = 1000  # Row errors listed in a bulk report
+
+    # Extraction from large files
+    EXTRACT_CHUNK_SIZE: int = 8 * 1024 * 1024  # Bytes scanned per worker task
+    EXTRACT_MAX_TOKEN_LENGTH: int = 4096  # Bytes read past a chunk to complete a cut token
+    EXTRACT_WORKERS: int = 0  # Worker processes, 0 means one per CPU
+    EXTRACT_DEDUPE_CAPACITY: int = 5_000_000  # Distinct values the Bloom filter is sized for
+    EXTRACT_DEDUPE_ERROR_RATE: float = 1e-4  # About 27 MB of filter at the default capacity
+
+    # Listing and export
+    EXPORT_BATCH_SIZE: int = 1000  # Rows fetched per round trip when streaming an export
+
+    # Graph traversal
+    GRAPH_MAX_DEPTH: int = 4
+    GRAPH_DEFAULT_MAX_NODES: int = 500
+    GRAPH_MAX_NODES: int = 5000
+    GRAPH_MAX_KEY_DEGREE: int = 1000  # Keys shared by more entities (e.g. webmail domains) are not expanded
+    GRAPH_BATCH_SIZE: int = 500  # Ids or keys per IN (...) lookup
+
+    # Background jobs
+    JOBS_WORKER_CONCURRENCY: int = 4
+    JOBS_POLL_INTERVAL: float = 1.0
+    JOBS_LEASE_SECONDS: float = 60.0  # Renewed while a job runs; a worker silent for longer loses the job
+    JOBS_EMBEDDED_WORKER: bool = False  # Run a worker inside the API process (development)
 
     # Logging
     LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "text"  # "text" or "json" (one object per line)
+    LOG_FILE: Optional[str] = "osint.log"  # Empty to log to stdout only
+    LOG_ROTATION: str = "size"  # "size", "time" or "none"
+    LOG_MAX_BYTES: int = 50 * 1024 * 1024  # Size at which the file is rotated
+    LOG_ROTATE_WHEN: str = "midnight"  # Interval of time rotation, as in TimedRotatingFileHandler
+    LOG_BACKUP_COUNT: int = 5
+    LOG_QUEUE_SIZE: int = 10000  # Records waiting for the writer thread before new ones are dropped
+    LOG_SAMPLING: Dict[str, float] = {}  # Fraction of DEBUG/INFO records kept, by logger name
+
+    # Metrics
+    METRICS_ENABLED: bool = True  # Time DB statements and sample event loop lag
+    METRICS_MAX_SERIES: int = 1000  # Label combinations per metric before values collapse into "other"
+    METRICS_LOOP_LAG_INTERVAL: float = 0.5
 
     # External APIs (for OSINT collectors)
     SHODAN_API_KEY: Optional[str] = None
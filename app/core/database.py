@@ -1,13 +1,86 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from typing import Any, Dict, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from .config import settings
+from .metrics import instrument_engine
+
+# Sync driver URLs accepted in DATABASE_URL and the async driver used for them
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+}
+
+def async_url(url: str) -> str:
+    """Point a DATABASE_URL at the async driver of its backend"""
+    scheme, separator, rest = url.partition("://")
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}{separator}{rest}"
+
+def _is_memory_sqlite(url) -> bool:
+    return url.database in (None, "", ":memory:") or "mode=memory" in str(url)
+
+def sqlite_pragmas() -> Dict[str, Any]:
+    """Pragmas run on every new SQLite connection"""
+    return {
+        # Readers no longer block the writer and commits append to the WAL
+        # instead of rewriting pages; NORMAL only fsyncs at checkpoints
+        "journal_mode": settings.SQLITE_JOURNAL_MODE,
+        "synchronous": settings.SQLITE_SYNCHRONOUS,
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,
+        # Negative cache_size is in KiB rather than pages
+        "cache_size": -settings.SQLITE_CACHE_SIZE_KB,
+        "mmap_size": settings.SQLITE_MMAP_SIZE,
+        "temp_store": settings.SQLITE_TEMP_STORE,
+    }
+
+def engine_options(url: str) -> Dict[str, Any]:
+    """Engine keyword arguments tuned for the backend of url"""
+    url = make_url(url)
+    options: Dict[str, Any] = {"echo": settings.LOG_LEVEL == "DEBUG"}
+    if url.get_backend_name() == "sqlite":
+        if not _is_memory_sqlite(url):
+            # aiosqlite defaults to opening a connection (and a thread) per
+            # checkout; pool them instead, as with WAL each can read while one writes
+            options.update(
+                poolclass=AsyncAdaptedQueuePool,
+                pool_size=settings.DB_POOL_SIZE,
+                max_overflow=settings.DB_MAX_OVERFLOW,
+                pool_timeout=settings.DB_POOL_TIMEOUT,
+            )
+    else:
+        options.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            pool_pre_ping=settings.DB_POOL_PRE_PING,
+        )
+    return options
+
+def create_engine(url: Optional[str] = None) -> AsyncEngine:
+    """Create the async engine for url (DATABASE_URL by default) with per-backend tuning"""
+    url = async_url(url or settings.DATABASE_URL)
+    engine = create_async_engine(url, **engine_options(url))
+    if engine.dialect.name == "sqlite":
+        pragmas = sqlite_pragmas()
+
+        @event.listens_for(engine.sync_engine, "connect")
+        def set_sqlite_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+            cursor.close()
+
+    if settings.METRICS_ENABLED:
+        instrument_engine(engine)
+    return engine
 
 # Create async engine
-engine = create_async_engine(
-    settings.DATABASE_URL.replace("sqlite:///", "sqlite+aiosqlite:///"),
-    echo=True if settings.LOG_LEVEL == "DEBUG" else False,
-)
+engine = create_engine()
 
 # Create async session
 AsyncSessionLocal = sessionmaker(
@@ -19,10 +92,70 @@ AsyncSessionLocal = sessionmaker(
 # Base class for models
 Base = declarative_base()
 
+UNIT_OF_WORK = "unit_of_work"
+
+class UnitOfWork:
+    """Commit the writes of several service calls as one transaction
+
+    Services finish their writes with commit(db). Inside
+    ``async with UnitOfWork(db):`` that only flushes, and the block commits
+    once on exit, or rolls everything back if it raises. Nested units join
+    the outermost one.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.outermost = False
+
+    async def __aenter__(self) -> "UnitOfWork":
+        if UNIT_OF_WORK not in self.db.info:
+            self.db.info[UNIT_OF_WORK] = self
+            self.outermost = True
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if not self.outermost or self.db.info.get(UNIT_OF_WORK) is not self:
+            # Not the outermost unit, or already committed
+            return
+        del self.db.info[UNIT_OF_WORK]
+        if exc_type is None:
+            await self.db.commit()
+        else:
+            await self.db.rollback()
+
+    async def commit(self):
+        """Commit now instead of on exit, rolling back if the commit fails"""
+        if not self.outermost or self.db.info.get(UNIT_OF_WORK) is not self:
+            return
+        del self.db.info[UNIT_OF_WORK]
+        try:
+            await self.db.commit()
+        except BaseException:
+            await self.db.rollback()
+            raise
+
+async def commit(db: AsyncSession):
+    """Commit, or just flush when a unit of work will commit later"""
+    if UNIT_OF_WORK in db.info:
+        await db.flush()
+    else:
+        await db.commit()
+
+def dialect_insert(db: AsyncSession):
+    """insert() of the session's backend, the one with on_conflict_* clauses"""
+    dialect = db.bind.dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise NotImplementedError(f"Upserts are not supported on {dialect}")
+    return insert
+
 # Dependency to get DB session
 async def get_db() -> AsyncSession:
     async with AsyncSessionLocal() as session:
         try:
             yield session
         finally:
-            await session.close()
\ No newline at end of file
+            await session.close()
@@ -1,16 +1,184 @@
+import atexit
+import json
 import logging
+import logging.handlers
+import queue
 import sys
+import threading
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
 from .config import settings
+from .metrics import LOG_RECORDS_DROPPED
 
-def setup_logging():
-    logging.basicConfig(
-        level=getattr(logging, settings.LOG_LEVEL.upper(), logging.INFO),
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        handlers=[
-            logging.StreamHandler(sys.stdout),
-            logging.FileHandler("osint.log"),
-        ],
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+# Attributes every LogRecord has; anything else was passed with extra= and
+# is written as a field of its own by JsonFormatter
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, with extra= fields as top-level keys"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = self.formatStack(record.stack_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+class SamplingFilter(logging.Filter):
+    """Keep a fraction of the records below WARNING of chatty loggers
+
+    rates maps a logger name to the fraction kept, e.g.
+    ``{"collectors.cyber.dns": 0.01}``; it applies to child loggers too and
+    the longest matching name wins. Sampling is deterministic: a rate of
+    0.25 keeps every fourth record.
+    """
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = dict(rates)
+        self._credit: Dict[str, float] = {}
+        self._prefixes: Dict[str, Optional[str]] = {}
+        self._lock = threading.Lock()
+
+    def _prefix(self, name: str) -> Optional[str]:
+        prefix = self._prefixes.get(name, "")
+        if prefix == "":
+            prefix = None
+            candidate = name
+            while candidate:
+                if candidate in self.rates:
+                    prefix = candidate
+                    break
+                candidate = candidate.rpartition(".")[0]
+            self._prefixes[name] = prefix
+        return prefix
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        prefix = self._prefix(record.name)
+        if prefix is None:
+            return True
+        with self._lock:
+            credit = self._credit.get(prefix, 0.0) + self.rates[prefix]
+            keep = credit >= 1.0
+            self._credit[prefix] = credit - 1.0 if keep else credit
+        if not keep:
+            LOG_RECORDS_DROPPED.labels("sampled").inc()
+        return keep
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """Hand records to the writer thread without ever waiting on it
+
+    When the queue is full the record is dropped and counted, rather than
+    stalling the event loop behind a slow disk.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge the arguments here, while they still hold the values of the
+        # call, but leave the layout and tracebacks to the writer thread. The
+        # record is updated in place rather than copied, which other handlers
+        # of the record cannot tell apart
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            LOG_RECORDS_DROPPED.labels("queue_full").inc()
+
+class DrainingQueueListener(logging.handlers.QueueListener):
+    """QueueListener whose stop() waits for room in a full queue
+
+    The stock listener enqueues its stop sentinel with put_nowait, which
+    raises queue.Full on a bounded queue that is backed up; the writer
+    thread is draining it, so waiting for room always succeeds.
+    """
+
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+def build_handlers() -> List[logging.Handler]:
+    """The handlers that do the writing, on the listener thread"""
+    formatter = JsonFormatter() if settings.LOG_FORMAT == "json" else logging.Formatter(TEXT_FORMAT)
+    handlers: List[logging.Handler] = [logging.StreamHandler(sys.stdout)]
+    if settings.LOG_FILE:
+        if settings.LOG_ROTATION == "size":
+            handlers.append(logging.handlers.RotatingFileHandler(
+                settings.LOG_FILE, maxBytes=settings.LOG_MAX_BYTES,
+                backupCount=settings.LOG_BACKUP_COUNT, encoding="utf-8",
+            ))
+        elif settings.LOG_ROTATION == "time":
+            handlers.append(logging.handlers.TimedRotatingFileHandler(
+                settings.LOG_FILE, when=settings.LOG_ROTATE_WHEN,
+                backupCount=settings.LOG_BACKUP_COUNT, encoding="utf-8", utc=True,
+            ))
+        else:
+            handlers.append(logging.FileHandler(settings.LOG_FILE, encoding="utf-8"))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    return handlers
+
+_queue_handler: Optional[logging.Handler] = None
+_listener: Optional[DrainingQueueListener] = None
+
+def setup_logging(handlers: Optional[List[logging.Handler]] = None) -> DrainingQueueListener:
+    """Route the root logger through a queue to a background writer thread
+
+    Logging calls only enqueue the record; formatting, rotation and writes
+    happen on the listener thread. Calling it again replaces the previous
+    pipeline, after flushing it.
+    """
+    global _queue_handler, _listener
+    root = logging.getLogger()
+    shutdown_logging()
+
+    handler = NonBlockingQueueHandler(queue.Queue(settings.LOG_QUEUE_SIZE))
+    if settings.LOG_SAMPLING:
+        handler.addFilter(SamplingFilter(settings.LOG_SAMPLING))
+    _listener = DrainingQueueListener(
+        handler.queue, *(handlers if handlers is not None else build_handlers()), respect_handler_level=True
     )
+    _listener.start()
+    _queue_handler = handler
+    root.addHandler(handler)
+    root.setLevel(getattr(logging, settings.LOG_LEVEL.upper(), logging.INFO))
+    return _listener
+
+def shutdown_logging():
+    """Write out the queued records and stop the writer thread"""
+    global _queue_handler, _listener
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
+    if _listener is not None:
+        listener, _listener = _listener, None
+        try:
+            listener.stop()
+        finally:
+            for handler in listener.handlers:
+                handler.close()
+
+atexit.register(shutdown_logging)
+
+def get_logger(name: str) -> logging.Logger:
+    """Logger of a module, named after it so it can be sampled on its own"""
+    return logging.getLogger(name)
 
 # Get logger
-logger = logging.getLogger(__name__)
\ No newline at end of file
+logger = get_logger(__name__)
@@ -0,0 +1,237 @@
+import asyncio
+import math
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, List, Optional, Sequence, Tuple
+from .config import settings
+
+# Latency buckets in seconds, from a cached DB read to a slow upstream
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Label value used once a metric has METRICS_MAX_SERIES series, so an
+# unbounded label (a target's host) cannot grow memory without limit
+OVERFLOW_LABEL = "other"
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+class CounterChild:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+class GaugeChild(CounterChild):
+    __slots__ = ()
+
+    def set(self, value: float):
+        self.value = value
+
+    def dec(self, amount: float = 1.0):
+        self.inc(-amount)
+
+class HistogramChild:
+    __slots__ = ("buckets", "counts", "sum", "_lock")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        # One slot per bucket plus +Inf; made cumulative when rendered
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+class Metric:
+    """A named metric with one series per combination of label values"""
+
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), registry: Optional["Registry"] = None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            self._children[()] = self._new_child()
+        (registry or REGISTRY).register(self)
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values: str):
+        """The series of these label values, created on first use"""
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.get(values)
+                if child is None:
+                    if len(values) != len(self.labelnames):
+                        raise ValueError(f"{self.name} expects labels {self.labelnames}")
+                    if len(self._children) >= settings.METRICS_MAX_SERIES:
+                        values = (OVERFLOW_LABEL,) * len(values)
+                        child = self._children.get(values)
+                    if child is None:
+                        child = self._children[values] = self._new_child()
+        return child
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        # labels() may add a series from another thread while this renders
+        with self._lock:
+            children = sorted(self._children.items())
+        for values, child in children:
+            lines.extend(self._render_child(values, child))
+        return lines
+
+    def _render_child(self, values, child) -> List[str]:
+        return [f"{self.name}{_labels(self.labelnames, values)} {_format_value(child.value)}"]
+
+class Counter(Metric):
+    type = "counter"
+
+    def _new_child(self):
+        return CounterChild()
+
+    def inc(self, amount: float = 1.0):
+        self._children[()].inc(amount)
+
+class Gauge(Metric):
+    type = "gauge"
+
+    def _new_child(self):
+        return GaugeChild()
+
+    def set(self, value: float):
+        self._children[()].set(value)
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS, registry: Optional["Registry"] = None):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def _new_child(self):
+        return HistogramChild(self.buckets)
+
+    def observe(self, value: float):
+        self._children[()].observe(value)
+
+    def _render_child(self, values, child) -> List[str]:
+        with child._lock:
+            counts, total = list(child.counts), child.sum
+        lines, cumulative = [], 0
+        for bound, count in zip(self.buckets + (math.inf,), counts):
+            cumulative += count
+            le = f'le="{_format_value(bound)}"'
+            lines.append(f"{self.name}_bucket{_labels(self.labelnames, values, le)} {cumulative}")
+        lines.append(f"{self.name}_sum{_labels(self.labelnames, values)} {_format_value(total)}")
+        lines.append(f"{self.name}_count{_labels(self.labelnames, values)} {cumulative}")
+        return lines
+
+class Registry:
+    """The metrics exposed together on /metrics"""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+REGISTRY = Registry()
+
+# Content type of Registry.render()
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+COLLECTOR_DURATION = Histogram(
+    "osint_collector_duration_seconds", "Time spent collecting, excluding cache hits", ["collector"]
+)
+COLLECTOR_RUNS = Counter(
+    "osint_collector_runs_total", "Collections by outcome (ok, error, cancelled)", ["collector", "outcome"]
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "osint_http_request_duration_seconds", "Outgoing HTTP request latency", ["host", "method"]
+)
+HTTP_RESPONSES = Counter(
+    "osint_http_responses_total", "Outgoing HTTP responses by status code (error when none was received)",
+    ["host", "method", "status"],
+)
+DB_QUERY_DURATION = Histogram(
+    "osint_db_query_duration_seconds", "Database statement execution time", ["operation"]
+)
+EVENT_LOOP_LAG = Histogram(
+    "osint_event_loop_lag_seconds", "Delay of a sampling timer beyond its schedule",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+LOG_RECORDS_DROPPED = Counter(
+    "osint_log_records_dropped_total", "Log records not written (sampled, queue_full)", ["reason"]
+)
+
+# Operation label of DB queries: these keywords are all six letters long, so
+# the label is read straight off the start of the statement
+DB_OPERATIONS = ("SELECT", "INSERT", "UPDATE", "DELETE", "PRAGMA", "OTHER")
+_DB_SERIES = {operation: DB_QUERY_DURATION.labels(operation) for operation in DB_OPERATIONS}
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._metrics_started = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_metrics_started", None)
+    if started is None:
+        return
+    series = _DB_SERIES.get(statement[:6].upper()) or _DB_SERIES["OTHER"]
+    series.observe(time.perf_counter() - started)
+
+def instrument_engine(engine):
+    """Time every statement the engine runs"""
+    from sqlalchemy import event
+    sync_engine = getattr(engine, "sync_engine", engine)
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+async def sample_event_loop_lag(interval: Optional[float] = None):
+    """Measure how late a timer fires, until cancelled
+
+    A callback that blocks the loop delays every other task by as much,
+    which shows up here as lag.
+    """
+    interval = interval or settings.METRICS_LOOP_LAG_INTERVAL
+    loop = asyncio.get_running_loop()
+    while True:
+        scheduled = loop.time() + interval
+        await asyncio.sleep(interval)
+        EVENT_LOOP_LAG.observe(max(0.0, loop.time() - scheduled))
@@ -1,8 +1,19 @@
+import asyncio
+import hashlib
+import sqlite3
+import threading
+import time
+import uuid
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Dict, Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+from utils.cache import TTLCache
+from utils.shared_state import SQLiteState
 from .config import settings
+from .logging import get_logger
+
+logger = get_logger(__name__)
 
 # Use a PBKDF2-based scheme to avoid bcrypt binary/ABI issues in some environments.
 # `pbkdf2_sha256` is secure for this MVP and doesn't require the native `bcrypt` package.
@@ -16,20 +27,215 @@ def get_password_hash(password: str) -> str:
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
+    now = datetime.utcnow()
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = now + expires_delta
     else:
-        expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
+        expire = now + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    # A unique jti keeps two tokens issued within the same second apart, so
+    # revoking one at logout never revokes the next login's
+    to_encode.update({"exp": expire, "iat": now, "jti": uuid.uuid4().hex})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
-def verify_token(token: str) -> Optional[str]:
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None:
+class RevocationList:
+    """Revoked tokens and the token version of each user, held in this process
+
+    Tokens carry the version of their user when they were issued in their
+    "ver" claim; revoking a user bumps the version, which rejects every
+    token issued before but none issued after, even within the same second.
+    Checks are synchronous as they run on every request; changes are
+    coroutines, so that a shared list can write off the event loop.
+    """
+
+    def __init__(self):
+        # Revoked token -> its exp; unbounded so no revocation is ever evicted,
+        # but pruned as the tokens expire
+        self._tokens: Dict[str, float] = {}
+        self._versions: Dict[str, int] = {}
+
+    def _key(self, token: str) -> str:
+        return token
+
+    async def revoke(self, token: str, expires_at: float):
+        now = time.time()
+        self._tokens = {revoked: expires for revoked, expires in self._tokens.items() if expires > now}
+        self._tokens[self._key(token)] = expires_at
+
+    async def revoke_user(self, username: str):
+        self._versions[username] = self._versions.get(username, 0) + 1
+
+    async def user_version(self, username: str) -> int:
+        return self._versions.get(username, 0)
+
+    def is_revoked(self, token: str, claims: Dict[str, Any]) -> bool:
+        if self._key(token) in self._tokens:
+            return True
+        return claims.get("ver", 0) < self._versions.get(claims.get("sub"), 0)
+
+class SQLiteRevocationList(RevocationList):
+    """Revoked tokens and users in a SQLite file, seen by every worker process
+
+    Checks are answered from a copy of the tables in this process, reloaded
+    in a thread once it is refresh_interval seconds old, so requests never
+    wait on the file. Changes are written in a thread and apply to this
+    process at once, to the others within refresh_interval. Tokens are
+    stored as their SHA-256 digest.
+    """
+
+    def __init__(self, path: str, refresh_interval: Optional[float] = None):
+        super().__init__()
+        self.state = SQLiteState(path, [
+            "CREATE TABLE IF NOT EXISTS revoked_tokens (digest TEXT PRIMARY KEY, expires_at REAL NOT NULL)",
+            "CREATE TABLE IF NOT EXISTS token_versions (username TEXT PRIMARY KEY, version INTEGER NOT NULL)",
+        ])
+        self.refresh_interval = settings.REVOCATION_REFRESH_INTERVAL if refresh_interval is None else refresh_interval
+        self._refreshing = threading.Lock()
+        self._refreshed_at = float("-inf")
+        # Bumped by each change made here, so a reload that read the tables
+        # before the change does not drop it from the copy
+        self._changes = 0
+        self.refresh()
+
+    def _key(self, token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def refresh(self):
+        """Reload the copy of the tables, unless another reload is under way"""
+        if not self._refreshing.acquire(blocking=False):
+            return
+        try:
+            changes = self._changes
+            conn = self.state.connection()
+            tokens = dict(conn.execute("SELECT digest, expires_at FROM revoked_tokens WHERE expires_at > ?", (time.time(),)))
+            versions = dict(conn.execute("SELECT username, version FROM token_versions"))
+            if changes == self._changes:
+                self._tokens, self._versions = tokens, versions
+                self._refreshed_at = time.monotonic()
+        except sqlite3.Error as e:
+            # Keep serving the previous copy; the next check tries again
+            logger.error("Could not reload revocations from %s: %s", self.state.path, e)
+        finally:
+            self._refreshing.release()
+
+    def is_revoked(self, token: str, claims: Dict[str, Any]) -> bool:
+        if time.monotonic() - self._refreshed_at >= self.refresh_interval and not self._refreshing.locked():
+            try:
+                asyncio.get_running_loop().run_in_executor(None, self.refresh)
+            except RuntimeError:
+                # No event loop: reload right here
+                self.refresh()
+        return super().is_revoked(token, claims)
+
+    async def revoke(self, token: str, expires_at: float):
+        digest = self._key(token)
+
+        def write():
+            with self.state.transaction() as conn:
+                conn.execute("DELETE FROM revoked_tokens WHERE expires_at <= ?", (time.time(),))
+                conn.execute(
+                    "INSERT OR REPLACE INTO revoked_tokens (digest, expires_at) VALUES (?, ?)", (digest, expires_at)
+                )
+
+        await asyncio.to_thread(write)
+        self._tokens[digest] = expires_at
+        self._changes += 1
+
+    async def revoke_user(self, username: str):
+        def write() -> int:
+            with self.state.transaction() as conn:
+                return conn.execute(
+                    "INSERT INTO token_versions (username, version) VALUES (?, 1) "
+                    "ON CONFLICT (username) DO UPDATE SET version = version + 1 RETURNING version",
+                    (username,),
+                ).fetchone()[0]
+
+        self._versions[username] = await asyncio.to_thread(write)
+        self._changes += 1
+
+    async def user_version(self, username: str) -> int:
+        # Read from the file rather than the copy, which may not have seen a
+        # revocation made by another process a moment ago yet
+        def read() -> int:
+            row = self.state.connection().execute(
+                "SELECT version FROM token_versions WHERE username = ?", (username,)
+            ).fetchone()
+            return row[0] if row else 0
+
+        return await asyncio.to_thread(read)
+
+class TokenVerifier:
+    """Verify access tokens, caching the claims of the valid ones
+
+    A cached token skips the signature check and JSON decoding. Entries are
+    kept at most ttl seconds and never past the token's exp, and the cache
+    holds at most maxsize tokens (least recently used evicted first).
+    revoke() rejects one token until it expires; revoke_user() rejects every
+    token issued to a user by issue() so far. Revocations are checked on
+    every call, cached or not, so a shared revocation list applies across
+    processes.
+    """
+
+    def __init__(
+        self, maxsize: Optional[int] = None, ttl: Optional[float] = None, revocations: Optional[RevocationList] = None
+    ):
+        maxsize = maxsize or settings.TOKEN_CACHE_SIZE
+        self.ttl = settings.TOKEN_CACHE_TTL if ttl is None else ttl
+        self._valid = TTLCache(maxsize=maxsize, ttl=self.ttl)
+        self.revocations = revocations or RevocationList()
+
+    def verify(self, token: str) -> Optional[Dict[str, Any]]:
+        """Return the claims of a valid, unrevoked token, None otherwise"""
+        claims = self._valid.get(token)
+        if claims is None:
+            try:
+                claims = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+            except JWTError:
+                return None
+            remaining = self._remaining(claims)
+            if remaining is not None and remaining <= 0:
+                return None
+            ttl = self.ttl if remaining is None else min(self.ttl, remaining)
+            if ttl > 0:
+                self._valid.set(token, claims, ttl=ttl)
+
+        if self.revocations.is_revoked(token, claims):
             return None
-        return username
-    except JWTError:
-        return None
\ No newline at end of file
+        return claims
+
+    async def issue(self, data: dict, expires_delta: Optional[timedelta] = None) -> str:
+        """Create an access token stamped with the current token version of its user"""
+        version = await self.revocations.user_version(data["sub"])
+        return create_access_token({**data, "ver": version}, expires_delta=expires_delta)
+
+    async def revoke(self, token: str):
+        """Reject a token from now on, until it expires"""
+        self._valid.delete(token)
+        try:
+            exp = jwt.get_unverified_claims(token).get("exp")
+        except JWTError:
+            return
+        await self.revocations.revoke(token, float("inf") if exp is None else float(exp))
+
+    async def revoke_user(self, username: str):
+        """Reject every token issued to a user so far, e.g. after a password change"""
+        await self.revocations.revoke_user(username)
+
+    def clear(self):
+        self._valid.clear()
+
+    @staticmethod
+    def _remaining(claims: Dict[str, Any]) -> Optional[float]:
+        exp = claims.get("exp")
+        return None if exp is None else float(exp) - time.time()
+
+token_verifier = TokenVerifier(
+    revocations=SQLiteRevocationList(settings.SHARED_STATE_PATH) if settings.SHARED_STATE_PATH else None
+)
+
+def verify_token(token: str) -> Optional[str]:
+    """Return the user a token was issued to, None when it is invalid or revoked"""
+    claims = token_verifier.verify(token)
+    if claims is None:
+        return None
+    return claims.get("sub")
\ No newline at end of file
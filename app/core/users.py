@@ -0,0 +1,132 @@
+import asyncio
+import json
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Optional, Union
+from utils.cache import TTLCache
+from utils.shared_state import SQLiteState
+from .config import settings
+from .security import get_password_hash
+
+User = Dict[str, Any]
+
+class UserStore(ABC):
+    """Where authentication looks users up
+
+    Subclass it to back logins with a users table or a directory service and
+    install it with set_user_store().
+    """
+
+    @abstractmethod
+    async def get_user(self, username: str) -> Optional[User]:
+        """The user with this username, None when there is none"""
+
+class InMemoryUserStore(UserStore):
+    """Users held in a dict, keyed by username
+
+    users may also be a function returning that dict, called on the first
+    lookup, for users that are costly to build (their password hashes). It
+    runs in a thread so the event loop keeps serving meanwhile.
+    """
+
+    def __init__(self, users: Union[Dict[str, User], Callable[[], Dict[str, User]]]):
+        self._users = users
+
+    async def load(self) -> Dict[str, User]:
+        """The users, built on first use"""
+        build = self._users
+        if callable(build):
+            users = await asyncio.to_thread(build)
+            # Concurrent first lookups each build; the first one to finish wins
+            if self._users is build:
+                self._users = users
+        return self._users
+
+    async def get_user(self, username: str) -> Optional[User]:
+        return (await self.load()).get(username)
+
+class SQLiteUserStore(UserStore):
+    """Users in a SQLite file, shared by the worker processes of a server
+
+    The table is filled from seed, a function returning users by username,
+    the first time it is found empty.
+    """
+
+    def __init__(self, path: str, seed: Optional[Callable[[], Dict[str, User]]] = None):
+        self.state = SQLiteState(path, [
+            "CREATE TABLE IF NOT EXISTS users (username TEXT PRIMARY KEY, data TEXT NOT NULL)"
+        ])
+        self.seed = seed
+
+    def _get(self, username: str) -> Optional[User]:
+        conn = self.state.connection()
+        row = conn.execute("SELECT data FROM users WHERE username = ?", (username,)).fetchone()
+        if row is None and self.seed is not None:
+            with self.state.transaction() as conn:
+                if conn.execute("SELECT 1 FROM users LIMIT 1").fetchone() is None:
+                    for user in self.seed().values():
+                        self._put(conn, user)
+            self.seed = None
+            row = conn.execute("SELECT data FROM users WHERE username = ?", (username,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    @staticmethod
+    def _put(conn, user: User):
+        conn.execute("INSERT OR REPLACE INTO users (username, data) VALUES (?, ?)", (user["username"], json.dumps(user)))
+
+    async def get_user(self, username: str) -> Optional[User]:
+        return await asyncio.to_thread(self._get, username)
+
+    async def set_user(self, user: User):
+        """Add or replace a user"""
+        def put():
+            with self.state.transaction() as conn:
+                self._put(conn, user)
+        await asyncio.to_thread(put)
+
+class CachedUserStore(UserStore):
+    """Cache the lookups of a slower store for a short TTL"""
+
+    def __init__(self, store: UserStore, ttl: Optional[float] = None, maxsize: int = 10000):
+        self.store = store
+        self._cache = TTLCache(maxsize=maxsize, ttl=settings.USER_CACHE_TTL if ttl is None else ttl)
+
+    async def get_user(self, username: str) -> Optional[User]:
+        user = self._cache.get(username)
+        if user is None:
+            user = await self.store.get_user(username)
+            if user is not None:
+                self._cache.set(username, user)
+        return user
+
+    def invalidate(self, username: str):
+        self._cache.delete(username)
+
+def default_users() -> Dict[str, User]:
+    """Simple user store for MVP (in production, use proper user management)
+
+    Built on the first login rather than at import, so starting a process
+    does not pay for a PBKDF2 hash.
+    """
+    return {
+        "admin": {
+            "username": "admin",
+            "hashed_password": get_password_hash("admin"),
+            "full_name": "Administrator"
+        }
+    }
+
+def default_user_store() -> UserStore:
+    """The shared store when SHARED_STATE_PATH is set, an in-memory one otherwise"""
+    if settings.SHARED_STATE_PATH:
+        return CachedUserStore(SQLiteUserStore(settings.SHARED_STATE_PATH, seed=default_users))
+    return InMemoryUserStore(default_users)
+
+user_store: UserStore = default_user_store()
+
+def get_user_store() -> UserStore:
+    """Return the installed user store (also usable as a FastAPI dependency)"""
+    return user_store
+
+def set_user_store(store: UserStore):
+    global user_store
+    user_store = store
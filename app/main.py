@@ -3,26 +3,60 @@
 OSINT MVP Application
 """
 
+import asyncio
 import uvicorn
 import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, Response
 
 from core.config import settings
 from core.logging import setup_logging
-from api.v1.api import api_router
+from core.metrics import CONTENT_TYPE, REGISTRY, sample_event_loop_lag
+from api.lazy import LazyRouter, LazyRouterMiddleware
+from api.unit_of_work import UnitOfWorkMiddleware
+from utils.http_client import http_client
 
 # Setup logging
 setup_logging()
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open process-wide resources on startup and release them on shutdown"""
+    await http_client.start()
+    app.state.http_client = http_client
+    lag_sampler = asyncio.create_task(sample_event_loop_lag()) if settings.METRICS_ENABLED else None
+    # Start serving right away and import the API routers in the background
+    preload = asyncio.create_task(api_router.preload()) if settings.API_LAZY_ROUTERS else None
+
+    worker = worker_task = None
+    if settings.JOBS_EMBEDDED_WORKER:
+        from tasks.worker import Worker
+        worker = Worker()
+        worker_task = asyncio.create_task(worker.run())
+    try:
+        yield
+    finally:
+        if worker:
+            worker.stop()
+            worker_task.cancel()
+            await asyncio.gather(worker_task, return_exceptions=True)
+        if preload:
+            await asyncio.gather(preload, return_exceptions=True)
+        if lag_sampler:
+            lag_sampler.cancel()
+            await asyncio.gather(lag_sampler, return_exceptions=True)
+        await http_client.close()
+
 # Create FastAPI app
 app = FastAPI(
     title=settings.SERVER_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 # Set up CORS
@@ -34,8 +68,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Commit the unit of work of write requests before responding
+app.add_middleware(UnitOfWorkMiddleware)
+
 # Include API router
-app.include_router(api_router, prefix=settings.API_V1_STR)
+api_router = LazyRouter(app, "api.v1.api:api_router", settings.API_V1_STR)
+if settings.API_LAZY_ROUTERS:
+    app.add_middleware(LazyRouterMiddleware, router=api_router)
+else:
+    api_router.load()
 
 # Mount static files (dashboard)
 static_dir = os.path.join(os.path.dirname(__file__), "static")
@@ -58,13 +99,17 @@ async def root():
         "docs": "http://localhost:8000/docs",
         "redoc": "http://localhost:8000/redoc",
         "health": "http://localhost:8000/health",
+        "metrics": "http://localhost:8000/metrics",
         "api_v1": f"http://localhost:8000{settings.API_V1_STR}",
         "endpoints": {
             "auth": f"http://localhost:8000{settings.API_V1_STR}/auth",
             "persons": f"http://localhost:8000{settings.API_V1_STR}/persons",
             "companies": f"http://localhost:8000{settings.API_V1_STR}/companies",
             "cyber": f"http://localhost:8000{settings.API_V1_STR}/cyber",
-            "investigations": f"http://localhost:8000{settings.API_V1_STR}/investigations"
+            "investigations": f"http://localhost:8000{settings.API_V1_STR}/investigations",
+            "jobs": f"http://localhost:8000{settings.API_V1_STR}/jobs",
+            "graph": f"http://localhost:8000{settings.API_V1_STR}/graph",
+            "collectors": f"http://localhost:8000{settings.API_V1_STR}/collectors"
         }
     }
 
@@ -73,10 +118,42 @@ async def health_check():
     """Health check endpoint"""
     return {"status": "healthy", "version": "1.0.0"}
 
-if __name__ == "__main__":
+@app.get("/health/http")
+async def http_pool_stats():
+    """Connection pool statistics of the shared HTTP client"""
+    return http_client.pool_stats()
+
+@app.get("/health/cache")
+async def collector_cache_stats():
+    """Statistics of the collector result cache"""
+    from collectors.base import collector_cache
+    return collector_cache.stats()
+
+@app.get("/metrics")
+async def metrics():
+    """Collector, HTTP client, database and event loop metrics in the Prometheus text format"""
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
+
+def serve():
+    """Run the API with SERVER_WORKERS processes (one per CPU by default)
+
+    Each worker is a separate process with its own event loop. Unless
+    SHARED_STATE_PATH is set, they are pointed at a common state file so
+    that users, token revocations, collector results and rate limits are
+    shared. Reloading in DEBUG runs a single process.
+    """
+    reload = settings.LOG_LEVEL == "DEBUG"
+    workers = 1 if reload else settings.SERVER_WORKERS or os.cpu_count() or 1
+    if workers > 1 and not settings.SHARED_STATE_PATH:
+        # Workers are spawned fresh and read their settings from the environment
+        os.environ["SHARED_STATE_PATH"] = os.path.abspath("osint_state.db")
     uvicorn.run(
         "main:app",
         host=settings.SERVER_HOST,
         port=settings.SERVER_PORT,
-        reload=True if settings.LOG_LEVEL == "DEBUG" else False,
-    )
\ No newline at end of file
+        reload=reload,
+        workers=workers,
+    )
+
+if __name__ == "__main__":
+    serve()
@@ -0,0 +1,16 @@
+from sqlalchemy import Column, String, Integer, Index, UniqueConstraint
+from .base import BaseModel
+
+class CorrelationKey(BaseModel):
+    __tablename__ = "correlation_keys"
+    __table_args__ = (
+        # Lookups go by key, cleanup and reindexing by entity
+        Index("ix_correlation_keys_key", "key_type", "key_value"),
+        Index("ix_correlation_keys_entity", "entity_type", "entity_id"),
+        UniqueConstraint("key_type", "key_value", "entity_type", "entity_id", name="uq_correlation_keys"),
+    )
+
+    key_type = Column(String, nullable=False)  # email, domain, name, username, ip
+    key_value = Column(String, nullable=False)  # Normalized value
+    entity_type = Column(String, nullable=False)  # person, company, cyber_asset
+    entity_id = Column(Integer, nullable=False)
@@ -4,7 +4,7 @@ from .base import BaseModel
 class CyberAsset(BaseModel):
     __tablename__ = "cyber_assets"
 
-    domain = Column(String, index=True)
+    domain = Column(String, unique=True, index=True)
     ip_address = Column(String)
     subdomains = Column(JSON)  # List of subdomains
     dns_records = Column(JSON)  # DNS records
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, String, JSON, Integer, ForeignKey, Index
+from .base import BaseModel
+
+# One row per collector result of an investigation; rows are only ever appended
+class Finding(BaseModel):
+    __tablename__ = "findings"
+    __table_args__ = (
+        # Reads page by id within an investigation, optionally per collector or time range
+        Index("ix_findings_investigation_id", "investigation_id", "id"),
+        Index("ix_findings_investigation_collector", "investigation_id", "collector", "id"),
+        Index("ix_findings_investigation_created", "investigation_id", "created_at"),
+    )
+
+    investigation_id = Column(Integer, ForeignKey("investigations.id", ondelete="CASCADE"), nullable=False)
+    collector = Column(String, nullable=False)  # Collector name, e.g. "dns"
+    target = Column(String)  # Value the collector ran on
+    entity_type = Column(String)  # Entity the target came from, if any
+    entity_id = Column(Integer)
+    status = Column(String, default="ok")  # ok, error, timeout
+    data = Column(JSON)  # Collector payload
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, JSON, Integer, ForeignKey
+from sqlalchemy import Column, String, Text, JSON, Integer, ForeignKey, UniqueConstraint
 from sqlalchemy.orm import relationship
 from .base import BaseModel
 
@@ -8,14 +8,23 @@ class Investigation(BaseModel):
     title = Column(String, index=True)
     description = Column(Text)
     status = Column(String, default="active")  # active, completed, paused
-    target_person_id = Column(Integer, ForeignKey("persons.id"))
-    target_company_id = Column(Integer, ForeignKey("companies.id"))
-    target_cyber_asset_id = Column(Integer, ForeignKey("cyber_assets.id"))
-    findings = Column(JSON)  # Collected data
+    target_person_id = Column(Integer, ForeignKey("persons.id"), index=True)
+    target_company_id = Column(Integer, ForeignKey("companies.id"), index=True)
+    target_cyber_asset_id = Column(Integer, ForeignKey("cyber_assets.id"), index=True)
     notes = Column(Text)
     tags = Column(JSON)  # List of tags
 
     # Relationships
     target_person = relationship("Person")
     target_company = relationship("Company")
-    target_cyber_asset = relationship("CyberAsset")
\ No newline at end of file
+    target_cyber_asset = relationship("CyberAsset")
+
+class InvestigationTarget(BaseModel):
+    __tablename__ = "investigation_targets"
+    __table_args__ = (
+        UniqueConstraint("investigation_id", "entity_type", "entity_id", name="uq_investigation_targets"),
+    )
+
+    investigation_id = Column(Integer, ForeignKey("investigations.id", ondelete="CASCADE"), nullable=False, index=True)
+    entity_type = Column(String, nullable=False)  # person, company, cyber_asset
+    entity_id = Column(Integer, nullable=False)
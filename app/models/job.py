@@ -0,0 +1,17 @@
+from sqlalchemy import Column, String, Text, JSON, Integer, Boolean, DateTime
+from .base import BaseModel
+
+class Job(BaseModel):
+    __tablename__ = "jobs"
+
+    entity_type = Column(String, index=True)  # person, company, cyber_asset
+    entity_id = Column(Integer)
+    collectors = Column(JSON)  # Optional subset of the entity's collection plan
+    status = Column(String, default="queued", index=True)  # queued, running, completed, failed, cancelled
+    cancel_requested = Column(Boolean, default=False)
+    worker_id = Column(String)
+    lease_expires_at = Column(DateTime(timezone=True), index=True)  # A running job past it is taken over
+    result = Column(JSON)
+    error = Column(Text)
+    started_at = Column(DateTime(timezone=True))
+    finished_at = Column(DateTime(timezone=True))
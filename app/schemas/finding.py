@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+from typing import Optional, Any
+from datetime import datetime
+
+class FindingCreate(BaseModel):
+    collector: str
+    target: Optional[str] = None
+    entity_type: Optional[str] = None
+    entity_id: Optional[int] = None
+    status: Optional[str] = "ok"
+    data: Optional[Any] = None
+
+class Finding(FindingCreate):
+    id: int
+    investigation_id: int
+    created_at: datetime
+
+    class Config:
+        orm_mode = True
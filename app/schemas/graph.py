@@ -0,0 +1,28 @@
+from pydantic import BaseModel
+from typing import Optional, List, Literal
+
+EdgeType = Literal["email", "domain", "name", "username", "ip"]
+
+class GraphKey(BaseModel):
+    key_type: str
+    key_value: str
+
+class GraphNode(BaseModel):
+    id: str  # "<entity_type>:<entity_id>"
+    entity_type: str
+    entity_id: int
+    label: Optional[str] = None
+    depth: int
+
+class GraphEdge(BaseModel):
+    source: str
+    target: str
+    keys: List[GraphKey]
+
+class Graph(BaseModel):
+    root: str
+    depth: int
+    truncated: bool
+    nodes: List[GraphNode]
+    edges: List[GraphEdge]
+    skipped_keys: List[GraphKey] = []
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional, List, Dict
+from typing import Optional, List, Literal
 from datetime import datetime
 
 class InvestigationBase(BaseModel):
@@ -9,7 +9,6 @@ class InvestigationBase(BaseModel):
     target_person_id: Optional[int] = None
     target_company_id: Optional[int] = None
     target_cyber_asset_id: Optional[int] = None
-    findings: Optional[Dict] = {}
     notes: Optional[str] = None
     tags: Optional[List[str]] = []
 
@@ -25,4 +24,19 @@ class Investigation(InvestigationBase):
     updated_at: Optional[datetime] = None
 
     class Config:
-        orm_mode = True
\ No newline at end of file
+        orm_mode = True
+
+class InvestigationTargetCreate(BaseModel):
+    entity_type: Literal["person", "company", "cyber_asset"]
+    entity_id: int
+
+class InvestigationTarget(InvestigationTargetCreate):
+    id: int
+    investigation_id: int
+    created_at: datetime
+
+    class Config:
+        orm_mode = True
+
+class InvestigationRun(BaseModel):
+    collectors: Optional[List[str]] = None
@@ -0,0 +1,33 @@
+from pydantic import BaseModel
+from typing import Optional, List, Dict, Literal
+from datetime import datetime
+
+class JobCreate(BaseModel):
+    entity_type: Literal["person", "company", "cyber_asset"]
+    entity_id: int
+    collectors: Optional[List[str]] = None
+
+class Job(BaseModel):
+    id: int
+    entity_type: str
+    entity_id: int
+    collectors: Optional[List[str]] = None
+    status: str
+    cancel_requested: Optional[bool] = False
+    worker_id: Optional[str] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        orm_mode = True
+
+class JobResult(BaseModel):
+    id: int
+    status: str
+    result: Optional[Dict] = None
+    error: Optional[str] = None
+
+    class Config:
+        orm_mode = True
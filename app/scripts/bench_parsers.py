@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Benchmark text extraction and validation throughput
+
+Compares the per-call raw-pattern implementations the parsers used to have
+with the precompiled extractors, the single-pass extract_all() scanner and
+validate_many():
+
+    python scripts/bench_parsers.py --size-mb 8 --records 500000
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import random
+import re
+import string
+import time
+
+from utils.parsers import DataParser
+from utils.validators import DataValidator
+
+def legacy_extract(text: str):
+    """The extractors as they were: raw patterns passed to re.findall on every call"""
+    emails = list(set(re.findall(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text)))
+    phones = list(set(re.findall(r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b', text)))
+    usernames = list(set(re.findall(r'@(\w+)', text)))
+    domains = list(set(re.findall(r'\b([a-zA-Z0-9-]+\.)+[a-zA-Z]{2,}\b', text)))
+    return emails, phones, usernames, domains
+
+def legacy_parse_whois(raw_whois: str):
+    parsed = {}
+    for line in raw_whois.split('\n'):
+        if ':' in line:
+            key, value = line.split(':', 1)
+            key = key.strip().lower().replace(' ', '_')
+            value = value.strip()
+            if key and value:
+                parsed[key] = value
+    return parsed
+
+def legacy_validate_email(email: str) -> bool:
+    if not email or not isinstance(email, str):
+        return False
+    return bool(re.match(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$', email.strip()))
+
+def compiled_extract(text: str):
+    return (
+        DataParser.extract_emails(text),
+        DataParser.extract_phone_numbers(text),
+        DataParser.extract_usernames(text),
+        DataParser.extract_domains(text),
+    )
+
+def _word(rng: random.Random, low: int = 3, high: int = 10) -> str:
+    return ''.join(rng.choices(string.ascii_lowercase, k=rng.randint(low, high)))
+
+def make_dump(size: int, seed: int = 7) -> str:
+    """A paste-dump-like text: prose with emails, domains, phones and @mentions"""
+    rng = random.Random(seed)
+    parts, length = [], 0
+    while length < size:
+        roll = rng.random()
+        if roll < 0.05:
+            token = f"{_word(rng)}.{_word(rng)}@{_word(rng)}.{rng.choice(['com', 'org', 'com.py', 'net'])}"
+        elif roll < 0.08:
+            token = f"www.{_word(rng)}.{rng.choice(['com', 'io', 'gov.py'])}"
+        elif roll < 0.10:
+            token = f"{rng.randint(200, 999)}-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}"
+        elif roll < 0.12:
+            token = f"@{_word(rng)}"
+        else:
+            token = _word(rng)
+        parts.append(token)
+        length += len(token) + 1
+    return ' '.join(parts)
+
+def make_whois(lines: int, seed: int = 7) -> str:
+    rng = random.Random(seed)
+    keys = ['Domain Name', 'Registrar', 'Name Server', 'Updated Date', 'Registrant Email', 'Status']
+    return '\n'.join(
+        f"{rng.choice(keys)}: {_word(rng)}.{_word(rng)}" if rng.random() < 0.8 else f"% {_word(rng)} {_word(rng)}"
+        for _ in range(lines)
+    )
+
+def make_records(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    return [
+        f"{_word(rng)}@{_word(rng)}.com" if rng.random() < 0.7 else f"{_word(rng)} {_word(rng)}"
+        for _ in range(count)
+    ]
+
+def timed(fn, *args, repeat: int = 3) -> float:
+    """Best wall time of fn(*args) over repeat runs"""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+def report(label: str, seconds: float, megabytes: float = None, items: int = None, baseline: float = None):
+    line = f"{label:<36} {seconds * 1000:9.1f} ms"
+    if megabytes is not None:
+        line += f" {megabytes / seconds:9.1f} MB/s"
+    if items is not None:
+        line += f" {items / seconds / 1e6:9.2f} M items/s"
+    if baseline is not None:
+        line += f"   x{baseline / seconds:.2f}"
+    print(line)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark parser and validator throughput")
+    parser.add_argument("--size-mb", type=float, default=4.0, help="Size of the generated text dump")
+    parser.add_argument("--whois-lines", type=int, default=200000, help="Lines of generated WHOIS text")
+    parser.add_argument("--records", type=int, default=300000, help="Records given to the validators")
+    args = parser.parse_args()
+
+    text = make_dump(int(args.size_mb * 1024 * 1024))
+    megabytes = len(text.encode()) / (1024 * 1024)
+    print(f"Extraction over {megabytes:.1f} MB")
+    baseline = timed(legacy_extract, text)
+    report("legacy 4 x re.findall(raw pattern)", baseline, megabytes)
+    report("compiled extract_* (4 passes)", timed(compiled_extract, text), megabytes, baseline=baseline)
+    report("extract_all (1 pass)", timed(DataParser.extract_all, text), megabytes, baseline=baseline)
+
+    whois_text = make_whois(args.whois_lines)
+    megabytes = len(whois_text.encode()) / (1024 * 1024)
+    print(f"\nparse_whois over {megabytes:.1f} MB")
+    baseline = timed(legacy_parse_whois, whois_text)
+    report("legacy split and loop", baseline, megabytes)
+    report("parse_whois (str.partition)", timed(DataParser.parse_whois, whois_text), megabytes, baseline=baseline)
+
+    records = make_records(args.records)
+    print(f"\nEmail validation over {len(records)} records")
+    baseline = timed(lambda: [legacy_validate_email(value) for value in records])
+    report("legacy validate_email loop", baseline, items=len(records))
+    report("validate_email loop (compiled)", timed(lambda: [DataValidator.validate_email(value) for value in records]),
+           items=len(records), baseline=baseline)
+    report("validate_many", timed(DataValidator.validate_many, records, "email"), items=len(records), baseline=baseline)
+
+if __name__ == "__main__":
+    main()
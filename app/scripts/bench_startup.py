@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Benchmark the cold start of the API and of job workers
+
+Each run is a fresh interpreter. Reports the import time of a module as
+measured by ``python -X importtime`` with its most expensive imports, and
+the time from spawning uvicorn to the first /health response and to the
+first API response, with the API routers imported lazily and eagerly:
+
+    python scripts/bench_startup.py
+    python scripts/bench_startup.py --repeat 10 --top 15 --module tasks.worker
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import socket
+import statistics
+import subprocess
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def child_env(directory: str, **overrides) -> dict:
+    """Environment of a benchmarked process: a scratch database and no log file"""
+    env = dict(os.environ)
+    env.update({
+        "PYTHONPATH": APP_DIR,
+        "PYTHONWARNINGS": "ignore",
+        "DATABASE_URL": f"sqlite:///{os.path.join(directory, 'bench.db')}",
+        "LOG_FILE": "",
+    })
+    env.update(overrides)
+    return env
+
+def import_times(module: str, env: dict):
+    """(total, {name: (self, cumulative, depth)}) for one import of module, times in seconds"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=APP_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        # Nested imports are indented by two spaces per level
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        modules[name.strip()] = (int(own) / 1e6, int(cumulative) / 1e6, depth)
+    return modules[module][1], modules
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def wait_for(url: str, started: float, deadline: float) -> float:
+    """Seconds from started until url answers"""
+    while time.perf_counter() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=1):
+                return time.perf_counter() - started
+        except urllib.error.HTTPError:
+            return time.perf_counter() - started
+        except OSError:
+            time.sleep(0.005)
+    raise TimeoutError(f"No response from {url}")
+
+def time_to_first_response(env: dict, api_path: str, timeout: float = 60.0):
+    """Seconds from spawning uvicorn to the first /health and first API responses"""
+    port = free_port()
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=APP_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = started + timeout
+        health = wait_for(f"http://127.0.0.1:{port}/health", started, deadline)
+        api = wait_for(f"http://127.0.0.1:{port}{api_path}", started, deadline)
+        return health, api
+    finally:
+        server.terminate()
+        server.wait()
+
+def median_ms(values) -> float:
+    return statistics.median(values) * 1000
+
+def report_imports(label: str, module: str, env: dict, repeat: int, top: int):
+    totals, own, cumulative = [], defaultdict(list), defaultdict(list)
+    for _ in range(repeat):
+        total, modules = import_times(module, env)
+        totals.append(total)
+        for name, (self_time, cumulative_time, depth) in modules.items():
+            own[name].append(self_time)
+            # Direct imports of the module, which add up to its cumulative time
+            if depth == 1:
+                cumulative[name].append(cumulative_time)
+    print(f"\nimport {module} ({label}): median {median_ms(totals):.0f} ms over {repeat} runs")
+    print("  slowest direct imports (cumulative):")
+    for name, times in sorted(cumulative.items(), key=lambda item: -statistics.median(item[1]))[:top]:
+        print(f"    {median_ms(times):8.1f} ms  {name}")
+    print("  slowest modules (self):")
+    for name, times in sorted(own.items(), key=lambda item: -statistics.median(item[1]))[:top]:
+        print(f"    {median_ms(times):8.1f} ms  {name}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark API and worker cold start")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh processes per measurement")
+    parser.add_argument("--top", type=int, default=10, help="Modules listed per report")
+    parser.add_argument("--module", action="append", help="Module to import (default: main and tasks.worker)")
+    args = parser.parse_args()
+
+    from core.config import settings
+    api_path = f"{settings.API_V1_STR}/openapi.json"
+
+    with tempfile.TemporaryDirectory() as directory:
+        for module in args.module or ["main", "tasks.worker"]:
+            report_imports("lazy routers", module, child_env(directory), args.repeat, args.top)
+        report_imports("eager routers", "main", child_env(directory, API_LAZY_ROUTERS="false"), args.repeat, args.top)
+
+        print(f"\ntime to first response (median of {args.repeat}):")
+        for label, lazy in (("eager routers", "false"), ("lazy routers", "true")):
+            env = child_env(directory, API_LAZY_ROUTERS=lazy)
+            samples = [time_to_first_response(env, api_path) for _ in range(args.repeat)]
+            print(f"  {label:<14} /health {median_ms([s[0] for s in samples]):7.0f} ms"
+                  f"   {api_path} {median_ms([s[1] for s in samples]):7.0f} ms")
+
+if __name__ == "__main__":
+    main()
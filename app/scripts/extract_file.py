@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Extract emails, domains, phones and usernames from a large file
+
+Prints each distinct value as an NDJSON line, or with --ingest writes the
+emails and domains found as persons and cyber assets:
+
+    python scripts/extract_file.py dump.txt --kinds emails domains phones
+    python scripts/extract_file.py dump.txt --ingest
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import asyncio
+import json
+import resource
+import time
+
+from core.database import AsyncSessionLocal
+from services.extraction_service import ExtractionService
+from utils.file_extractor import FileExtractor
+
+async def extract(args):
+    extractor = FileExtractor(kinds=args.kinds, chunk_size=args.chunk_mb * 1024 * 1024 if args.chunk_mb else None,
+                              workers=args.workers)
+    started = time.perf_counter()
+    if args.ingest:
+        async with AsyncSessionLocal() as session:
+            result = await ExtractionService(session, extractor).ingest_file(args.path)
+        print(json.dumps(result, indent=2))
+    else:
+        async for kind, value in extractor.extract(args.path):
+            print(json.dumps({"kind": kind, "value": value}))
+
+    elapsed = time.perf_counter() - started
+    megabytes = os.path.getsize(args.path) / (1024 * 1024)
+    # ru_maxrss is in KB on Linux; worker processes are counted separately
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    workers_peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+    print(f"{megabytes:.1f} MB in {elapsed:.2f}s ({megabytes / elapsed:.1f} MB/s), "
+          f"peak RSS {peak:.0f} MB (largest worker {workers_peak:.0f} MB)", file=sys.stderr)
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract entities from a large file")
+    parser.add_argument("path", help="File to scan")
+    parser.add_argument("--kinds", nargs="+", default=["emails", "domains"],
+                        choices=["emails", "domains", "phones", "usernames"])
+    parser.add_argument("--ingest", action="store_true", help="Write emails and domains as persons and cyber assets")
+    parser.add_argument("--chunk-mb", type=int, help="Megabytes scanned per worker task")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: one per CPU)")
+    args = parser.parse_args()
+    if args.ingest and not {"emails", "domains"} & set(args.kinds):
+        parser.error("--ingest needs emails or domains in --kinds")
+    asyncio.run(extract(args))
+
+if __name__ == "__main__":
+    main()
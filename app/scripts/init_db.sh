@@ -11,7 +11,10 @@ from core.database import engine, Base
 from models.person import Person
 from models.company import Company
 from models.cyber import CyberAsset
-from models.investigation import Investigation
+from models.investigation import Investigation, InvestigationTarget
+from models.finding import Finding
+from models.job import Job
+from models.correlation import CorrelationKey
 
 async def init_db():
     async with engine.begin() as conn:
@@ -20,4 +23,8 @@ async def init_db():
 asyncio.run(init_db())
 "
 
+# Bring tables created by earlier versions up to date
+python3 scripts/migrate_unique_domains.py
+python3 scripts/migrate_findings.py
+
 echo "Database initialized successfully!"
\ No newline at end of file
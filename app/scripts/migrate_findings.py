@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Move the findings of a database created before the findings table into it
+
+Investigations used to hold their findings in an investigations.findings
+JSON blob mapping a collector name to its data. Each entry becomes a row
+of the findings table, dated when the investigation was last changed, and
+the column is then dropped. Safe to run more than once.
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+from typing import Any, Dict, List
+from sqlalchemy import JSON, DateTime, Integer, column, func, insert, inspect, select, table, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncEngine
+from models.finding import Finding
+
+# The investigations table as it was, with its findings column
+LEGACY_INVESTIGATIONS = table(
+    "investigations",
+    column("id", Integer),
+    column("findings", JSON),
+    column("created_at", DateTime(timezone=True)),
+    column("updated_at", DateTime(timezone=True)),
+)
+
+# Collector name of a blob that is not a mapping of collector results
+LEGACY_COLLECTOR = "legacy"
+
+def legacy_findings(investigation_id: int, blob: Any, created_at) -> List[Dict[str, Any]]:
+    """Rows of the findings table for one investigation's findings blob"""
+    if not blob:
+        return []
+    entries = blob.items() if isinstance(blob, dict) else [(LEGACY_COLLECTOR, blob)]
+    return [
+        {"investigation_id": investigation_id, "collector": str(name), "status": "ok", "data": data,
+         "created_at": created_at}
+        for name, data in entries
+    ]
+
+def move_findings(conn: Connection) -> int:
+    """Copy the findings blobs into the findings table and drop the column, returning the rows written"""
+    columns = [info["name"] for info in inspect(conn).get_columns("investigations")]
+    if "findings" not in columns:
+        return 0
+
+    legacy = LEGACY_INVESTIGATIONS.c
+    rows: List[Dict[str, Any]] = []
+    result = conn.execute(
+        select(
+            legacy.id,
+            legacy.findings,
+            func.coalesce(legacy.updated_at, legacy.created_at, func.current_timestamp(), type_=DateTime(timezone=True)),
+        ).order_by(legacy.id)
+    )
+    for investigation_id, blob, changed_at in result:
+        rows.extend(legacy_findings(investigation_id, blob, changed_at))
+    if rows:
+        conn.execute(insert(Finding), rows)
+    conn.execute(text("ALTER TABLE investigations DROP COLUMN findings"))
+    return len(rows)
+
+async def migrate(engine: AsyncEngine) -> int:
+    async with engine.begin() as conn:
+        return await conn.run_sync(move_findings)
+
+if __name__ == "__main__":
+    from core.database import engine
+    moved = asyncio.run(migrate(engine))
+    print(f"Findings moved to the findings table: {moved}")
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Make cyber_assets.domain unique in a database created before it was
+
+Bulk ingestion upserts cyber assets ON CONFLICT (domain), which needs a
+unique index on the column; create_all() never adds one to an existing
+table. Assets sharing a domain are merged into the oldest one first:
+investigations, targets and findings pointing at the others are moved to
+it and the others are deleted with their correlation keys. Safe to run
+more than once.
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+from sqlalchemy import and_, delete, func, inspect, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncEngine
+from models.correlation import CorrelationKey
+from models.cyber import CyberAsset
+from models.finding import Finding
+from models.investigation import Investigation, InvestigationTarget
+
+ENTITY_TYPE = "cyber_asset"
+
+def domain_index_is_unique(conn: Connection) -> bool:
+    return any(
+        index["unique"] and index["column_names"] == ["domain"]
+        for index in inspect(conn).get_indexes(CyberAsset.__tablename__)
+    )
+
+def merge_duplicate_domains(conn: Connection) -> int:
+    """Merge the assets sharing a domain into the oldest one, returning how many were removed"""
+    duplicates = conn.execute(
+        select(CyberAsset.domain, func.min(CyberAsset.id))
+        .where(CyberAsset.domain.is_not(None))
+        .group_by(CyberAsset.domain)
+        .having(func.count() > 1)
+    ).all()
+
+    removed = 0
+    for domain, kept in duplicates:
+        others = list(conn.execute(
+            select(CyberAsset.id).where(CyberAsset.domain == domain, CyberAsset.id != kept)
+        ).scalars())
+        for other in others:
+            conn.execute(
+                update(Investigation).where(Investigation.target_cyber_asset_id == other).values(target_cyber_asset_id=kept)
+            )
+            # A target already linked to the kept asset would clash once moved
+            linked = select(InvestigationTarget.investigation_id).where(
+                InvestigationTarget.entity_type == ENTITY_TYPE, InvestigationTarget.entity_id == kept
+            )
+            target = and_(InvestigationTarget.entity_type == ENTITY_TYPE, InvestigationTarget.entity_id == other)
+            conn.execute(delete(InvestigationTarget).where(target, InvestigationTarget.investigation_id.in_(linked)))
+            conn.execute(update(InvestigationTarget).where(target).values(entity_id=kept))
+            conn.execute(
+                update(Finding).where(Finding.entity_type == ENTITY_TYPE, Finding.entity_id == other).values(entity_id=kept)
+            )
+        conn.execute(
+            delete(CorrelationKey).where(CorrelationKey.entity_type == ENTITY_TYPE, CorrelationKey.entity_id.in_(others))
+        )
+        conn.execute(delete(CyberAsset).where(CyberAsset.id.in_(others)))
+        removed += len(others)
+    return removed
+
+def make_domain_unique(conn: Connection) -> int:
+    """Merge duplicate domains and replace the domain index with a unique one"""
+    if domain_index_is_unique(conn):
+        return 0
+    removed = merge_duplicate_domains(conn)
+    index = next(index for index in CyberAsset.__table__.indexes if index.name == "ix_cyber_assets_domain")
+    if any(existing["name"] == index.name for existing in inspect(conn).get_indexes(CyberAsset.__tablename__)):
+        index.drop(conn)
+    index.create(conn)
+    return removed
+
+async def migrate(engine: AsyncEngine) -> int:
+    async with engine.begin() as conn:
+        return await conn.run_sync(make_domain_unique)
+
+if __name__ == "__main__":
+    from core.database import engine
+    removed = asyncio.run(migrate(engine))
+    print(f"cyber_assets.domain is unique ({removed} duplicate assets merged)")
@@ -0,0 +1,20 @@
+#!/usr/bin/env python3
+"""
+Rebuild the correlation index from the persons, companies and cyber assets tables
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+from core.database import AsyncSessionLocal
+from services.correlation_index import CorrelationIndex
+
+async def rebuild_index():
+    async with AsyncSessionLocal() as session:
+        counts = await CorrelationIndex(session).rebuild()
+        print(f"Correlation index rebuilt: {counts}")
+
+if __name__ == "__main__":
+    asyncio.run(rebuild_index())
@@ -14,6 +14,7 @@ from models.person import Person
 from models.company import Company
 from models.cyber import CyberAsset
 from models.investigation import Investigation
+from models.finding import Finding
 from core.security import get_password_hash
 
 async def seed_data():
@@ -62,11 +63,18 @@ async def seed_data():
                 title="Sample Investigation",
                 description="Testing the OSINT system",
                 target_person_id=1,  # Will be set after commit
-                findings={"emails": ["john.doe@example.com"]},
                 notes="Sample investigation",
                 tags=["test"]
             )
             session.add(investigation)
+            await session.flush()
+
+            session.add(Finding(
+                investigation_id=investigation.id,
+                collector="email",
+                target="john.doe@example.com",
+                data={"emails": ["john.doe@example.com"]}
+            ))
 
             await session.commit()
             print("Sample data seeded successfully!")
@@ -0,0 +1,200 @@
+from typing import Any, AsyncIterable, Dict, List, Optional, Tuple, Type
+from pydantic import BaseModel as Schema, ValidationError
+from sqlalchemy import bindparam, func, insert, inspect, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from core.database import dialect_insert
+from core.logging import get_logger
+from models.base import BaseModel
+from services.correlation_index import CorrelationIndex
+from utils.bulk import NumberedRecord, batched
+
+logger = get_logger(__name__)
+
+class BulkIngestionService:
+    """Validate and upsert large streams of entities in chunks
+
+    Each chunk is validated row by row, written with one executemany upsert
+    per group of rows that set the same fields, and committed once. A row
+    that fails validation or violates another unique constraint is reported
+    with its row number and does not abort the rest of the batch.
+
+    With update_existing=False rows whose key is already stored are left
+    untouched instead of updated, and counted as "existing" rather than
+    "upserted".
+
+    Upserts rely on a unique index on the key. A table created before its
+    key was made unique (see scripts/migrate_unique_domains.py) is written
+    by looking the keys up first instead, which concurrent writers can race.
+    """
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        chunk_size: Optional[int] = None,
+        max_errors: Optional[int] = None,
+        update_existing: bool = True,
+    ):
+        self.db = db
+        self.chunk_size = chunk_size or settings.BULK_CHUNK_SIZE
+        self.max_errors = settings.BULK_MAX_ERRORS if max_errors is None else max_errors
+        self.update_existing = update_existing
+        # (table, key) -> whether the key has a unique index to upsert on
+        self._unique_keys: Dict[Tuple[str, str], bool] = {}
+
+    async def ingest(
+        self,
+        model: Type[BaseModel],
+        schema: Type[Schema],
+        conflict_key: str,
+        records: AsyncIterable[NumberedRecord],
+        index_as: Optional[str] = None,
+        report: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Upsert records on conflict_key, indexing them for correlation as index_as
+
+        Pass the report of a previous call to add this call's counts to it.
+        """
+        if report is None:
+            report = {"processed": 0, "upserted": 0, "existing": 0, "duplicates": 0, "failed": 0, "errors": []}
+        await self._check_unique_key(model, conflict_key)
+
+        async for chunk in batched(records, self.chunk_size):
+            rows: Dict[Any, Tuple[int, Dict[str, Any], frozenset]] = {}
+            for row_number, data in chunk:
+                report["processed"] += 1
+                if isinstance(data, Exception):
+                    self._record_error(report, row_number, str(data))
+                    continue
+                try:
+                    entity = schema(**data)
+                except ValidationError as e:
+                    self._record_error(report, row_number, self._validation_message(e))
+                    continue
+                values = entity.dict()
+                fields = frozenset(entity.dict(exclude_unset=True))
+                key = values[conflict_key]
+                if key in rows:
+                    # Merge like consecutive upserts would: later rows override the fields they set
+                    report["duplicates"] += 1
+                    _, previous, previous_fields = rows[key]
+                    values = {**previous, **{name: values[name] for name in fields}}
+                    fields = previous_fields | fields
+                rows[key] = (row_number, values, fields)
+
+            if rows:
+                await self._write_chunk(model, conflict_key, list(rows.values()), report, index_as)
+
+        return report
+
+    async def _write_chunk(self, model, conflict_key: str, rows: List[Tuple[int, Dict[str, Any], frozenset]], report, index_as):
+        groups: Dict[frozenset, List[Tuple[int, Dict[str, Any]]]] = {}
+        for row_number, values, fields in rows:
+            groups.setdefault(fields, []).append((row_number, values))
+
+        try:
+            written: List[Any] = []
+            for fields, group in groups.items():
+                written.extend(await self._upsert(model, conflict_key, fields, [values for _, values in group]))
+            await self._index(index_as, conflict_key, written)
+            await self.db.commit()
+            report["upserted"] += len(written)
+            report["existing"] += len(rows) - len(written)
+        except SQLAlchemyError as e:
+            await self.db.rollback()
+            logger.warning("Bulk chunk of %s %s failed, retrying row by row: %s", len(rows), model.__tablename__, getattr(e, 'orig', e))
+            await self._write_rows(model, conflict_key, rows, report, index_as)
+
+    async def _write_rows(self, model, conflict_key: str, rows, report, index_as):
+        """Write a failed chunk one row at a time to isolate the bad rows"""
+        for row_number, values, fields in rows:
+            try:
+                written = await self._upsert(model, conflict_key, fields, [values])
+                await self._index(index_as, conflict_key, written)
+                await self.db.commit()
+                report["upserted" if written else "existing"] += 1
+            except SQLAlchemyError as e:
+                await self.db.rollback()
+                self._record_error(report, row_number, str(getattr(e, "orig", e)))
+
+    async def _upsert(self, model, conflict_key: str, fields: frozenset, rows: List[Dict[str, Any]]) -> List[Any]:
+        """Write rows and return the keys of those written
+
+        Every row is written when existing rows are updated. Otherwise the
+        keys come back through RETURNING, which only yields inserted rows.
+        """
+        if not self._unique_keys[(model.__tablename__, conflict_key)]:
+            return await self._upsert_by_lookup(model, conflict_key, fields, rows)
+        statement = self._upsert_statement(model, conflict_key, fields)
+        if self.update_existing:
+            await self.db.execute(statement, rows)
+            return [values[conflict_key] for values in rows]
+        result = await self.db.execute(statement.returning(model.__table__.c[conflict_key]), rows)
+        return list(result.scalars())
+
+    async def _upsert_by_lookup(self, model, conflict_key: str, fields: frozenset, rows: List[Dict[str, Any]]) -> List[Any]:
+        """_upsert() without ON CONFLICT: update the keys already stored, insert the others"""
+        table = model.__table__
+        key = table.c[conflict_key]
+        result = await self.db.execute(select(key).where(key.in_([values[conflict_key] for values in rows])))
+        stored = set(result.scalars())
+        new = [values for values in rows if values[conflict_key] not in stored]
+        if new:
+            await self.db.execute(insert(table), new)
+        if not self.update_existing:
+            return [values[conflict_key] for values in new]
+
+        # Bound parameters cannot share the names of the columns they set
+        names = [name for name in fields if name != conflict_key]
+        existing = [values for values in rows if values[conflict_key] in stored]
+        if names and existing:
+            statement = update(table).where(key == bindparam("_key")).values(
+                updated_at=func.now(), **{name: bindparam(f"_{name}") for name in names}
+            )
+            await self.db.execute(statement, [
+                {"_key": values[conflict_key], **{f"_{name}": values[name] for name in names}} for values in existing
+            ])
+        return [values[conflict_key] for values in rows]
+
+    async def _check_unique_key(self, model, conflict_key: str):
+        if (model.__tablename__, conflict_key) in self._unique_keys:
+            return
+
+        def unique(session) -> bool:
+            inspector = inspect(session.connection())
+            return [conflict_key] in (
+                [index["column_names"] for index in inspector.get_indexes(model.__tablename__) if index["unique"]]
+                + [constraint["column_names"] for constraint in inspector.get_unique_constraints(model.__tablename__)]
+            )
+
+        self._unique_keys[(model.__tablename__, conflict_key)] = is_unique = await self.db.run_sync(unique)
+        if not is_unique:
+            logger.warning(
+                "%s.%s has no unique index, upserting without ON CONFLICT; run scripts/migrate_unique_domains.py",
+                model.__tablename__, conflict_key,
+            )
+
+    async def _index(self, index_as: Optional[str], conflict_key: str, keys: List[Any]):
+        if index_as and keys:
+            await CorrelationIndex(self.db).reindex_by(index_as, conflict_key, keys)
+
+    def _upsert_statement(self, model, conflict_key: str, fields: frozenset):
+        statement = dialect_insert(self.db)(model.__table__)
+        if not self.update_existing:
+            return statement.on_conflict_do_nothing(index_elements=[conflict_key])
+        updates = {name: statement.excluded[name] for name in fields if name != conflict_key}
+        updates["updated_at"] = func.now()
+        return statement.on_conflict_do_update(index_elements=[conflict_key], set_=updates)
+
+    def _record_error(self, report: Dict[str, Any], row_number: int, message: str):
+        report["failed"] += 1
+        if len(report["errors"]) < self.max_errors:
+            report["errors"].append({"row": row_number, "error": message})
+
+    @staticmethod
+    def _validation_message(error: ValidationError) -> str:
+        return "; ".join(
+            f"{'.'.join(str(part) for part in detail['loc'])}: {detail['msg']}" for detail in error.errors()
+        )
@@ -1,20 +1,24 @@
-from typing import List, Optional
+from typing import Any, AsyncIterable, AsyncIterator, Dict, List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import delete, select, update
 
+from core.database import commit
 from models.company import Company
-from schemas.company import CompanyCreate, CompanyUpdate
-from collectors.companies.domains import DomainCollector
-from collectors.companies.ruc import RUCCollector
-from collectors.companies.socials import SocialMediaCollector
-from utils.http_client import HttpClient
+from schemas.company import Company as CompanySchema, CompanyCreate, CompanyUpdate
+from services.bulk_service import BulkIngestionService
+from services.correlation_index import KEY_FIELDS, CorrelationIndex
+from utils.bulk import NumberedRecord
+from utils.pagination import keyset_page, stream_ndjson
+from collectors.orchestrator import CollectionPlan, get_orchestrator
+from collectors.registry import get_registry
+from utils.http_client import HttpClient, get_http_client
 
 class CompaniesService:
     """Service for company-related operations"""
 
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, http_client: Optional[HttpClient] = None):
         self.db = db
-        self.http_client = HttpClient()
+        self.http_client = http_client or get_http_client()
 
     async def get_company(self, company_id: int) -> Optional[Company]:
         """Get company by ID"""
@@ -22,54 +26,82 @@ class CompaniesService:
         result = await self.db.execute(query)
         return result.scalar_one_or_none()
 
-    async def get_companies(self, skip: int = 0, limit: int = 100) -> List[Company]:
-        """Get all companies with pagination"""
-        query = select(Company).offset(skip).limit(limit)
+    async def get_companies(self, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[Company]:
+        """Get all companies with keyset pagination on id"""
+        query = keyset_page(select(Company), Company, limit, after_id=after_id, skip=skip)
         result = await self.db.execute(query)
         return result.scalars().all()
 
+    def export_companies(self) -> AsyncIterator[str]:
+        """Stream all companies as NDJSON"""
+        return stream_ndjson(self.db, Company, CompanySchema)
+
     async def create_company(self, company: CompanyCreate) -> Company:
         """Create a new company"""
         db_company = Company(**company.dict())
         self.db.add(db_company)
-        await self.db.commit()
-        await self.db.refresh(db_company)
+        await self.db.flush()
+        await CorrelationIndex(self.db).index_entity("company", db_company, replace=False)
+        await commit(self.db)
         return db_company
 
     async def update_company(self, company_id: int, company_update: CompanyUpdate) -> Optional[Company]:
-        """Update an existing company"""
-        db_company = await self.get_company(company_id)
-        if not db_company:
-            return None
+        """Update an existing company with a single UPDATE ... RETURNING"""
+        values = company_update.dict(exclude_unset=True)
+        if not values:
+            return await self.get_company(company_id)
 
-        for field, value in company_update.dict(exclude_unset=True).items():
-            setattr(db_company, field, value)
+        result = await self.db.execute(
+            update(Company).where(Company.id == company_id).values(**values).returning(Company)
+        )
+        db_company = result.scalar_one_or_none()
+        if db_company is None:
+            return None
 
-        await self.db.commit()
-        await self.db.refresh(db_company)
+        if KEY_FIELDS["company"] & values.keys():
+            await CorrelationIndex(self.db).index_entity("company", db_company)
+        await commit(self.db)
         return db_company
 
     async def delete_company(self, company_id: int) -> bool:
-        """Delete a company"""
-        db_company = await self.get_company(company_id)
-        if not db_company:
+        """Delete a company with a single DELETE ... RETURNING"""
+        result = await self.db.execute(delete(Company).where(Company.id == company_id).returning(Company.id))
+        if result.scalar_one_or_none() is None:
             return False
 
-        await self.db.delete(db_company)
-        await self.db.commit()
+        await CorrelationIndex(self.db).remove_entity("company", company_id)
+        await commit(self.db)
         return True
 
+    async def bulk_upsert_companies(self, records: AsyncIterable[NumberedRecord]) -> dict:
+        """Validate and upsert a stream of companies on their unique `ruc`"""
+        return await BulkIngestionService(self.db).ingest(Company, CompanyCreate, "ruc", records, index_as="company")
+
     async def collect_domain_data(self, domain: str) -> dict:
         """Collect domain registration data"""
-        collector = DomainCollector(self.http_client)
-        return await collector.collect(domain)
+        collector = get_registry().create("company", "domain", self.http_client)
+        return await collector.run(domain)
 
     async def collect_ruc_data(self, ruc: str) -> dict:
         """Collect RUC data for Paraguayan companies"""
-        collector = RUCCollector(self.http_client)
-        return await collector.collect(ruc)
+        collector = get_registry().create("company", "ruc", self.http_client)
+        return await collector.run(ruc)
 
     async def collect_social_data(self, company_name: str) -> dict:
         """Collect social media profiles for company"""
-        collector = SocialMediaCollector(self.http_client)
-        return await collector.collect(company_name)
\ No newline at end of file
+        collector = get_registry().create("company", "social", self.http_client)
+        return await collector.run(company_name)
+
+    def collection_plan(
+        self, company: Company, names: Optional[List[str]] = None, max_cost: Optional[str] = None
+    ) -> CollectionPlan:
+        """Registered collectors (all, or the named ones) applicable to a company, keyed by result name"""
+        return get_registry().plan("company", company, self.http_client, names, max_cost)
+
+    async def collect_all(self, company: Company, timeouts: Optional[Dict[str, float]] = None) -> dict:
+        """Run every applicable collector for a company concurrently"""
+        return await get_orchestrator().collect_all(self.collection_plan(company), timeouts)
+
+    def stream_all(self, company: Company, collectors: Optional[List[str]] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Run the applicable (or named) collectors for a company, yielding partial results as they are found"""
+        return get_orchestrator().iter_stream(self.collection_plan(company, collectors))
@@ -0,0 +1,238 @@
+import ipaddress
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urlparse
+from sqlalchemy import and_, delete, func, insert, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.correlation import CorrelationKey
+from models.person import Person
+from models.company import Company
+from models.cyber import CyberAsset
+from utils.pagination import keyset_page
+from utils.parsers import DataParser
+from core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# (key_type, key_value)
+Key = Tuple[str, str]
+
+ENTITY_MODELS = {
+    "person": Person,
+    "company": Company,
+    "cyber_asset": CyberAsset,
+}
+
+# Entity columns the keys are extracted from: writes touching none of them
+# leave the keys of an entity unchanged
+KEY_FIELDS = {
+    "person": {"email", "username", "name", "social_profiles"},
+    "company": {"domain", "employees", "social_profiles"},
+    "cyber_asset": {"domain", "ip_address", "dns_records"},
+}
+
+# Key types that also link entities of the same type (e.g. assets on one IP).
+# Others only link across types, so a shared mail provider does not tie
+# every person using it together.
+SAME_TYPE_KEYS = {"ip"}
+
+def _name_key(name: Optional[str]) -> Optional[str]:
+    if not isinstance(name, str):
+        return None
+    return " ".join(name.lower().split()) or None
+
+def _domain_key(domain: Optional[str]) -> Optional[str]:
+    if not isinstance(domain, str) or not domain.strip():
+        return None
+    return DataParser.registrable_domain(domain) or None
+
+def _handle_key(handle: Any) -> Optional[str]:
+    """Reduce a username, @handle or profile URL to the bare handle"""
+    if not isinstance(handle, str):
+        return None
+    handle = handle.strip()
+    if "://" in handle:
+        segments = [segment for segment in urlparse(handle).path.split("/") if segment]
+        handle = segments[-1] if segments else ""
+    return handle.lstrip("@").lower() or None
+
+def _ip_key(address: Any) -> Optional[str]:
+    try:
+        return str(ipaddress.ip_address(str(address).strip()))
+    except ValueError:
+        return None
+
+def extract_keys(entity_type: str, entity: Any) -> Set[Key]:
+    """Extract the normalized correlation keys of an entity"""
+    keys: Set[Key] = set()
+
+    def add(key_type: str, value: Optional[str]):
+        if value:
+            keys.add((key_type, value))
+
+    profiles = getattr(entity, "social_profiles", None) or {}
+    if isinstance(profiles, dict):
+        for handle in profiles.values():
+            add("username", _handle_key(handle))
+
+    if entity_type == "person":
+        if entity.email and "@" in entity.email:
+            add("email", entity.email.strip().lower())
+            add("domain", _domain_key(entity.email.rsplit("@", 1)[1]))
+        add("username", _handle_key(entity.username))
+        add("name", _name_key(entity.name))
+    elif entity_type == "company":
+        add("domain", _domain_key(entity.domain))
+        for employee in entity.employees or []:
+            add("name", _name_key(employee))
+    elif entity_type == "cyber_asset":
+        add("domain", _domain_key(entity.domain))
+        add("ip", _ip_key(entity.ip_address))
+        records = (entity.dns_records or {}).get("records", {}) if isinstance(entity.dns_records, dict) else {}
+        for record_type in ("A", "AAAA"):
+            for address in records.get(record_type, []):
+                add("ip", _ip_key(address))
+
+    return keys
+
+def _keys_clause(keys: Iterable[Key]):
+    """Match any of keys, one indexed IN per key type"""
+    by_type: Dict[str, Set[str]] = defaultdict(set)
+    for key_type, key_value in keys:
+        by_type[key_type].add(key_value)
+    return or_(*(
+        and_(CorrelationKey.key_type == key_type, CorrelationKey.key_value.in_(values))
+        for key_type, values in by_type.items()
+    ))
+
+class CorrelationIndex:
+    """Persisted index of correlation keys, kept in sync with entity writes
+
+    Callers own the transaction: the methods only add statements to the
+    session, so the index is committed together with the entity change.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def index_entity(self, entity_type: str, entity: Any, replace: bool = True):
+        """Replace the keys of one entity with the ones extracted from it now"""
+        await self.index_entities(entity_type, [entity], replace=replace)
+
+    async def index_entities(self, entity_type: str, entities: List[Any], replace: bool = True):
+        """Replace the keys of many entities with two set-based statements
+
+        Pass replace=False for entities just inserted, which have no keys to
+        delete yet.
+        """
+        if not entities:
+            return
+        if replace:
+            ids = [entity.id for entity in entities]
+            await self.db.execute(
+                delete(CorrelationKey).where(
+                    CorrelationKey.entity_type == entity_type, CorrelationKey.entity_id.in_(ids)
+                )
+            )
+        rows = [
+            {"key_type": key_type, "key_value": key_value, "entity_type": entity_type, "entity_id": entity.id}
+            for entity in entities
+            for key_type, key_value in extract_keys(entity_type, entity)
+        ]
+        if rows:
+            await self.db.execute(insert(CorrelationKey), rows)
+
+    async def remove_entity(self, entity_type: str, entity_id: int):
+        await self.db.execute(
+            delete(CorrelationKey).where(
+                CorrelationKey.entity_type == entity_type, CorrelationKey.entity_id == entity_id
+            )
+        )
+
+    async def reindex_by(self, entity_type: str, column: str, values: List[Any]):
+        """Reindex the entities whose column matches values (used after bulk upserts)"""
+        if not values:
+            return
+        model = ENTITY_MODELS[entity_type]
+        result = await self.db.execute(select(model).where(getattr(model, column).in_(values)))
+        await self.index_entities(entity_type, result.scalars().all())
+
+    async def lookup(
+        self,
+        keys: Iterable[Key],
+        exclude: Optional[Tuple[str, int]] = None,
+        same_type_keys: Optional[Iterable[str]] = None,
+    ) -> List[CorrelationKey]:
+        """Find every indexed entity sharing one of keys
+
+        With exclude=(entity_type, entity_id) that entity is left out, and
+        when same_type_keys is given, entities of the same type only match
+        through those key types.
+        """
+        keys = list(keys)
+        if not keys:
+            return []
+        query = select(CorrelationKey).where(_keys_clause(keys))
+        if exclude is not None:
+            query = query.where(
+                ~and_(CorrelationKey.entity_type == exclude[0], CorrelationKey.entity_id == exclude[1])
+            )
+            if same_type_keys is not None:
+                query = query.where(or_(
+                    CorrelationKey.entity_type != exclude[0],
+                    CorrelationKey.key_type.in_(list(same_type_keys)),
+                ))
+        result = await self.db.execute(query)
+        return result.scalars().all()
+
+    async def keys_for(self, nodes: Iterable[Tuple[str, int]], key_types: Optional[Iterable[str]] = None) -> List[CorrelationKey]:
+        """Get the indexed keys of many entities, one IN per entity type"""
+        ids_by_type: Dict[str, Set[int]] = defaultdict(set)
+        for entity_type, entity_id in nodes:
+            ids_by_type[entity_type].add(entity_id)
+        if not ids_by_type:
+            return []
+        query = select(CorrelationKey).where(or_(*(
+            and_(CorrelationKey.entity_type == entity_type, CorrelationKey.entity_id.in_(ids))
+            for entity_type, ids in ids_by_type.items()
+        )))
+        if key_types is not None:
+            query = query.where(CorrelationKey.key_type.in_(list(key_types)))
+        result = await self.db.execute(query)
+        return result.scalars().all()
+
+    async def hub_keys(self, keys: Iterable[Key], max_degree: int) -> Set[Key]:
+        """Return the keys shared by more than max_degree entities"""
+        keys = list(keys)
+        if not keys:
+            return set()
+        query = (
+            select(CorrelationKey.key_type, CorrelationKey.key_value)
+            .where(_keys_clause(keys))
+            .group_by(CorrelationKey.key_type, CorrelationKey.key_value)
+            .having(func.count() > max_degree)
+        )
+        result = await self.db.execute(query)
+        return {(key_type, key_value) for key_type, key_value in result.all()}
+
+    async def rebuild(self, batch_size: int = 1000) -> Dict[str, int]:
+        """Rebuild the whole index from the entity tables"""
+        await self.db.execute(delete(CorrelationKey))
+        counts: Dict[str, int] = {}
+        for entity_type, model in ENTITY_MODELS.items():
+            counts[entity_type] = 0
+            after_id = None
+            while True:
+                # Keyset batches rather than one open cursor, as the same connection writes keys
+                result = await self.db.execute(keyset_page(select(model), model, batch_size, after_id=after_id))
+                batch = result.scalars().all()
+                if not batch:
+                    break
+                await self.index_entities(entity_type, batch)
+                counts[entity_type] += len(batch)
+                after_id = batch[-1].id
+                self.db.expunge_all()
+        await self.db.commit()
+        logger.info("Rebuilt correlation index: %s", counts)
+        return counts
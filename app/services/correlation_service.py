@@ -1,135 +1,79 @@
 from typing import List, Dict, Any
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import or_, select
 
-from models.person import Person
-from models.company import Company
-from models.cyber import CyberAsset
-from models.investigation import Investigation
+from models.investigation import Investigation, InvestigationTarget
+from services.correlation_index import ENTITY_MODELS, SAME_TYPE_KEYS, CorrelationIndex, extract_keys
+
+# Response key of each entity type
+ENTITY_KEYS = {
+    "person": "persons",
+    "company": "companies",
+    "cyber_asset": "cyber_assets",
+}
+
+# Investigation column pointing at each entity type
+INVESTIGATION_TARGETS = {
+    "person": Investigation.target_person_id,
+    "company": Investigation.target_company_id,
+    "cyber_asset": Investigation.target_cyber_asset_id,
+}
 
 class CorrelationService:
     """Service for correlating data between different entities"""
 
     def __init__(self, db: AsyncSession):
         self.db = db
+        self.index = CorrelationIndex(db)
 
     async def find_connections(self, entity_type: str, entity_id: int) -> Dict[str, Any]:
-        """Find connections between entities"""
-        if entity_type == "person":
-            return await self._find_person_connections(entity_id)
-        elif entity_type == "company":
-            return await self._find_company_connections(entity_id)
-        elif entity_type == "cyber_asset":
-            return await self._find_cyber_connections(entity_id)
-        else:
+        """Find connections between entities through the correlation index"""
+        model = ENTITY_MODELS.get(entity_type)
+        if model is None:
             return {"error": "Invalid entity type"}
 
-    async def _find_person_connections(self, person_id: int) -> Dict[str, Any]:
-        """Find connections for a person"""
-        # Get person
-        query = select(Person).where(Person.id == person_id)
-        result = await self.db.execute(query)
-        person = result.scalar_one_or_none()
-
-        if not person:
-            return {"error": "Person not found"}
+        result = await self.db.execute(select(model).where(model.id == entity_id))
+        entity = result.scalar_one_or_none()
+        if not entity:
+            return {"error": f"{entity_type.replace('_', ' ').capitalize()} not found"}
 
-        connections = {
-            "person": person,
-            "companies": [],
-            "cyber_assets": [],
-            "investigations": []
-        }
+        connections: Dict[str, Any] = {entity_type: entity}
+        connections.update({key: [] for key in ENTITY_KEYS.values()})
 
-        # Find related companies (by email or name)
-        company_query = select(Company).where(
-            (Company.employees.contains([person.name])) |
-            (Company.domain == person.email.split('@')[1] if person.email else False)
+        matches = await self.index.lookup(
+            extract_keys(entity_type, entity), exclude=(entity_type, entity_id), same_type_keys=SAME_TYPE_KEYS
         )
-        company_result = await self.db.execute(company_query)
-        connections["companies"] = company_result.scalars().all()
-
-        # Find related cyber assets (by email domain)
-        if person.email:
-            domain = person.email.split('@')[1]
-            cyber_query = select(CyberAsset).where(CyberAsset.domain == domain)
-            cyber_result = await self.db.execute(cyber_query)
-            connections["cyber_assets"] = cyber_result.scalars().all()
-
-        # Find related investigations
-        inv_query = select(Investigation).where(Investigation.target_person_id == person_id)
-        inv_result = await self.db.execute(inv_query)
-        connections["investigations"] = inv_result.scalars().all()
-
+        connections["links"] = [
+            {
+                "entity_type": match.entity_type,
+                "entity_id": match.entity_id,
+                "key_type": match.key_type,
+                "key_value": match.key_value,
+            }
+            for match in matches
+        ]
+
+        # One primary key lookup per related entity type
+        ids_by_type: Dict[str, set] = {}
+        for match in matches:
+            ids_by_type.setdefault(match.entity_type, set()).add(match.entity_id)
+        for related_type, ids in ids_by_type.items():
+            related_model = ENTITY_MODELS[related_type]
+            related = await self.db.execute(
+                select(related_model).where(related_model.id.in_(ids)).order_by(related_model.id)
+            )
+            connections[ENTITY_KEYS[related_type]] = related.scalars().all()
+
+        connections["investigations"] = await self._find_investigations(entity_type, entity_id)
         return connections
 
-    async def _find_company_connections(self, company_id: int) -> Dict[str, Any]:
-        """Find connections for a company"""
-        # Get company
-        query = select(Company).where(Company.id == company_id)
-        result = await self.db.execute(query)
-        company = result.scalar_one_or_none()
-
-        if not company:
-            return {"error": "Company not found"}
-
-        connections = {
-            "company": company,
-            "persons": [],
-            "cyber_assets": [],
-            "investigations": []
-        }
-
-        # Find related persons (by domain or employees)
-        person_query = select(Person).where(
-            (Person.email.contains(company.domain)) |
-            (Person.name.in_(company.employees or []))
+    async def _find_investigations(self, entity_type: str, entity_id: int) -> List[Investigation]:
+        """Find investigations targeting an entity, through their target column or target list"""
+        targets = select(InvestigationTarget.investigation_id).where(
+            InvestigationTarget.entity_type == entity_type, InvestigationTarget.entity_id == entity_id
         )
-        person_result = await self.db.execute(person_query)
-        connections["persons"] = person_result.scalars().all()
-
-        # Find related cyber assets
-        cyber_query = select(CyberAsset).where(CyberAsset.domain == company.domain)
-        cyber_result = await self.db.execute(cyber_query)
-        connections["cyber_assets"] = cyber_result.scalars().all()
-
-        # Find related investigations
-        inv_query = select(Investigation).where(Investigation.target_company_id == company_id)
-        inv_result = await self.db.execute(inv_query)
-        connections["investigations"] = inv_result.scalars().all()
-
-        return connections
-
-    async def _find_cyber_connections(self, asset_id: int) -> Dict[str, Any]:
-        """Find connections for a cyber asset"""
-        # Get cyber asset
-        query = select(CyberAsset).where(CyberAsset.id == asset_id)
+        query = select(Investigation).where(
+            or_(INVESTIGATION_TARGETS[entity_type] == entity_id, Investigation.id.in_(targets))
+        ).order_by(Investigation.id)
         result = await self.db.execute(query)
-        asset = result.scalar_one_or_none()
-
-        if not asset:
-            return {"error": "Cyber asset not found"}
-
-        connections = {
-            "cyber_asset": asset,
-            "companies": [],
-            "persons": [],
-            "investigations": []
-        }
-
-        # Find related companies
-        company_query = select(Company).where(Company.domain == asset.domain)
-        company_result = await self.db.execute(company_query)
-        connections["companies"] = company_result.scalars().all()
-
-        # Find related persons (by domain in email)
-        person_query = select(Person).where(Person.email.contains(asset.domain))
-        person_result = await self.db.execute(person_query)
-        connections["persons"] = person_result.scalars().all()
-
-        # Find related investigations
-        inv_query = select(Investigation).where(Investigation.target_cyber_asset_id == asset_id)
-        inv_result = await self.db.execute(inv_query)
-        connections["investigations"] = inv_result.scalars().all()
-
-        return connections
\ No newline at end of file
+        return result.scalars().all()
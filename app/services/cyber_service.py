@@ -1,20 +1,32 @@
-from typing import List, Optional
+from typing import Any, AsyncIterable, AsyncIterator, Dict, List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import IntegrityError
 
+from core.database import commit
 from models.cyber import CyberAsset
-from schemas.cyber import CyberAssetCreate, CyberAssetUpdate
-from collectors.cyber.dns import DNSCollector
-from collectors.cyber.subdomains import SubdomainCollector
-from collectors.cyber.whois import WhoisCollector
-from utils.http_client import HttpClient
+from schemas.cyber import CyberAsset as CyberAssetSchema, CyberAssetCreate, CyberAssetUpdate
+from services.bulk_service import BulkIngestionService
+from services.correlation_index import KEY_FIELDS, CorrelationIndex
+from utils.bulk import NumberedRecord
+from utils.pagination import keyset_page, stream_ndjson
+from collectors.orchestrator import CollectionPlan, get_orchestrator
+from collectors.registry import get_registry
+from utils.http_client import HttpClient, get_http_client
+
+class DuplicateDomainError(ValueError):
+    """Another cyber asset already has the domain"""
+
+    def __init__(self, domain: str):
+        super().__init__(f"A cyber asset with domain {domain} already exists")
+        self.domain = domain
 
 class CyberService:
     """Service for cyber asset-related operations"""
 
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, http_client: Optional[HttpClient] = None):
         self.db = db
-        self.http_client = HttpClient()
+        self.http_client = http_client or get_http_client()
 
     async def get_cyber_asset(self, asset_id: int) -> Optional[CyberAsset]:
         """Get cyber asset by ID"""
@@ -22,54 +34,90 @@ class CyberService:
         result = await self.db.execute(query)
         return result.scalar_one_or_none()
 
-    async def get_cyber_assets(self, skip: int = 0, limit: int = 100) -> List[CyberAsset]:
-        """Get all cyber assets with pagination"""
-        query = select(CyberAsset).offset(skip).limit(limit)
+    async def get_cyber_assets(self, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[CyberAsset]:
+        """Get all cyber assets with keyset pagination on id"""
+        query = keyset_page(select(CyberAsset), CyberAsset, limit, after_id=after_id, skip=skip)
         result = await self.db.execute(query)
         return result.scalars().all()
 
+    def export_cyber_assets(self) -> AsyncIterator[str]:
+        """Stream all cyber assets as NDJSON"""
+        return stream_ndjson(self.db, CyberAsset, CyberAssetSchema)
+
     async def create_cyber_asset(self, asset: CyberAssetCreate) -> CyberAsset:
         """Create a new cyber asset"""
         db_asset = CyberAsset(**asset.dict())
         self.db.add(db_asset)
-        await self.db.commit()
-        await self.db.refresh(db_asset)
+        try:
+            await self.db.flush()
+        except IntegrityError:
+            await self.db.rollback()
+            raise DuplicateDomainError(asset.domain) from None
+        await CorrelationIndex(self.db).index_entity("cyber_asset", db_asset, replace=False)
+        await commit(self.db)
         return db_asset
 
     async def update_cyber_asset(self, asset_id: int, asset_update: CyberAssetUpdate) -> Optional[CyberAsset]:
-        """Update an existing cyber asset"""
-        db_asset = await self.get_cyber_asset(asset_id)
-        if not db_asset:
-            return None
+        """Update an existing cyber asset with a single UPDATE ... RETURNING"""
+        values = asset_update.dict(exclude_unset=True)
+        if not values:
+            return await self.get_cyber_asset(asset_id)
 
-        for field, value in asset_update.dict(exclude_unset=True).items():
-            setattr(db_asset, field, value)
+        try:
+            result = await self.db.execute(
+                update(CyberAsset).where(CyberAsset.id == asset_id).values(**values).returning(CyberAsset)
+            )
+        except IntegrityError:
+            await self.db.rollback()
+            raise DuplicateDomainError(values.get("domain")) from None
+        db_asset = result.scalar_one_or_none()
+        if db_asset is None:
+            return None
 
-        await self.db.commit()
-        await self.db.refresh(db_asset)
+        if KEY_FIELDS["cyber_asset"] & values.keys():
+            await CorrelationIndex(self.db).index_entity("cyber_asset", db_asset)
+        await commit(self.db)
         return db_asset
 
     async def delete_cyber_asset(self, asset_id: int) -> bool:
-        """Delete a cyber asset"""
-        db_asset = await self.get_cyber_asset(asset_id)
-        if not db_asset:
+        """Delete a cyber asset with a single DELETE ... RETURNING"""
+        result = await self.db.execute(delete(CyberAsset).where(CyberAsset.id == asset_id).returning(CyberAsset.id))
+        if result.scalar_one_or_none() is None:
             return False
 
-        await self.db.delete(db_asset)
-        await self.db.commit()
+        await CorrelationIndex(self.db).remove_entity("cyber_asset", asset_id)
+        await commit(self.db)
         return True
 
+    async def bulk_upsert_cyber_assets(self, records: AsyncIterable[NumberedRecord]) -> dict:
+        """Validate and upsert a stream of cyber assets on their unique `domain`"""
+        return await BulkIngestionService(self.db).ingest(CyberAsset, CyberAssetCreate, "domain", records, index_as="cyber_asset")
+
     async def collect_dns_data(self, domain: str) -> dict:
         """Collect DNS records for domain"""
-        collector = DNSCollector(self.http_client)
-        return await collector.collect(domain)
+        collector = get_registry().create("cyber_asset", "dns", self.http_client)
+        return await collector.run(domain)
 
     async def collect_subdomain_data(self, domain: str) -> dict:
         """Collect subdomains for domain"""
-        collector = SubdomainCollector(self.http_client)
-        return await collector.collect(domain)
+        collector = get_registry().create("cyber_asset", "subdomains", self.http_client)
+        return await collector.run(domain)
 
     async def collect_whois_data(self, domain: str) -> dict:
         """Collect WHOIS information for domain"""
-        collector = WhoisCollector(self.http_client)
-        return await collector.collect(domain)
\ No newline at end of file
+        collector = get_registry().create("cyber_asset", "whois", self.http_client)
+        return await collector.run(domain)
+
+    def collection_plan(
+        self, asset: CyberAsset, names: Optional[List[str]] = None, max_cost: Optional[str] = None
+    ) -> CollectionPlan:
+        """Registered collectors (all, or the named ones) applicable to a cyber asset, keyed by result name"""
+        return get_registry().plan("cyber_asset", asset, self.http_client, names, max_cost)
+
+    async def collect_all(self, asset: CyberAsset, timeouts: Optional[Dict[str, float]] = None) -> dict:
+        """Run every applicable collector for a cyber asset concurrently"""
+        return await get_orchestrator().collect_all(self.collection_plan(asset), timeouts)
+
+    def stream_all(self, asset: CyberAsset, collectors: Optional[List[str]] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Run the applicable (or named) collectors for a cyber asset, yielding partial results as they are found"""
+        return get_orchestrator().iter_stream(self.collection_plan(asset, collectors))
@@ -0,0 +1,71 @@
+import os
+from typing import Any, AsyncIterator, Dict, List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from models.cyber import CyberAsset
+from models.person import Person
+from schemas.cyber import CyberAssetCreate
+from schemas.person import PersonCreate
+from services.bulk_service import BulkIngestionService
+from utils.bulk import NumberedRecord, batched
+from utils.file_extractor import FileExtractor
+
+class ExtractionService:
+    """Ingest the emails and domains found in large files (breach or log dumps)
+
+    Emails become persons and domains become cyber assets. Extracted values
+    only add new entities: existing ones are never overwritten.
+    """
+
+    def __init__(self, db: AsyncSession, extractor: Optional[FileExtractor] = None):
+        self.db = db
+        self.extractor = extractor or FileExtractor(kinds=("emails", "domains"))
+        self.bulk = BulkIngestionService(db, update_existing=False)
+
+    async def ingest_file(self, path: str) -> Dict[str, Any]:
+        """Extract from a file and write what it finds through the bulk ingestion path"""
+        source = os.path.basename(path)
+        found = {kind: 0 for kind in self.extractor.kinds}
+        reports: Dict[str, Dict[str, Any]] = {}
+
+        async for batch in batched(self.extractor.extract(path), settings.BULK_CHUNK_SIZE):
+            emails: List[str] = []
+            domains: List[str] = []
+            for kind, value in batch:
+                found[kind] += 1
+                if kind == "emails":
+                    emails.append(value)
+                elif kind == "domains":
+                    domains.append(value)
+
+            if emails:
+                reports["persons"] = await self.bulk.ingest(
+                    Person, PersonCreate, "email",
+                    self._numbered(emails, reports.get("persons"), lambda email: {
+                        "name": email.split("@", 1)[0],
+                        "email": email,
+                        "notes": f"Extracted from {source}",
+                    }),
+                    index_as="person",
+                    report=reports.get("persons"),
+                )
+            if domains:
+                reports["cyber_assets"] = await self.bulk.ingest(
+                    CyberAsset, CyberAssetCreate, "domain",
+                    self._numbered(domains, reports.get("cyber_assets"), lambda domain: {
+                        "domain": domain,
+                        "notes": f"Extracted from {source}",
+                    }),
+                    index_as="cyber_asset",
+                    report=reports.get("cyber_assets"),
+                )
+
+        return {"file": source, "bytes": os.path.getsize(path), "found": found, **reports}
+
+    @staticmethod
+    async def _numbered(values: List[str], report: Optional[Dict[str, Any]], build) -> AsyncIterator[NumberedRecord]:
+        # Row numbers continue across batches: the n-th distinct value is row n
+        offset = report["processed"] if report else 0
+        for row, value in enumerate(values, start=offset + 1):
+            yield row, build(value)
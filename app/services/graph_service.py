@@ -0,0 +1,144 @@
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from models.correlation import CorrelationKey
+from services.correlation_index import ENTITY_MODELS, SAME_TYPE_KEYS, CorrelationIndex, Key
+
+# (entity_type, entity_id)
+Node = Tuple[str, int]
+
+# Columns shown as the label of a node, first non-empty wins
+LABEL_COLUMNS = {
+    "person": ("name", "email", "username"),
+    "company": ("name", "domain", "ruc"),
+    "cyber_asset": ("domain", "ip_address"),
+}
+
+def _node_id(node: Node) -> str:
+    return f"{node[0]}:{node[1]}"
+
+def _chunks(items: List[Any], size: int) -> Iterable[List[Any]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+class GraphService:
+    """Service for multi-hop traversal of the correlation graph
+
+    Entities are nodes and shared correlation keys are edges. Traversal is
+    breadth-first with one batch of indexed lookups per level, so the cost
+    depends on the size of the subgraph, not of the tables.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.index = CorrelationIndex(db)
+
+    async def traverse(
+        self,
+        entity_type: str,
+        entity_id: int,
+        depth: int = 2,
+        edge_types: Optional[List[str]] = None,
+        max_nodes: Optional[int] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Expand the subgraph around an entity, None when it does not exist"""
+        model = ENTITY_MODELS[entity_type]
+        result = await self.db.execute(select(model.id).where(model.id == entity_id))
+        if result.scalar_one_or_none() is None:
+            return None
+
+        max_nodes = max_nodes or settings.GRAPH_DEFAULT_MAX_NODES
+        root: Node = (entity_type, entity_id)
+        depths: Dict[Node, int] = {root: 0}
+        edges: Dict[Tuple[Node, Node], Set[Key]] = defaultdict(set)
+        skipped_keys: Set[Key] = set()
+        truncated = False
+        frontier = [root]
+        level = 0
+
+        while frontier and level < depth:
+            level += 1
+            next_frontier: List[Node] = []
+
+            # Keys of the frontier, then every entity sharing one of them
+            holders: Dict[Key, List[Node]] = defaultdict(list)
+            for batch in _chunks(frontier, settings.GRAPH_BATCH_SIZE):
+                for row in await self.index.keys_for(batch, edge_types):
+                    holders[(row.key_type, row.key_value)].append((row.entity_type, row.entity_id))
+
+            keys = sorted(set(holders) - skipped_keys)
+            hubs: Set[Key] = set()
+            for batch in _chunks(keys, settings.GRAPH_BATCH_SIZE):
+                hubs |= await self.index.hub_keys(batch, settings.GRAPH_MAX_KEY_DEGREE)
+            skipped_keys |= hubs
+            keys = [key for key in keys if key not in hubs]
+
+            matches: List[CorrelationKey] = []
+            for batch in _chunks(keys, settings.GRAPH_BATCH_SIZE):
+                matches.extend(await self.index.lookup(batch))
+            matches.sort(key=lambda row: (row.key_type, row.key_value, row.entity_type, row.entity_id))
+
+            for row in matches:
+                key = (row.key_type, row.key_value)
+                target: Node = (row.entity_type, row.entity_id)
+                for source in holders[key]:
+                    if source == target:
+                        continue
+                    if source[0] == target[0] and row.key_type not in SAME_TYPE_KEYS:
+                        continue
+                    if target not in depths:
+                        if len(depths) >= max_nodes:
+                            truncated = True
+                            continue
+                        depths[target] = level
+                        next_frontier.append(target)
+                    edges[tuple(sorted((source, target)))].add(key)
+
+            frontier = next_frontier
+
+        return {
+            "root": _node_id(root),
+            "depth": level,
+            "truncated": truncated,
+            "nodes": await self._nodes(depths),
+            "edges": [
+                {
+                    "source": _node_id(source),
+                    "target": _node_id(target),
+                    "keys": [{"key_type": key_type, "key_value": key_value} for key_type, key_value in sorted(keys)],
+                }
+                for (source, target), keys in sorted(edges.items())
+            ],
+            "skipped_keys": [{"key_type": key_type, "key_value": key_value} for key_type, key_value in sorted(skipped_keys)],
+        }
+
+    async def _nodes(self, depths: Dict[Node, int]) -> List[Dict[str, Any]]:
+        """Load a label for every node, one IN per entity type and batch"""
+        ids_by_type: Dict[str, List[int]] = defaultdict(list)
+        for entity_type, entity_id in depths:
+            ids_by_type[entity_type].append(entity_id)
+
+        labels: Dict[Node, Optional[str]] = {}
+        for entity_type, ids in ids_by_type.items():
+            model = ENTITY_MODELS[entity_type]
+            columns = [getattr(model, name) for name in LABEL_COLUMNS[entity_type]]
+            for batch in _chunks(sorted(ids), settings.GRAPH_BATCH_SIZE):
+                result = await self.db.execute(select(model.id, *columns).where(model.id.in_(batch)))
+                for entity_id, *values in result.all():
+                    labels[(entity_type, entity_id)] = next((value for value in values if value), None)
+
+        return [
+            {
+                "id": _node_id(node),
+                "entity_type": node[0],
+                "entity_id": node[1],
+                "label": labels.get(node),
+                "depth": node_depth,
+            }
+            for node, node_depth in sorted(depths.items(), key=lambda item: (item[1], item[0]))
+            # Keys of deleted entities are removed with them; skip any stale leftovers
+            if node in labels
+        ]
@@ -0,0 +1,175 @@
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import delete, insert, select, update
+
+from core.database import commit, dialect_insert
+from models.investigation import Investigation, InvestigationTarget
+from models.finding import Finding
+from schemas.finding import FindingCreate
+from schemas.investigation import InvestigationCreate, InvestigationUpdate
+from services.correlation_index import ENTITY_MODELS
+from utils.pagination import keyset_page
+
+# Investigation columns that also name a target
+TARGET_COLUMNS = {
+    "target_person_id": "person",
+    "target_company_id": "company",
+    "target_cyber_asset_id": "cyber_asset",
+}
+
+class InvestigationService:
+    """Service for investigation-related operations"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_investigation(self, investigation_id: int) -> Optional[Investigation]:
+        """Get investigation by ID"""
+        query = select(Investigation).where(Investigation.id == investigation_id)
+        result = await self.db.execute(query)
+        return result.scalar_one_or_none()
+
+    async def get_investigations(self, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[Investigation]:
+        """Get all investigations with keyset pagination on id"""
+        query = keyset_page(select(Investigation), Investigation, limit, after_id=after_id, skip=skip)
+        result = await self.db.execute(query)
+        return result.scalars().all()
+
+    async def create_investigation(self, investigation: InvestigationCreate) -> Investigation:
+        """Create a new investigation, linking its target_* entities as targets"""
+        db_investigation = Investigation(**investigation.dict())
+        self.db.add(db_investigation)
+        await self.db.flush()
+        await self._link_target_columns(db_investigation)
+        await commit(self.db)
+        return db_investigation
+
+    async def update_investigation(self, investigation_id: int, investigation_update: InvestigationUpdate) -> Optional[Investigation]:
+        """Update an existing investigation with a single UPDATE ... RETURNING"""
+        values = investigation_update.dict(exclude_unset=True)
+        if not values:
+            return await self.get_investigation(investigation_id)
+
+        result = await self.db.execute(
+            update(Investigation).where(Investigation.id == investigation_id).values(**values).returning(Investigation)
+        )
+        db_investigation = result.scalar_one_or_none()
+        if db_investigation is None:
+            return None
+
+        if TARGET_COLUMNS.keys() & values.keys():
+            await self._link_target_columns(db_investigation)
+        await commit(self.db)
+        return db_investigation
+
+    async def delete_investigation(self, investigation_id: int) -> bool:
+        """Delete an investigation with its targets and findings"""
+        await self.db.execute(delete(Finding).where(Finding.investigation_id == investigation_id))
+        await self.db.execute(
+            delete(InvestigationTarget).where(InvestigationTarget.investigation_id == investigation_id)
+        )
+        result = await self.db.execute(
+            delete(Investigation).where(Investigation.id == investigation_id).returning(Investigation.id)
+        )
+        if result.scalar_one_or_none() is None:
+            return False
+
+        await commit(self.db)
+        return True
+
+    async def _link_target_columns(self, investigation: Investigation):
+        """Add the target_* entities as targets, one insert skipping those already linked"""
+        rows = [
+            {"investigation_id": investigation.id, "entity_type": entity_type, "entity_id": getattr(investigation, column)}
+            for column, entity_type in TARGET_COLUMNS.items()
+            if getattr(investigation, column) is not None
+        ]
+        if rows:
+            statement = dialect_insert(self.db)(InvestigationTarget.__table__).on_conflict_do_nothing(
+                index_elements=["investigation_id", "entity_type", "entity_id"]
+            )
+            await self.db.execute(statement, rows)
+
+    async def _find_target(self, investigation_id: int, entity_type: str, entity_id: int) -> Optional[InvestigationTarget]:
+        query = select(InvestigationTarget).where(
+            InvestigationTarget.investigation_id == investigation_id,
+            InvestigationTarget.entity_type == entity_type,
+            InvestigationTarget.entity_id == entity_id,
+        )
+        result = await self.db.execute(query)
+        return result.scalar_one_or_none()
+
+    async def get_targets(self, investigation_id: int) -> List[InvestigationTarget]:
+        """Get the entities targeted by an investigation"""
+        query = (
+            select(InvestigationTarget)
+            .where(InvestigationTarget.investigation_id == investigation_id)
+            .order_by(InvestigationTarget.id)
+        )
+        result = await self.db.execute(query)
+        return result.scalars().all()
+
+    async def add_target(self, investigation_id: int, entity_type: str, entity_id: int) -> Optional[InvestigationTarget]:
+        """Link an entity to an investigation, None when the entity does not exist"""
+        model = ENTITY_MODELS[entity_type]
+        if await self.db.get(model, entity_id) is None:
+            return None
+
+        db_target = await self._find_target(investigation_id, entity_type, entity_id)
+        if db_target is None:
+            db_target = InvestigationTarget(investigation_id=investigation_id, entity_type=entity_type, entity_id=entity_id)
+            self.db.add(db_target)
+            await commit(self.db)
+        return db_target
+
+    async def remove_target(self, investigation_id: int, target_id: int) -> bool:
+        """Unlink a target from an investigation"""
+        result = await self.db.execute(
+            delete(InvestigationTarget).where(
+                InvestigationTarget.id == target_id, InvestigationTarget.investigation_id == investigation_id
+            )
+        )
+        await commit(self.db)
+        return result.rowcount > 0
+
+    async def add_finding(self, investigation_id: int, finding: FindingCreate) -> Finding:
+        """Append one collector result to an investigation"""
+        db_finding = Finding(investigation_id=investigation_id, **finding.dict())
+        self.db.add(db_finding)
+        await commit(self.db)
+        return db_finding
+
+    async def add_findings(self, investigation_id: int, findings: List[FindingCreate]):
+        """Append many collector results with a single executemany insert"""
+        if not findings:
+            return
+        await self.db.execute(
+            insert(Finding),
+            [{"investigation_id": investigation_id, **finding.dict()} for finding in findings],
+        )
+        await commit(self.db)
+
+    async def get_findings(
+        self,
+        investigation_id: int,
+        collector: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        after_id: Optional[int] = None,
+        limit: int = 100,
+    ) -> List[Finding]:
+        """Get findings in arrival order, filtered by collector and time range
+
+        Pass the id of the last finding seen as after_id to fetch only the
+        ones appended since.
+        """
+        query = select(Finding).where(Finding.investigation_id == investigation_id)
+        if collector:
+            query = query.where(Finding.collector == collector)
+        if since:
+            query = query.where(Finding.created_at >= since)
+        if until:
+            query = query.where(Finding.created_at < until)
+        result = await self.db.execute(keyset_page(query, Finding, limit, after_id=after_id))
+        return result.scalars().all()
@@ -1,21 +1,25 @@
-from typing import List, Optional
+from typing import Any, AsyncIterable, AsyncIterator, Dict, List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import delete, select, update
 from sqlalchemy.orm import selectinload
 
+from core.database import commit
 from models.person import Person
-from schemas.person import PersonCreate, PersonUpdate
-from collectors.persons.email import EmailCollector
-from collectors.persons.phone import PhoneCollector
-from collectors.persons.username import UsernameCollector
-from utils.http_client import HttpClient
+from schemas.person import Person as PersonSchema, PersonCreate, PersonUpdate
+from services.bulk_service import BulkIngestionService
+from services.correlation_index import KEY_FIELDS, CorrelationIndex
+from utils.bulk import NumberedRecord
+from utils.pagination import keyset_page, stream_ndjson
+from collectors.orchestrator import CollectionPlan, get_orchestrator
+from collectors.registry import get_registry
+from utils.http_client import HttpClient, get_http_client
 
 class PersonService:
     """Service for person-related operations"""
 
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, http_client: Optional[HttpClient] = None):
         self.db = db
-        self.http_client = HttpClient()
+        self.http_client = http_client or get_http_client()
 
     async def get_person(self, person_id: int) -> Optional[Person]:
         """Get person by ID"""
@@ -23,54 +27,82 @@ class PersonService:
         result = await self.db.execute(query)
         return result.scalar_one_or_none()
 
-    async def get_persons(self, skip: int = 0, limit: int = 100) -> List[Person]:
-        """Get all persons with pagination"""
-        query = select(Person).offset(skip).limit(limit)
+    async def get_persons(self, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[Person]:
+        """Get all persons with keyset pagination on id"""
+        query = keyset_page(select(Person), Person, limit, after_id=after_id, skip=skip)
         result = await self.db.execute(query)
         return result.scalars().all()
 
+    def export_persons(self) -> AsyncIterator[str]:
+        """Stream all persons as NDJSON"""
+        return stream_ndjson(self.db, Person, PersonSchema)
+
     async def create_person(self, person: PersonCreate) -> Person:
         """Create a new person"""
         db_person = Person(**person.dict())
         self.db.add(db_person)
-        await self.db.commit()
-        await self.db.refresh(db_person)
+        await self.db.flush()
+        await CorrelationIndex(self.db).index_entity("person", db_person, replace=False)
+        await commit(self.db)
         return db_person
 
     async def update_person(self, person_id: int, person_update: PersonUpdate) -> Optional[Person]:
-        """Update an existing person"""
-        db_person = await self.get_person(person_id)
-        if not db_person:
-            return None
+        """Update an existing person with a single UPDATE ... RETURNING"""
+        values = person_update.dict(exclude_unset=True)
+        if not values:
+            return await self.get_person(person_id)
 
-        for field, value in person_update.dict(exclude_unset=True).items():
-            setattr(db_person, field, value)
+        result = await self.db.execute(
+            update(Person).where(Person.id == person_id).values(**values).returning(Person)
+        )
+        db_person = result.scalar_one_or_none()
+        if db_person is None:
+            return None
 
-        await self.db.commit()
-        await self.db.refresh(db_person)
+        if KEY_FIELDS["person"] & values.keys():
+            await CorrelationIndex(self.db).index_entity("person", db_person)
+        await commit(self.db)
         return db_person
 
     async def delete_person(self, person_id: int) -> bool:
-        """Delete a person"""
-        db_person = await self.get_person(person_id)
-        if not db_person:
+        """Delete a person with a single DELETE ... RETURNING"""
+        result = await self.db.execute(delete(Person).where(Person.id == person_id).returning(Person.id))
+        if result.scalar_one_or_none() is None:
             return False
 
-        await self.db.delete(db_person)
-        await self.db.commit()
+        await CorrelationIndex(self.db).remove_entity("person", person_id)
+        await commit(self.db)
         return True
 
+    async def bulk_upsert_persons(self, records: AsyncIterable[NumberedRecord]) -> dict:
+        """Validate and upsert a stream of persons on their unique `email`"""
+        return await BulkIngestionService(self.db).ingest(Person, PersonCreate, "email", records, index_as="person")
+
     async def collect_email_data(self, email: str) -> dict:
         """Collect OSINT data for an email"""
-        collector = EmailCollector(self.http_client)
-        return await collector.collect(email)
+        collector = get_registry().create("person", "email", self.http_client)
+        return await collector.run(email)
 
     async def collect_phone_data(self, phone: str) -> dict:
         """Collect OSINT data for a phone number"""
-        collector = PhoneCollector(self.http_client)
-        return await collector.collect(phone)
+        collector = get_registry().create("person", "phone", self.http_client)
+        return await collector.run(phone)
 
     async def collect_username_data(self, username: str) -> dict:
         """Collect OSINT data for a username"""
-        collector = UsernameCollector(self.http_client)
-        return await collector.collect(username)
\ No newline at end of file
+        collector = get_registry().create("person", "username", self.http_client)
+        return await collector.run(username)
+
+    def collection_plan(
+        self, person: Person, names: Optional[List[str]] = None, max_cost: Optional[str] = None
+    ) -> CollectionPlan:
+        """Registered collectors (all, or the named ones) applicable to a person, keyed by result name"""
+        return get_registry().plan("person", person, self.http_client, names, max_cost)
+
+    async def collect_all(self, person: Person, timeouts: Optional[Dict[str, float]] = None) -> dict:
+        """Run every applicable collector for a person concurrently"""
+        return await get_orchestrator().collect_all(self.collection_plan(person), timeouts)
+
+    def stream_all(self, person: Person, collectors: Optional[List[str]] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Run the applicable (or named) collectors for a person, yielding partial results as they are found"""
+        return get_orchestrator().iter_stream(self.collection_plan(person, collectors))
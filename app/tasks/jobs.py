@@ -0,0 +1,250 @@
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+from sqlalchemy import and_, or_, select, update, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from core.database import AsyncSessionLocal
+from models.job import Job
+from collectors.orchestrator import CollectionPlan, get_orchestrator
+from core.logging import get_logger
+from services.person_service import PersonService
+from services.companies_service import CompaniesService
+from services.cyber_service import CyberService
+from services.investigation_service import InvestigationService
+from schemas.finding import FindingCreate
+
+logger = get_logger(__name__)
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED_STATES = {COMPLETED, FAILED, CANCELLED}
+
+# Service class and getter used to load each kind of entity
+ENTITY_SERVICES = {
+    "person": (PersonService, "get_person"),
+    "company": (CompaniesService, "get_company"),
+    "cyber_asset": (CyberService, "get_cyber_asset"),
+}
+
+# Jobs on an investigation run the collectors of all its targets
+INVESTIGATION = "investigation"
+
+class JobQueue:
+    """Database-backed queue of collection jobs
+
+    The queue lives in the application database, so any number of worker
+    processes can share it: a job is claimed with a conditional UPDATE and
+    only one worker can win it. A claim is a lease that the worker renews
+    while the job runs; when a worker dies its jobs are claimed again once
+    their leases expire.
+    """
+
+    def __init__(self, session_factory=AsyncSessionLocal, lease_seconds: Optional[float] = None):
+        self.session_factory = session_factory
+        self.lease_seconds = lease_seconds or settings.JOBS_LEASE_SECONDS
+
+    def _lease_expiry(self) -> datetime:
+        return datetime.now(timezone.utc) + timedelta(seconds=self.lease_seconds)
+
+    async def submit(self, entity_type: str, entity_id: int, collectors: Optional[List[str]] = None) -> Job:
+        """Queue a collection job and return it"""
+        if entity_type not in ENTITY_SERVICES and entity_type != INVESTIGATION:
+            raise ValueError(f"Unknown entity type: {entity_type}")
+        async with self.session_factory() as session:
+            job = Job(entity_type=entity_type, entity_id=entity_id, collectors=collectors, status=QUEUED)
+            session.add(job)
+            await session.commit()
+            return job
+
+    async def get(self, job_id: int) -> Optional[Job]:
+        """Get job by ID"""
+        async with self.session_factory() as session:
+            return await session.get(Job, job_id)
+
+    async def latest(self, entity_type: str, entity_id: int) -> Optional[Job]:
+        """Get the most recent job submitted for an entity"""
+        async with self.session_factory() as session:
+            result = await session.execute(
+                select(Job)
+                .where(Job.entity_type == entity_type, Job.entity_id == entity_id)
+                .order_by(Job.id.desc())
+                .limit(1)
+            )
+            return result.scalar_one_or_none()
+
+    async def cancel(self, job_id: int) -> Optional[Job]:
+        """Cancel a queued job, or ask the worker running it to stop"""
+        async with self.session_factory() as session:
+            await session.execute(
+                update(Job)
+                .where(Job.id == job_id, Job.status == QUEUED)
+                .values(status=CANCELLED, cancel_requested=True, finished_at=func.now())
+            )
+            await session.execute(
+                update(Job).where(Job.id == job_id, Job.status == RUNNING).values(cancel_requested=True)
+            )
+            await session.commit()
+            return await session.get(Job, job_id)
+
+    async def claim(self, worker_id: str) -> Optional[Job]:
+        """Atomically take the oldest queued job, or a job whose lease expired, for a worker"""
+        async with self.session_factory() as session:
+            while True:
+                claimable = or_(
+                    Job.status == QUEUED,
+                    and_(Job.status == RUNNING, Job.lease_expires_at < datetime.now(timezone.utc)),
+                )
+                row = (await session.execute(
+                    select(Job.id, Job.status, Job.worker_id).where(claimable).order_by(Job.id).limit(1)
+                )).one_or_none()
+                if row is None:
+                    return None
+
+                job_id, status, previous_worker = row
+                # Still in the state it was seen in: queued, or held by the same expired worker
+                held_by = Job.worker_id.is_(None) if previous_worker is None else Job.worker_id == previous_worker
+                claimed = await session.execute(
+                    update(Job)
+                    .where(Job.id == job_id, claimable, held_by)
+                    .values(status=RUNNING, worker_id=worker_id, started_at=func.now(),
+                            lease_expires_at=self._lease_expiry())
+                )
+                await session.commit()
+                if claimed.rowcount == 1:
+                    if status == RUNNING:
+                        logger.warning("Job %s taken over from %s after its lease expired", job_id, previous_worker)
+                    return await session.get(Job, job_id)
+                # Another worker won this job; try the next one
+
+    async def renew_lease(self, job_id: int, worker_id: str) -> bool:
+        """Extend the lease of a running job, False when the worker no longer holds it"""
+        async with self.session_factory() as session:
+            renewed = await session.execute(
+                update(Job)
+                .where(Job.id == job_id, Job.status == RUNNING, Job.worker_id == worker_id)
+                .values(lease_expires_at=self._lease_expiry())
+            )
+            await session.commit()
+            return renewed.rowcount == 1
+
+    async def requeue(self, job_id: int, worker_id: str):
+        """Give a running job back to the queue, as a worker shutting down does"""
+        async with self.session_factory() as session:
+            await session.execute(
+                update(Job)
+                .where(Job.id == job_id, Job.status == RUNNING, Job.worker_id == worker_id)
+                .values(status=QUEUED, worker_id=None, started_at=None, lease_expires_at=None)
+            )
+            await session.commit()
+
+    async def is_cancel_requested(self, job_id: int) -> bool:
+        async with self.session_factory() as session:
+            result = await session.execute(select(Job.cancel_requested).where(Job.id == job_id))
+            return bool(result.scalar_one_or_none())
+
+    async def finish(
+        self,
+        job_id: int,
+        status: str,
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None,
+        worker_id: Optional[str] = None,
+    ) -> bool:
+        """Record the outcome of a job
+
+        With a worker_id the outcome is only recorded while that worker
+        holds the job, so a worker that lost its lease cannot overwrite the
+        run of the worker that took the job over.
+        """
+        if result is not None:
+            # Collector output may hold dates and other non-JSON values
+            result = json.loads(json.dumps(result, default=str))
+        condition = [Job.id == job_id]
+        if worker_id is not None:
+            condition.append(Job.worker_id == worker_id)
+        async with self.session_factory() as session:
+            finished = await session.execute(
+                update(Job)
+                .where(*condition)
+                .values(status=status, result=result, error=error, finished_at=func.now(), lease_expires_at=None)
+            )
+            await session.commit()
+            return finished.rowcount == 1
+
+    async def execute(self, job: Job) -> Dict[str, Any]:
+        """Run the collectors of a job and return its summary"""
+        async with self.session_factory() as session:
+            if job.entity_type == INVESTIGATION:
+                return await run_investigation(session, job.entity_id, job.collectors)
+            return await run_collection(session, job.entity_type, job.entity_id, job.collectors)
+
+async def run_collection(
+    session: AsyncSession, entity_type: str, entity_id: int, collectors: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """Collect data for an entity with all (or the named) applicable collectors"""
+    service_class, getter = ENTITY_SERVICES[entity_type]
+    service = service_class(session)
+    entity = await getattr(service, getter)(entity_id)
+    if entity is None:
+        raise LookupError(f"{entity_type} {entity_id} not found")
+
+    return await get_orchestrator().collect_all(service.collection_plan(entity, collectors))
+
+async def run_investigation(
+    session: AsyncSession, investigation_id: int, collectors: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """Run every applicable collector on every target of an investigation
+
+    All targets go into one plan, so the run takes about as long as its
+    slowest collector. Each result is stored as a finding as soon as it
+    arrives, which lets clients follow progress while the run goes on.
+    """
+    service = InvestigationService(session)
+    if await service.get_investigation(investigation_id) is None:
+        raise LookupError(f"investigation {investigation_id} not found")
+
+    started = time.perf_counter()
+    plan: CollectionPlan = {}
+    sources: Dict[str, Any] = {}
+    for target in await service.get_targets(investigation_id):
+        service_class, getter = ENTITY_SERVICES[target.entity_type]
+        entity_service = service_class(session)
+        entity = await getattr(entity_service, getter)(target.entity_id)
+        if entity is None:
+            logger.warning("Investigation %s target %s %s not found", investigation_id, target.entity_type, target.entity_id)
+            continue
+        for name, (collector, value) in entity_service.collection_plan(entity, collectors).items():
+            key = f"{target.entity_type}:{target.entity_id}:{name}"
+            plan[key] = (collector, value)
+            sources[key] = (name, value, target.entity_type, target.entity_id)
+
+    counts = {"ok": 0, "error": 0, "timeout": 0}
+    async for key, outcome in get_orchestrator().iter_collect(plan):
+        name, value, entity_type, entity_id = sources[key]
+        data = outcome["result"] if "result" in outcome else {"error": outcome["error"]}
+        counts[outcome["status"]] += 1
+        await service.add_finding(investigation_id, FindingCreate(
+            collector=name,
+            target=value,
+            entity_type=entity_type,
+            entity_id=entity_id,
+            status=outcome["status"],
+            # Collector output may hold dates and other non-JSON values
+            data=json.loads(json.dumps(data, default=str)),
+        ))
+
+    return {
+        "investigation_id": investigation_id,
+        "collectors": len(plan),
+        **counts,
+        "elapsed": round(time.perf_counter() - started, 4),
+    }
+
+job_queue = JobQueue()
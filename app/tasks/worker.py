@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Collection job worker
+
+Run one or more of these next to the API to process queued jobs:
+
+    python -m tasks.worker --concurrency 4
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import sys
+import time
+from typing import Optional, Set
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.config import settings
+from core.logging import get_logger, setup_logging
+from tasks.jobs import JobQueue, job_queue, COMPLETED, FAILED, CANCELLED
+from utils.http_client import http_client
+
+logger = get_logger(__name__)
+
+class Worker:
+    """Claim queued jobs and run them, several at a time"""
+
+    def __init__(
+        self,
+        queue: JobQueue = job_queue,
+        concurrency: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+        worker_id: Optional[str] = None,
+    ):
+        self.queue = queue
+        self.concurrency = concurrency or settings.JOBS_WORKER_CONCURRENCY
+        self.poll_interval = poll_interval or settings.JOBS_POLL_INTERVAL
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self._running: Set[asyncio.Task] = set()
+        self._stopping = False
+
+    async def run(self):
+        """Process jobs until stop() is called"""
+        logger.info("Worker %s started with concurrency %s", self.worker_id, self.concurrency)
+        try:
+            while not self._stopping:
+                if len(self._running) >= self.concurrency:
+                    await asyncio.wait(self._running, return_when=asyncio.FIRST_COMPLETED)
+                    continue
+
+                job = await self.queue.claim(self.worker_id)
+                if job is None:
+                    await asyncio.sleep(self.poll_interval)
+                    continue
+
+                task = asyncio.create_task(self._process(job))
+                self._running.add(task)
+                task.add_done_callback(self._running.discard)
+        finally:
+            for task in list(self._running):
+                task.cancel()
+            await asyncio.gather(*self._running, return_exceptions=True)
+            logger.info("Worker %s stopped", self.worker_id)
+
+    def stop(self):
+        self._stopping = True
+
+    @staticmethod
+    async def _shielded(call):
+        # A shutdown must not interrupt a queue update halfway: a cancelled
+        # database call can leave its transaction open, and the job locked
+        # for the requeue that follows
+        return await asyncio.shield(call)
+
+    async def _process(self, job):
+        logger.info("Worker %s running job %s", self.worker_id, job.id)
+        execution = asyncio.create_task(self.queue.execute(job))
+        # Renew the lease well before it runs out
+        renew_every = self.queue.lease_seconds / 3
+        renewed_at = time.monotonic()
+        try:
+            while True:
+                done, _ = await asyncio.wait({execution}, timeout=self.poll_interval)
+                if done:
+                    break
+                if await self._shielded(self.queue.is_cancel_requested(job.id)):
+                    execution.cancel()
+                    await asyncio.gather(execution, return_exceptions=True)
+                    await self._shielded(self.queue.finish(
+                        job.id, CANCELLED, error="Cancelled by request", worker_id=self.worker_id
+                    ))
+                    logger.info("Job %s cancelled", job.id)
+                    return
+                if time.monotonic() - renewed_at >= renew_every:
+                    if not await self._shielded(self.queue.renew_lease(job.id, self.worker_id)):
+                        # Another worker took the job over; its run is the one that counts
+                        execution.cancel()
+                        await asyncio.gather(execution, return_exceptions=True)
+                        logger.warning("Worker %s lost the lease of job %s", self.worker_id, job.id)
+                        return
+                    renewed_at = time.monotonic()
+
+            await self._shielded(self.queue.finish(
+                job.id, COMPLETED, result=execution.result(), worker_id=self.worker_id
+            ))
+            logger.info("Job %s completed", job.id)
+        except asyncio.CancelledError:
+            # Shutting down: another worker runs the job from the start
+            execution.cancel()
+            await asyncio.gather(execution, return_exceptions=True)
+            await self.queue.requeue(job.id, self.worker_id)
+            logger.info("Job %s requeued by worker %s", job.id, self.worker_id)
+            raise
+        except Exception as e:
+            logger.error("Job %s failed: %s", job.id, e)
+            await self.queue.finish(job.id, FAILED, error=str(e), worker_id=self.worker_id)
+
+async def main(concurrency: Optional[int] = None):
+    worker = Worker(concurrency=concurrency)
+    await http_client.start()
+    try:
+        await worker.run()
+    finally:
+        await http_client.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a collection job worker")
+    parser.add_argument("--concurrency", type=int, default=None, help="Jobs processed at once")
+    args = parser.parse_args()
+
+    setup_logging()
+    try:
+        asyncio.run(main(args.concurrency))
+    except KeyboardInterrupt:
+        pass
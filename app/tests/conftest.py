@@ -0,0 +1,22 @@
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from core.database import Base
+# Imported for their tables, which create_all() only knows about once imported
+from models.company import Company
+from models.correlation import CorrelationKey
+from models.cyber import CyberAsset
+from models.finding import Finding
+from models.investigation import Investigation, InvestigationTarget
+from models.job import Job
+from models.person import Person
+
+
+@pytest_asyncio.fixture
+async def session_factory(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
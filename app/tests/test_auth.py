@@ -0,0 +1,62 @@
+import asyncio
+import threading
+from datetime import timedelta
+
+import pytest
+from jose import jwt
+
+from core import security, users
+from core.security import TokenVerifier, create_access_token, verify_password
+from core.users import UserStore
+
+
+@pytest.mark.asyncio
+async def test_token_verifier_caches_until_expiry_and_honors_revocation(monkeypatch):
+    decodes = []
+    real_decode = jwt.decode
+    monkeypatch.setattr(security.jwt, "decode", lambda *args, **kwargs: decodes.append(1) or real_decode(*args, **kwargs))
+    verifier = TokenVerifier(maxsize=2, ttl=300)
+
+    token = create_access_token({"sub": "admin"})
+    assert verifier.verify(token)["sub"] == "admin"
+    assert verifier.verify(token)["sub"] == "admin"
+    assert len(decodes) == 1
+    assert verifier.verify(token + "x") is None
+
+    # Cached for no longer than the token lives
+    short = create_access_token({"sub": "admin"}, expires_delta=timedelta(seconds=1))
+    assert verifier.verify(short) is not None
+    await asyncio.sleep(1.1)
+    assert verifier.verify(short) is None
+
+    await verifier.revoke(token)
+    assert verifier.verify(token) is None
+    # A new login in the same second is not the revoked token
+    assert verifier.verify(create_access_token({"sub": "admin"}))["sub"] == "admin"
+
+    other = await verifier.issue({"sub": "analyst"}, expires_delta=timedelta(minutes=5))
+    assert verifier.verify(other) is not None
+    await verifier.revoke_user("analyst")
+    assert verifier.verify(other) is None
+    # Logging in again right away, within the same second, works
+    again = await verifier.issue({"sub": "analyst"})
+    assert verifier.verify(again)["sub"] == "analyst"
+
+
+def test_user_stores_must_implement_get_user():
+    class Incomplete(UserStore):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+@pytest.mark.asyncio
+async def test_admin_hash_is_built_off_the_loop_on_first_use():
+    built = []
+    store = users.InMemoryUserStore(lambda: built.append(threading.get_ident()) or users.default_users())
+    assert built == []
+    user = await store.get_user("admin")
+    assert await store.get_user("admin") is user and len(built) == 1
+    assert built[0] != threading.get_ident()
+    assert verify_password("admin", user["hashed_password"])
@@ -0,0 +1,107 @@
+import pytest
+
+from models.person import Person
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_persons_reports_row_errors_without_aborting(session_factory):
+    import json
+    from sqlalchemy import select
+    from services.person_service import PersonService
+    from utils.bulk import iter_records
+
+    rows = [
+        {"name": "Ana", "email": "ana@example.com", "username": "ana"},
+        {"name": "Bad", "email": "not-an-email"},
+        {"name": "Ana Maria", "email": "ana@example.com", "tags": ["vip"]},
+        {"name": "Other", "email": "other@example.com", "username": "taken"},
+        {"name": "Clash", "email": "clash@example.com", "username": "taken"},
+    ] + [{"name": f"P{i}", "email": f"p{i}@example.com"} for i in range(20)]
+    body = ("\n".join(json.dumps(row) for row in rows) + "\n{broken\n").encode()
+
+    async def chunks():
+        for start in range(0, len(body), 7):
+            yield body[start:start + 7]
+
+    async with session_factory() as session:
+        service = PersonService(session)
+        service_report = await service.bulk_upsert_persons(iter_records(chunks(), "ndjson"))
+
+    async with session_factory() as session:
+        persons = {p.email: p for p in (await session.execute(select(Person))).scalars()}
+
+    assert service_report["processed"] == 26
+    assert sorted(e["row"] for e in service_report["errors"]) == [2, 5, 26]
+    assert service_report["duplicates"] == 1
+    assert len(persons) == 22
+    assert persons["ana@example.com"].name == "Ana Maria"
+    assert persons["ana@example.com"].username == "ana"
+    assert persons["ana@example.com"].tags == ["vip"]
+
+
+@pytest.mark.asyncio
+async def test_duplicate_cyber_asset_domains_are_rejected(session_factory):
+    from services.cyber_service import CyberService, DuplicateDomainError
+    from schemas.cyber import CyberAssetCreate, CyberAssetUpdate
+
+    async with session_factory() as session:
+        service = CyberService(session)
+        first = (await service.create_cyber_asset(CyberAssetCreate(domain="acme.com"))).id
+        second = (await service.create_cyber_asset(CyberAssetCreate(domain="globex.com"))).id
+
+        with pytest.raises(DuplicateDomainError):
+            await service.create_cyber_asset(CyberAssetCreate(domain="acme.com"))
+        with pytest.raises(DuplicateDomainError):
+            await service.update_cyber_asset(second, CyberAssetUpdate(domain="acme.com"))
+
+        assert (await service.get_cyber_asset(first)).domain == "acme.com"
+        assert (await service.get_cyber_asset(second)).domain == "globex.com"
+
+
+@pytest.mark.asyncio
+async def test_cyber_assets_upsert_on_databases_predating_the_unique_domain(session_factory):
+    from sqlalchemy import func, select, text
+    from models.cyber import CyberAsset
+    from models.investigation import Investigation, InvestigationTarget
+    from scripts.migrate_unique_domains import migrate
+    from services.cyber_service import CyberService
+    from utils.bulk import numbered
+
+    async with session_factory() as session:
+        # The domain index of a table created before it was unique
+        await session.execute(text("DROP INDEX ix_cyber_assets_domain"))
+        await session.execute(text("CREATE INDEX ix_cyber_assets_domain ON cyber_assets (domain)"))
+        session.add_all([CyberAsset(domain="acme.com"), CyberAsset(domain="acme.com", ip_address="10.0.0.2")])
+        await session.commit()
+
+        report = await CyberService(session).bulk_upsert_cyber_assets(numbered([
+            {"domain": "acme.com", "ip_address": "10.0.0.1"},
+            {"domain": "globex.com"},
+        ]))
+        assert (report["upserted"], report["failed"]) == (2, 0)
+        assert [a.ip_address for a in (await session.execute(select(CyberAsset).order_by(CyberAsset.id))).scalars()] == [
+            "10.0.0.1", "10.0.0.1", None,
+        ]
+
+        investigation = Investigation(title="Case", target_cyber_asset_id=2)
+        session.add(investigation)
+        await session.flush()
+        session.add_all([
+            InvestigationTarget(investigation_id=investigation.id, entity_type="cyber_asset", entity_id=1),
+            InvestigationTarget(investigation_id=investigation.id, entity_type="cyber_asset", entity_id=2),
+        ])
+        await session.commit()
+
+    engine = session_factory.kw["bind"]
+    assert await migrate(engine) == 1
+    assert await migrate(engine) == 0
+
+    async with session_factory() as session:
+        assert list((await session.execute(select(CyberAsset.id))).scalars()) == [1, 3]
+        assert (await session.get(Investigation, investigation.id)).target_cyber_asset_id == 1
+        targets = await session.execute(select(InvestigationTarget.entity_id))
+        assert list(targets.scalars()) == [1]
+
+        report = await CyberService(session).bulk_upsert_cyber_assets(numbered([{"domain": "acme.com", "notes": "merged"}]))
+        assert report["upserted"] == 1
+        assert await session.scalar(select(func.count()).select_from(CyberAsset)) == 2
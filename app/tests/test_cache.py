@@ -0,0 +1,105 @@
+import asyncio
+
+import pytest
+
+from collectors import base
+from collectors.cyber.dns import DNSCollector
+from utils.cache import ResultCache, SingleFlight, SQLiteCacheBackend
+
+
+@pytest.mark.asyncio
+async def test_collector_run_shares_in_flight_lookups_and_caches(monkeypatch):
+    monkeypatch.setattr(base, "collector_cache", ResultCache(max_entries=10))
+    calls = []
+
+    class CountingDNSCollector(DNSCollector):
+        async def collect(self, target):
+            calls.append(target)
+            await asyncio.sleep(0.05)
+            return {"domain": target, "records": {"A": ["192.0.2.10"]}}
+
+    collector = CountingDNSCollector()
+    results = await asyncio.gather(*(collector.run("Example.com") for _ in range(10)))
+    again = await collector.run("example.com ")
+
+    assert calls == ["Example.com"]
+    assert all(result == results[0] for result in results)
+    assert again == results[0]
+    # Every caller gets its own copy of the shared result
+    again["records"]["A"].append("192.0.2.99")
+    assert len({id(result) for result in results}) == len(results)
+    assert (await collector.run("example.com"))["records"]["A"] == ["192.0.2.10"]
+
+
+def test_result_cache_bounds_memory_and_persists(tmp_path):
+    async def scenario():
+        backend = SQLiteCacheBackend(str(tmp_path / "cache.db"))
+        cache = ResultCache(max_entries=100, max_bytes=200, backend=backend)
+
+        async def value(i):
+            return {"payload": "x" * 50, "i": i}
+
+        for i in range(10):
+            await cache.get_or_set(f"k{i}", 60, lambda i=i: value(i))
+        assert cache.memory.bytes <= 200
+        assert len(cache.memory) < 10
+
+        # A fresh process only has the persistent store
+        restarted = ResultCache(backend=SQLiteCacheBackend(str(tmp_path / "cache.db")))
+
+        async def fail():
+            raise AssertionError("should be served from the persistent store")
+
+        assert (await restarted.get_or_set("k0", 60, fail))["i"] == 0
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.asyncio
+async def test_single_flight_is_cancelled_when_its_last_caller_leaves():
+    flights = SingleFlight()
+    started, cancelled = [], []
+
+    async def lookup():
+        started.append(1)
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(1)
+            raise
+        return "answer"
+
+    callers = [asyncio.create_task(flights.do("key", lookup)) for _ in range(3)]
+    await asyncio.sleep(0.01)
+    for caller in callers[:2]:
+        caller.cancel()
+    await asyncio.sleep(0.01)
+    assert started == [1] and cancelled == [] and len(flights) == 1
+
+    # A timed out caller is the last one: the shared call stops with it
+    callers[2].cancel()
+    await asyncio.sleep(0.01)
+    assert cancelled == [1] and len(flights) == 0
+
+    async def quick():
+        return "answer"
+
+    assert await asyncio.wait_for(flights.do("key", quick), 1) == "answer"
+
+
+@pytest.mark.asyncio
+async def test_entries_read_from_the_persistent_store_expire_with_it(tmp_path):
+    backend = SQLiteCacheBackend(str(tmp_path / "cache.db"))
+    backend.set("key", {"n": 1}, ttl=0.2)
+    cache = ResultCache(backend=backend)
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        return {"n": 2}
+
+    assert await cache.get_or_set("key", 60, compute) == {"n": 1}
+    assert await cache.get_or_set("key", 60, compute) == {"n": 1}
+    await asyncio.sleep(0.25)
+    assert await cache.get_or_set("key", 60, compute) == {"n": 2}
+    assert calls == [1]
@@ -0,0 +1,56 @@
+import pytest
+
+
+@pytest.mark.asyncio
+async def test_correlation_index_follows_creates_updates_and_bulk_upserts(session_factory):
+    from services.companies_service import CompaniesService
+    from services.correlation_service import CorrelationService
+    from services.cyber_service import CyberService
+    from services.investigation_service import InvestigationService
+    from services.person_service import PersonService
+    from schemas.company import CompanyCreate
+    from schemas.investigation import InvestigationCreate
+    from schemas.person import PersonCreate, PersonUpdate
+    from utils.bulk import numbered
+
+    async with session_factory() as session:
+        person = await PersonService(session).create_person(
+            PersonCreate(name="Ana  Gomez", email="ana@mail.acme.com.py", username="anag")
+        )
+        other = await PersonService(session).create_person(PersonCreate(name="Luis", email="luis@acme.com.py"))
+        company = await CompaniesService(session).create_company(
+            CompanyCreate(name="Acme", ruc="80000001-1", domain="acme.com.py", employees=["ana gomez"])
+        )
+        await CyberService(session).bulk_upsert_cyber_assets(numbered([
+            {"domain": "www.acme.com.py", "ip_address": "10.0.0.1"},
+            {"domain": "unrelated.org", "ip_address": "10.0.0.1"},
+        ]))
+
+        connections = await CorrelationService(session).find_connections("person", person.id)
+        assert [c.id for c in connections["companies"]] == [company.id]
+        assert [a.domain for a in connections["cyber_assets"]] == ["www.acme.com.py"]
+        # A shared domain links across types only
+        assert connections["persons"] == []
+        assert {("domain", "acme.com.py"), ("name", "ana gomez")} <= {
+            (link["key_type"], link["key_value"]) for link in connections["links"]
+        }
+
+        await PersonService(session).update_person(other.id, PersonUpdate(email="luis@other.org"))
+        connections = await CorrelationService(session).find_connections("company", company.id)
+        assert [p.id for p in connections["persons"]] == [person.id]
+
+        # Investigations targeting an entity directly or through their target list
+        investigations = InvestigationService(session)
+        direct = await investigations.create_investigation(InvestigationCreate(title="Direct", target_company_id=company.id))
+        listed = await investigations.create_investigation(InvestigationCreate(title="Listed"))
+        await investigations.add_target(listed.id, "company", company.id)
+        await investigations.add_target(listed.id, "person", person.id)
+        connections = await CorrelationService(session).find_connections("company", company.id)
+        assert [i.id for i in connections["investigations"]] == [direct.id, listed.id]
+        connections = await CorrelationService(session).find_connections("person", person.id)
+        assert [i.id for i in connections["investigations"]] == [listed.id]
+
+        connections = await CorrelationService(session).find_connections("company", company.id)
+        asset = connections["cyber_assets"][0]
+        connections = await CorrelationService(session).find_connections("cyber_asset", asset.id)
+        assert [a.domain for a in connections["cyber_assets"]] == ["unrelated.org"]
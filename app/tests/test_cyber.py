@@ -0,0 +1,233 @@
+import asyncio
+import socketserver
+import threading
+import time
+
+import dns.message
+import dns.rcode
+import dns.rdatatype
+import dns.resolver
+import dns.rrset
+import pytest
+
+from collectors.cyber.dns import DNSCollector
+from collectors.cyber.subdomains import SubdomainCollector
+from utils.dns_resolver import build_resolver
+
+STUB_DELAY = 0.05
+
+STUB_RECORDS = {
+    "A": ["192.0.2.10"],
+    "AAAA": ["2001:db8::10"],
+    "MX": ["10 mail.example.com."],
+    "TXT": ['"v=spf1 -all"'],
+    "NS": ["ns1.example.com.", "ns2.example.com."],
+}
+
+
+class _StubDNSHandler(socketserver.BaseRequestHandler):
+    """Answer queries from the server's ``answer`` callable after its delay"""
+
+    def handle(self):
+        data, sock = self.request
+        query = dns.message.from_wire(data)
+        response = dns.message.make_response(query)
+        question = query.question[0]
+        rdtype = dns.rdatatype.to_text(question.rdtype)
+        records = self.server.answer(question.name.to_text(omit_final_dot=True), rdtype)
+        if records is None:
+            response.set_rcode(dns.rcode.NXDOMAIN)
+        elif records:
+            response.answer.append(dns.rrset.from_text_list(question.name, 300, "IN", rdtype, records))
+        time.sleep(self.server.delay)
+        sock.sendto(response.to_wire(), self.client_address)
+
+
+def _start_stub_server(answer, delay=0.0):
+    server = socketserver.ThreadingUDPServer(("127.0.0.1", 0), _StubDNSHandler)
+    server.answer = answer
+    server.delay = delay
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+@pytest.fixture(scope="module")
+def stub_dns_server():
+    server = _start_stub_server(lambda name, rdtype: STUB_RECORDS.get(rdtype, []), delay=STUB_DELAY)
+    yield server.server_address
+    server.shutdown()
+    server.server_close()
+
+
+async def _measure(coro):
+    """Run coro and return (result, elapsed seconds, max event-loop lag)"""
+    max_lag = 0.0
+    done = asyncio.Event()
+
+    async def ticker():
+        nonlocal max_lag
+        interval = 0.005
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(interval)
+            max_lag = max(max_lag, time.perf_counter() - start - interval)
+
+    tick = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    result = await coro
+    elapsed = time.perf_counter() - start
+    done.set()
+    await tick
+    return result, elapsed, max_lag
+
+
+async def _sequential_blocking_lookup(domain, host, port):
+    """The previous DNSCollector strategy: one blocking query per record type"""
+    records = {}
+    for record_type in DNSCollector.record_types:
+        resolver = dns.resolver.Resolver(configure=False)
+        resolver.nameservers = [host]
+        resolver.port = port
+        try:
+            records[record_type] = [str(r) for r in resolver.resolve(domain, record_type)]
+        except Exception:
+            pass
+    return records
+
+
+@pytest.mark.asyncio
+async def test_dns_collector_queries_record_types_concurrently(stub_dns_server):
+    host, port = stub_dns_server
+    collector = DNSCollector(resolver=build_resolver(nameservers=[host], port=port, timeout=2, lifetime=2))
+
+    result, elapsed, lag = await _measure(collector.collect("example.com"))
+    baseline, baseline_elapsed, baseline_lag = await _measure(
+        _sequential_blocking_lookup("example.com", host, port)
+    )
+
+    assert result["records"]["A"] == ["192.0.2.10"]
+    assert result["mx_records"] == ["10 mail.example.com."]
+    assert sorted(result["nameservers"]) == ["ns1.example.com.", "ns2.example.com."]
+    assert "CNAME" not in result["records"]
+    assert set(result["records"]) == set(baseline)
+
+    # Six record types at STUB_DELAY each: the concurrent path costs about one
+    # round-trip, and never holds the event loop for the duration of a query.
+    assert baseline_elapsed >= len(DNSCollector.record_types) * STUB_DELAY
+    assert elapsed < baseline_elapsed / 2
+    assert baseline_lag >= STUB_DELAY
+    assert lag < STUB_DELAY
+
+
+def _zone_answer(zone, wildcard=None):
+    def answer(name, rdtype):
+        if rdtype != "A":
+            return []
+        if name in zone:
+            return zone[name]
+        return wildcard
+    return answer
+
+
+@pytest.mark.asyncio
+async def test_subdomain_collector_streams_wordlist_from_disk(tmp_path):
+    zone = {f"host{i}.example.com": [f"198.51.100.{i // 100}"] for i in range(0, 1000, 100)}
+    server = _start_stub_server(_zone_answer(zone))
+    wordlist = tmp_path / "words.txt"
+    wordlist.write_text("# comment\n\n" + "\n".join(f"host{i}" for i in range(1000)) + "\n")
+    try:
+        host, port = server.server_address
+        collector = SubdomainCollector(
+            resolver=build_resolver(nameservers=[host], port=port, timeout=2, lifetime=2),
+            concurrency=50,
+            wordlist=str(wordlist),
+        )
+
+        streamed = [found async for found in collector.enumerate("example.com")]
+        result = await collector.collect("example.com")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert sorted(f["subdomain"] for f in streamed) == sorted(zone)
+    assert sorted(result["subdomains"]) == sorted(zone)
+    assert result["total_found"] == len(zone)
+    assert result["addresses"]["host100.example.com"] == ["198.51.100.1"]
+    assert result["wildcard"] == []
+
+
+@pytest.mark.asyncio
+async def test_subdomain_collector_drops_wildcard_hits():
+    zone = {"www.example.com": ["198.51.100.7"]}
+    server = _start_stub_server(_zone_answer(zone, wildcard=["203.0.113.1"]))
+    try:
+        host, port = server.server_address
+        collector = SubdomainCollector(
+            resolver=build_resolver(nameservers=[host], port=port, timeout=2, lifetime=2),
+            wordlist=["www", "mail", "api"],
+        )
+        result = await collector.collect("example.com")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert result["wildcard"] == ["203.0.113.1"]
+    assert result["subdomains"] == ["www.example.com"]
+
+
+@pytest.mark.asyncio
+async def test_whois_collector_caches_by_registrable_domain(monkeypatch):
+    import collectors.cyber.whois as whois_module
+
+    class FakeRecord:
+        registrar = "Example Registrar"
+        creation_date = expiration_date = updated_date = None
+        name_servers = ["ns1.example.com.py"]
+        status = emails = []
+
+        def __str__(self):
+            return "Registrar: Example Registrar\nDomain Name: example.com.py"
+
+    lookups = []
+
+    def fake_whois(domain):
+        lookups.append(domain)
+        return FakeRecord()
+
+    monkeypatch.setattr(whois_module.whois, "whois", fake_whois)
+    whois_module._whois_cache.clear()
+    collector = whois_module.WhoisCollector()
+
+    first = await collector.collect("www.example.com.py")
+    second = await collector.collect("api.example.com.py")
+
+    assert lookups == ["example.com.py"]
+    assert first["registrar"] == second["registrar"] == "Example Registrar"
+    assert second["domain"] == "api.example.com.py"
+    assert second["domain_name"] == "example.com.py"
+
+
+@pytest.mark.asyncio
+async def test_subdomain_stream_yields_hits_before_the_scan_finishes():
+    zone = {f"host{i}.example.com": ["198.51.100.1"] for i in (0, 1, 2)}
+    server = _start_stub_server(_zone_answer(zone), delay=0.05)
+    try:
+        host, port = server.server_address
+        collector = SubdomainCollector(
+            resolver=build_resolver(nameservers=[host], port=port, timeout=2, lifetime=2),
+            concurrency=4,
+            wordlist=[f"host{i}" for i in range(40)],
+        )
+        started = time.perf_counter()
+        events = []
+        async for event in collector.stream("example.com"):
+            events.append((event["event"], time.perf_counter() - started, event["data"]))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    partials = [data["subdomain"] for kind, _, data in events if kind == "partial"]
+    (kind, finished, result), = [event for event in events if event[0] == "result"]
+    assert sorted(partials) == sorted(result["subdomains"]) == [f"host{i}.example.com" for i in (0, 1, 2)]
+    assert events[0][0] == "partial" and events[0][1] < finished / 2
@@ -0,0 +1,40 @@
+import pytest
+
+from models.person import Person
+
+
+@pytest.mark.asyncio
+async def test_file_extractor_handles_chunk_boundaries_and_ingests_new_entities(session_factory, tmp_path):
+    from sqlalchemy import func, select
+    from services.extraction_service import ExtractionService
+    from utils.file_extractor import FileExtractor
+    from utils.parsers import DataParser
+
+    lines = [f"user{i}@Host{i % 7}.example.com seen at www.site{i % 5}.org ping @handle{i}" for i in range(300)]
+    text = "\n".join(lines + lines[:50])
+    dump = tmp_path / "dump.txt"
+    dump.write_text(text)
+
+    # Tiny chunks cut through most tokens; every value is still found exactly once
+    extractor = FileExtractor(kinds=("emails", "domains", "usernames"), chunk_size=97, overlap=64, workers=2)
+    found = [item async for item in extractor.extract(str(dump))]
+    expected = DataParser.extract_all(text)
+    assert len(found) == len(set(found))
+    assert {value for kind, value in found if kind == "emails"} == {email.lower() for email in expected["emails"]}
+    assert {value for kind, value in found if kind == "domains"} == {domain.lower() for domain in expected["domains"]}
+    assert {value for kind, value in found if kind == "usernames"} == set(expected["usernames"])
+
+    async with session_factory() as session:
+        session.add(Person(name="Known User", email="user0@host0.example.com"))
+        await session.commit()
+        service = ExtractionService(session, FileExtractor(chunk_size=97, overlap=64, workers=2))
+        report = await service.ingest_file(str(dump))
+
+        assert report["found"] == {"emails": 300, "domains": 12}
+        assert report["persons"]["upserted"] == 299 and report["persons"]["existing"] == 1
+        assert report["persons"]["failed"] == 0
+        assert report["cyber_assets"]["upserted"] == 12 and report["cyber_assets"]["existing"] == 0
+        assert await session.scalar(select(func.count()).select_from(Person)) == 300
+        # Existing entities are not overwritten by extracted ones
+        known = await session.scalar(select(Person).where(Person.email == "user0@host0.example.com"))
+        assert known.name == "Known User"
@@ -0,0 +1,40 @@
+import pytest
+
+
+@pytest.mark.asyncio
+async def test_graph_traversal_expands_by_level_within_budget(session_factory):
+    from services.companies_service import CompaniesService
+    from services.cyber_service import CyberService
+    from services.graph_service import GraphService
+    from services.person_service import PersonService
+    from utils.bulk import numbered
+
+    async with session_factory() as session:
+        await PersonService(session).bulk_upsert_persons(numbered([
+            {"name": "Ana", "email": "ana@acme.com"},
+            {"name": "Luis", "email": "luis@globex.com"},
+        ]))
+        await CompaniesService(session).bulk_upsert_companies(numbered([
+            {"name": "Acme", "ruc": "1", "domain": "acme.com"},
+            {"name": "Globex", "ruc": "2", "domain": "globex.com"},
+        ]))
+        await CyberService(session).bulk_upsert_cyber_assets(numbered([
+            {"domain": "acme.com", "ip_address": "10.0.0.1"},
+            {"domain": "globex.com", "ip_address": "10.0.0.1"},
+        ]))
+
+        service = GraphService(session)
+        graph = await service.traverse("person", 1, depth=4)
+        depths = {node["id"]: node["depth"] for node in graph["nodes"]}
+        assert depths == {
+            "person:1": 0, "company:1": 1, "cyber_asset:1": 1,
+            "cyber_asset:2": 2, "company:2": 3, "person:2": 3,
+        }
+        assert {"source": "cyber_asset:1", "target": "cyber_asset:2",
+                "keys": [{"key_type": "ip", "key_value": "10.0.0.1"}]} in graph["edges"]
+
+        graph = await service.traverse("person", 1, depth=4, edge_types=["domain"])
+        assert {node["id"] for node in graph["nodes"]} == {"person:1", "company:1", "cyber_asset:1"}
+
+        graph = await service.traverse("person", 1, depth=4, max_nodes=2)
+        assert graph["truncated"] and len(graph["nodes"]) == 2
@@ -0,0 +1,47 @@
+import asyncio
+import http.server
+import threading
+
+import pytest
+
+from utils.http_client import HttpClient
+
+
+class _KeepAliveHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def keepalive_server():
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}/"
+    server.shutdown()
+    server.server_close()
+
+
+def test_session_of_a_finished_loop_is_closed_when_replaced(keepalive_server):
+    client = HttpClient()
+
+    async def fetch():
+        session = await client._get_session()
+        async with session.get(keepalive_server) as response:
+            assert await response.read() == b"ok"
+        return session, session.connector
+
+    old_session, old_connector = asyncio.run(fetch())
+    assert sum(len(conns) for conns in old_connector._conns.values()) == 1
+    new_session, _ = asyncio.run(fetch())
+
+    assert new_session is not old_session
+    assert old_session.closed and old_connector.closed
+    asyncio.run(client.close())
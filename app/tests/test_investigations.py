@@ -0,0 +1,131 @@
+import asyncio
+import time
+from datetime import timedelta
+
+import pytest
+
+from collectors.base import BaseCollector
+from models.investigation import Investigation
+from models.person import Person
+from tasks.jobs import JobQueue
+from tasks.worker import Worker
+
+
+class SleepyCollector(BaseCollector):
+    cache_ttl = 0
+
+    def __init__(self, delay, fail=False):
+        super().__init__()
+        self.delay = delay
+        self.fail = fail
+
+    async def collect(self, target):
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("upstream down")
+        return {"target": target}
+
+
+@pytest.mark.asyncio
+async def test_findings_are_appended_and_fetched_incrementally(session_factory):
+    from schemas.finding import FindingCreate
+    from services.investigation_service import InvestigationService
+
+    async with session_factory() as session:
+        investigation = Investigation(title="Case")
+        session.add(investigation)
+        await session.commit()
+
+        service = InvestigationService(session)
+        await service.add_findings(investigation.id, [
+            FindingCreate(collector="email" if i % 2 else "dns", target=f"t{i}", data={"n": i}) for i in range(5)
+        ])
+        first = await service.get_findings(investigation.id, limit=3)
+        assert [f.data["n"] for f in first] == [0, 1, 2]
+
+        await service.add_finding(investigation.id, FindingCreate(collector="email", target="late", data={"n": 5}))
+        newer = await service.get_findings(investigation.id, after_id=first[-1].id)
+        assert [f.data["n"] for f in newer] == [3, 4, 5]
+
+        emails = await service.get_findings(investigation.id, collector="email")
+        assert [f.target for f in emails] == ["t1", "t3", "late"]
+        later = first[-1].created_at + timedelta(seconds=1)
+        assert await service.get_findings(investigation.id, since=later) == []
+        assert len(await service.get_findings(investigation.id, until=later)) == 6
+
+
+@pytest.mark.asyncio
+async def test_investigation_run_collects_all_targets_concurrently(session_factory, monkeypatch):
+    from services.investigation_service import InvestigationService
+    from services.person_service import PersonService
+    from schemas.investigation import InvestigationCreate
+    from tasks.jobs import INVESTIGATION
+
+    monkeypatch.setattr(PersonService, "collection_plan", lambda self, person, names=None, max_cost=None: {
+        "email": (SleepyCollector(0.2), person.email),
+        "username": (SleepyCollector(0.05, fail=True), person.username),
+    })
+
+    async with session_factory() as session:
+        persons = [Person(name=f"P{i}", email=f"p{i}@example.com", username=f"p{i}") for i in range(10)]
+        session.add_all(persons)
+        await session.commit()
+        service = InvestigationService(session)
+        investigation = await service.create_investigation(
+            InvestigationCreate(title="Case", target_person_id=persons[0].id)
+        )
+        for person in persons[1:]:
+            await service.add_target(investigation.id, "person", person.id)
+
+    queue = JobQueue(session_factory)
+    job = await queue.submit(INVESTIGATION, investigation.id)
+    worker = Worker(queue, concurrency=1, poll_interval=0.05)
+    worker_task = asyncio.create_task(worker.run())
+    try:
+        started = time.perf_counter()
+        while (await queue.get(job.id)).status != "completed":
+            assert time.perf_counter() - started < 1.5
+            await asyncio.sleep(0.05)
+    finally:
+        worker.stop()
+        await worker_task
+
+    result = (await queue.get(job.id)).result
+    assert (result["collectors"], result["ok"], result["error"]) == (20, 10, 10)
+    assert result["elapsed"] < 1.0
+
+    async with session_factory() as session:
+        findings = await InvestigationService(session).get_findings(investigation.id)
+    assert len(findings) == 20
+    assert {f.entity_id for f in findings if f.collector == "email" and f.status == "ok"} == {p.id for p in persons}
+
+
+@pytest.mark.asyncio
+async def test_findings_blobs_of_older_databases_move_to_the_findings_table(session_factory):
+    from sqlalchemy import inspect, text
+    from scripts.migrate_findings import migrate
+    from services.investigation_service import InvestigationService
+
+    async with session_factory() as session:
+        # The findings column of a database created before the findings table
+        await session.execute(text("ALTER TABLE investigations ADD COLUMN findings JSON"))
+        await session.execute(text(
+            "INSERT INTO investigations (id, title, findings) VALUES "
+            """(1, 'Case', '{"emails": ["john@example.com"], "dns": {"A": ["192.0.2.1"]}}'), """
+            "(2, 'Empty', NULL)"
+        ))
+        await session.commit()
+
+    engine = session_factory.kw["bind"]
+    assert await migrate(engine) == 2
+    assert await migrate(engine) == 0
+
+    async with session_factory() as session:
+        findings = await InvestigationService(session).get_findings(1)
+        assert [(f.collector, f.data) for f in findings] == [
+            ("emails", ["john@example.com"]), ("dns", {"A": ["192.0.2.1"]}),
+        ]
+        assert all(f.created_at is not None for f in findings)
+        assert await InvestigationService(session).get_findings(2) == []
+        columns = await session.run_sync(lambda s: inspect(s.connection()).get_columns("investigations"))
+        assert "findings" not in {column["name"] for column in columns}
@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+
+from models.person import Person
+from tasks.jobs import JobQueue
+from tasks.worker import Worker
+
+
+@pytest.mark.asyncio
+async def test_worker_runs_queued_person_job(session_factory):
+    async with session_factory() as session:
+        person = Person(name="John Doe", email="john@example.com", username="johndoe")
+        session.add(person)
+        await session.commit()
+
+    queue = JobQueue(session_factory)
+    job = await queue.submit("person", person.id, collectors=["email", "username"])
+    missing = await queue.submit("person", person.id + 1)
+    assert job.status == "queued"
+
+    worker = Worker(queue, concurrency=2, poll_interval=0.01, worker_id="test-worker")
+    runner = asyncio.create_task(worker.run())
+    try:
+        for _ in range(200):
+            job = await queue.get(job.id)
+            missing = await queue.get(missing.id)
+            if job.status == "completed" and missing.status == "failed":
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        worker.stop()
+        await runner
+
+    assert job.status == "completed"
+    assert job.worker_id == "test-worker"
+    assert set(job.result["results"]) == {"email", "username"}
+    assert missing.status == "failed"
+    assert "not found" in missing.error
+
+
+@pytest.mark.asyncio
+async def test_cancel_queued_job_is_never_claimed(session_factory):
+    queue = JobQueue(session_factory)
+    job = await queue.submit("person", 1)
+
+    cancelled = await queue.cancel(job.id)
+
+    assert cancelled.status == "cancelled"
+    assert await queue.claim("test-worker") is None
+
+
+@pytest.mark.asyncio
+async def test_job_of_a_dead_worker_is_taken_over_when_its_lease_expires(session_factory):
+    queue = JobQueue(session_factory, lease_seconds=0.05)
+    job = await queue.submit("person", 1)
+
+    assert (await queue.claim("dead-worker")).id == job.id
+    assert await queue.claim("live-worker") is None
+    await asyncio.sleep(0.1)
+
+    taken = await queue.claim("live-worker")
+    assert taken.id == job.id and taken.worker_id == "live-worker"
+    # The worker that lost the lease can neither renew nor finish the job
+    assert not await queue.renew_lease(job.id, "dead-worker")
+    assert not await queue.finish(job.id, "completed", result={}, worker_id="dead-worker")
+    assert await queue.renew_lease(job.id, "live-worker")
+    assert (await queue.get(job.id)).status == "running"
+
+
+@pytest.mark.asyncio
+async def test_worker_shutdown_requeues_its_running_jobs(session_factory):
+    queue = JobQueue(session_factory)
+    started = asyncio.Event()
+
+    async def slow_execute(job):
+        started.set()
+        await asyncio.sleep(10)
+
+    queue.execute = slow_execute
+    job = await queue.submit("person", 1)
+    worker = Worker(queue, concurrency=2, poll_interval=0.01, worker_id="test-worker")
+    runner = asyncio.create_task(worker.run())
+    await asyncio.wait_for(started.wait(), 5)
+    worker.stop()
+    await runner
+
+    requeued = await queue.get(job.id)
+    assert requeued.status == "queued" and requeued.worker_id is None and requeued.error is None
+    assert (await queue.claim("next-worker")).id == job.id
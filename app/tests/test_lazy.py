@@ -0,0 +1,30 @@
+import sys
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.lazy import LazyRouter, LazyRouterMiddleware
+
+
+def test_routers_load_on_first_use(tmp_path, monkeypatch):
+    (tmp_path / "lazy_endpoints.py").write_text(
+        "from fastapi import APIRouter\n"
+        "api_router = APIRouter()\n"
+        "@api_router.get('/ping')\n"
+        "async def ping():\n"
+        "    return {'pong': True}\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    app = FastAPI()
+    router = LazyRouter(app, "lazy_endpoints:api_router", "/api")
+    app.add_middleware(LazyRouterMiddleware, router=router)
+
+    @app.get("/health")
+    async def health():
+        return {"status": "healthy"}
+
+    with TestClient(app) as client:
+        assert client.get("/health").status_code == 200
+        assert "lazy_endpoints" not in sys.modules
+        assert client.get("/api/ping").json() == {"pong": True}
+        assert "/api/ping" in client.get("/openapi.json").json()["paths"]
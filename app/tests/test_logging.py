@@ -0,0 +1,83 @@
+import json
+import logging
+import threading
+
+from core import logging as log_setup
+from core.config import settings
+
+
+class Capture(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.lines, self.threads = [], set()
+
+    def emit(self, record):
+        self.threads.add(threading.get_ident())
+        self.lines.append(self.format(record))
+
+
+def test_logging_writes_sampled_json_records_on_a_background_thread(monkeypatch):
+    capture = Capture()
+    capture.setFormatter(log_setup.JsonFormatter())
+    monkeypatch.setattr(settings, "LOG_SAMPLING", {"collectors.cyber": 0.25})
+    root_level = logging.getLogger().level
+    log_setup.setup_logging(handlers=[capture])
+    try:
+        chatty = log_setup.get_logger("collectors.cyber.dns")
+        for index in range(8):
+            chatty.info("Collected DNS data for host%s.example.com", index)
+        chatty.warning("Resolver timed out", extra={"upstream": "dns"})
+        log_setup.get_logger("collectors.persons.email").info("Collected email data for %s", "a@example.com")
+    finally:
+        log_setup.shutdown_logging()
+        logging.getLogger().setLevel(root_level)
+
+    entries = [json.loads(line) for line in capture.lines]
+    assert [entry["message"] for entry in entries] == [
+        "Collected DNS data for host3.example.com",
+        "Collected DNS data for host7.example.com",
+        "Resolver timed out",
+        "Collected email data for a@example.com",
+    ]
+    assert entries[2]["level"] == "WARNING" and entries[2]["upstream"] == "dns"
+    assert entries[0]["logger"] == "collectors.cyber.dns"
+    assert capture.threads and threading.get_ident() not in capture.threads
+
+
+def test_shutdown_waits_for_room_in_a_full_queue_and_closes_handlers(monkeypatch):
+    writing, release = threading.Event(), threading.Event()
+
+    class Slow(Capture):
+        closed = False
+
+        def emit(self, record):
+            writing.set()
+            release.wait(5)
+            super().emit(record)
+
+        def close(self):
+            self.closed = True
+            super().close()
+
+    slow = Slow()
+    monkeypatch.setattr(settings, "LOG_QUEUE_SIZE", 2)
+    monkeypatch.setattr(settings, "LOG_SAMPLING", {})
+    root_level = logging.getLogger().level
+    log_setup.setup_logging(handlers=[slow])
+    try:
+        logger = log_setup.get_logger("tests.logging")
+        logger.warning("record 0")
+        assert writing.wait(5)
+        for index in range(1, 5):
+            logger.warning("record %s", index)
+        assert log_setup._listener.queue.full()
+        threading.Timer(0.1, release.set).start()
+    finally:
+        log_setup.shutdown_logging()
+        logging.getLogger().setLevel(root_level)
+
+    assert slow.closed and log_setup._listener is None
+    assert len(slow.lines) == 3
+    # The pipeline can be set up again after a shutdown from a full queue
+    log_setup.setup_logging(handlers=[Capture()])
+    log_setup.shutdown_logging()
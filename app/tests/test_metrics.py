@@ -0,0 +1,65 @@
+import threading
+
+import pytest
+
+from collectors.cyber.dns import DNSCollector
+from core import metrics
+from core.config import settings
+
+
+@pytest.mark.asyncio
+async def test_collector_runs_feed_metrics_in_prometheus_format(monkeypatch):
+    class FlakyLookup(DNSCollector):
+        cache_ttl = 0
+
+        async def collect(self, target):
+            if target == "down.example.com":
+                raise ValueError("no answer")
+            return {"domain": target}
+
+    runs = metrics.COLLECTOR_RUNS
+    ok_before = runs.labels("FlakyLookup", "ok").value
+    monkeypatch.setattr(settings, "RETRY_MAX_ATTEMPTS", 1)
+    collector = FlakyLookup()
+    await collector.run("up.example.com")
+    await collector.run("down.example.com")
+    assert runs.labels("FlakyLookup", "ok").value == ok_before + 1
+    assert runs.labels("FlakyLookup", "error").value >= 1
+
+    text = metrics.REGISTRY.render()
+    assert '# TYPE osint_collector_duration_seconds histogram' in text
+    assert 'osint_collector_duration_seconds_bucket{collector="FlakyLookup",le="+Inf"}' in text
+    assert 'osint_collector_runs_total{collector="FlakyLookup",outcome="ok"}' in text
+
+    # Label values past the series budget collapse into one "other" series
+    monkeypatch.setattr(settings, "METRICS_MAX_SERIES", 2)
+    hosts = metrics.Histogram("test_latency_seconds", "test", ["host"], buckets=(0.1, 1), registry=metrics.Registry())
+    for host, value in [("a", 0.05), ("b", 0.5), ("c", 2), ("d", 3)]:
+        hosts.labels(host).observe(value)
+    assert sorted(hosts._children) == [("a",), ("b",), ("other",)]
+    assert hosts.render()[-3:] == [
+        'test_latency_seconds_bucket{host="other",le="+Inf"} 2',
+        'test_latency_seconds_sum{host="other"} 5',
+        'test_latency_seconds_count{host="other"} 2',
+    ]
+
+
+def test_render_snapshots_series_added_concurrently():
+    requests = metrics.Counter("test_requests_total", "test", ["path"], registry=metrics.Registry())
+    stop = threading.Event()
+
+    def add_series():
+        index = 0
+        while not stop.is_set():
+            requests.labels(f"/path/{index}").inc()
+            index += 1
+
+    writer = threading.Thread(target=add_series)
+    writer.start()
+    try:
+        for _ in range(200):
+            requests.render()
+    finally:
+        stop.set()
+        writer.join()
+    assert len(requests.render()) == len(requests._children) + 2
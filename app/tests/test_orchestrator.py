@@ -0,0 +1,57 @@
+import asyncio
+import time
+
+import pytest
+
+from collectors.base import BaseCollector
+from collectors.orchestrator import CollectorOrchestrator
+
+
+class SleepyCollector(BaseCollector):
+    cache_ttl = 0
+
+    def __init__(self, delay, fail=False):
+        super().__init__()
+        self.delay = delay
+        self.fail = fail
+
+    async def collect(self, target):
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("upstream down")
+        return {"target": target}
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_runs_collectors_concurrently_with_partial_results():
+    orchestrator = CollectorOrchestrator(max_concurrency=10, default_timeout=1.0)
+    plan = {
+        "email": (SleepyCollector(0.1), "john@example.com"),
+        "phone": (SleepyCollector(0.1), "+595981000000"),
+        "username": (SleepyCollector(0.15), "johndoe"),
+        "broken": (SleepyCollector(0.05, fail=True), "johndoe"),
+        "slow": (SleepyCollector(5), "johndoe"),
+    }
+
+    started = time.perf_counter()
+    summary = await orchestrator.collect_all(plan, timeouts={"slow": 0.2})
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.4
+    assert set(summary["results"]) == {"email", "phone", "username"}
+    assert summary["results"]["email"] == {"target": "john@example.com"}
+    assert "upstream down" in summary["errors"]["broken"]
+    assert summary["timed_out"] == ["slow"]
+    assert summary["complete"] is False
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_respects_global_concurrency_budget():
+    orchestrator = CollectorOrchestrator(max_concurrency=2, default_timeout=1.0)
+    plan = {f"c{i}": (SleepyCollector(0.1), "target") for i in range(4)}
+
+    started = time.perf_counter()
+    summary = await orchestrator.collect_all(plan)
+
+    assert len(summary["results"]) == 4
+    assert time.perf_counter() - started >= 0.2
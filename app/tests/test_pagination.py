@@ -0,0 +1,27 @@
+import pytest
+
+
+@pytest.mark.asyncio
+async def test_keyset_pages_and_export_cover_every_person_once(session_factory):
+    import json
+    from services.person_service import PersonService
+    from utils.bulk import numbered
+    from utils.pagination import decode_cursor, next_cursor
+
+    async with session_factory() as session:
+        service = PersonService(session)
+        await service.bulk_upsert_persons(numbered({"name": f"P{i}", "email": f"p{i}@example.com"} for i in range(45)))
+
+        seen, after_id = [], None
+        while True:
+            page = await service.get_persons(limit=10, after_id=after_id)
+            seen += [person.email for person in page]
+            cursor = next_cursor(page, 10)
+            if cursor is None:
+                break
+            after_id = decode_cursor(cursor)
+
+        exported = [json.loads(line)["email"] for chunk in [c async for c in service.export_persons()] for line in chunk.splitlines()]
+
+    assert seen == [f"p{i}@example.com" for i in range(45)]
+    assert exported == seen
@@ -0,0 +1,22 @@
+from utils.parsers import SCANNER_PATTERN, DataParser
+from utils.validators import DataValidator
+
+
+def test_extract_all_scans_once_and_validate_many_matches_single_validators():
+    text = (
+        "Leak: john.doe@acme.com.py, (call 555-123-4567) ping @jdoe\n"
+        "mirror at www.example.org; backup:ops@example.org @jdoe"
+    )
+    assert DataParser.extract_all(text) == {
+        "emails": ["john.doe@acme.com.py", "ops@example.org"],
+        "phones": ["555-123-4567"],
+        "domains": ["acme.com.py", "www.example.org", "example.org"],
+        "usernames": ["jdoe"],
+    }
+    # Scanning token by token finds what one regex pass over the whole text finds
+    assert list(DataParser.scan(text)) == [(m.lastgroup, m.group(m.lastgroup)) for m in SCANNER_PATTERN.finditer(text)]
+
+    values = ["a@b.com", " x@y.org ", "bad", "", None, "https://example.com/x", "john_doe", "10.0.0.256"]
+    for kind in ("email", "domain", "username", "url", "ip_address", "phone"):
+        expected = [bool(value) and getattr(DataValidator, f"validate_{kind}")(value) for value in values]
+        assert DataValidator.validate_many(values, kind) == expected
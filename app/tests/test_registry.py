@@ -0,0 +1,35 @@
+import sys
+from types import SimpleNamespace
+
+from collectors.registry import CollectorRegistry, CollectorSpec, registry
+from core.config import settings
+
+
+def test_collector_registry_imports_collectors_on_first_use(tmp_path, monkeypatch):
+    (tmp_path / "lazy_port_scan.py").write_text(
+        "from collectors.base import BaseCollector\n"
+        "class PortScanCollector(BaseCollector):\n"
+        "    async def collect(self, target):\n"
+        "        return {'target': target}\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(settings, "RATE_LIMITS", {"portscan": 2.0})
+    lazy = CollectorRegistry([
+        CollectorSpec("dns", "collectors.cyber.dns:DNSCollector", "cyber_asset", "domain"),
+        CollectorSpec("ports", "lazy_port_scan:PortScanCollector", "cyber_asset", "ip_address",
+                      cost="high", upstream="portscan"),
+    ], entry_point_group=None)
+
+    asset = SimpleNamespace(domain="example.com", ip_address="192.0.2.1")
+    assert sorted(lazy.plan("cyber_asset", asset, max_cost="medium")) == ["dns"]
+    assert sorted(lazy.plan("cyber_asset", SimpleNamespace(domain="example.com", ip_address=None))) == ["dns"]
+    assert "lazy_port_scan" not in sys.modules
+
+    (collector, target), = lazy.plan("cyber_asset", asset, names=["ports"]).values()
+    assert "lazy_port_scan" in sys.modules
+    assert type(collector).__name__ == "PortScanCollector" and target == "192.0.2.1"
+    assert lazy.get("cyber_asset", "ports").to_dict()["rate_limit"] == 2.0
+
+    # The built-in collectors keep their result names
+    assert [spec.name for spec in registry.specs("person")] == ["email", "phone", "username"]
+    assert [spec.name for spec in registry.specs("cyber_asset", max_cost="low")] == ["dns"]
@@ -0,0 +1,120 @@
+import time
+
+import pytest
+
+from collectors.companies.ruc import RUCCollector
+from core.config import settings
+from utils import resilience
+from utils.resilience import CircuitBreaker, TokenBucket, UpstreamError, backoff_delay, parse_retry_after
+
+
+@pytest.fixture(autouse=True)
+def fast_resilience(monkeypatch):
+    monkeypatch.setattr(settings, "RETRY_BASE_DELAY", 0.01)
+    monkeypatch.setattr(settings, "RETRY_MAX_ATTEMPTS", 3)
+    monkeypatch.setattr(settings, "CIRCUIT_BREAKER_FAILURE_THRESHOLD", 3)
+    monkeypatch.setattr(settings, "CIRCUIT_BREAKER_RESET_TIMEOUT", 60)
+    monkeypatch.setattr(resilience, "_circuit_breakers", {})
+    monkeypatch.setattr(resilience, "_rate_limiters", {})
+
+
+class FlakyRegistryCollector(RUCCollector):
+    cache_ttl = 0
+    upstream = "ruc-registry"
+
+    def __init__(self, failures, status=503):
+        super().__init__()
+        self.failures = failures
+        self.status = status
+        self.calls = 0
+
+    async def collect(self, target):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise UpstreamError("registry unavailable", status=self.status)
+        return await super().collect(target)
+
+
+@pytest.mark.asyncio
+async def test_retryable_failures_are_retried_until_success():
+    collector = FlakyRegistryCollector(failures=2)
+
+    result = await collector.run("800123456")
+
+    assert collector.calls == 3
+    assert result["company_name"] == "Mock Company S.A."
+
+
+@pytest.mark.asyncio
+async def test_client_errors_are_not_retried():
+    collector = FlakyRegistryCollector(failures=5, status=404)
+
+    result = await collector.run("800123456")
+
+    assert collector.calls == 1
+    assert "registry unavailable" in result["error"]
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_fails_fast_while_upstream_is_down():
+    collector = FlakyRegistryCollector(failures=100)
+
+    first = await collector.run("800123456")
+    second = await collector.run("800123456")
+
+    assert collector.calls == 3
+    assert "registry unavailable" in first["error"]
+    assert second["circuit_open"] is True
+
+
+def test_circuit_breaker_half_open_trial():
+    breaker = CircuitBreaker("registry", failure_threshold=1, reset_timeout=0.05)
+    breaker.record_failure()
+    with pytest.raises(resilience.CircuitOpenError):
+        breaker.before_call()
+
+    time.sleep(0.06)
+    breaker.before_call()
+    with pytest.raises(resilience.CircuitOpenError):
+        breaker.before_call()
+    breaker.record_success()
+    breaker.before_call()
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_spaces_calls_after_burst():
+    bucket = TokenBucket(rate=50, burst=2)
+    started = time.perf_counter()
+    for _ in range(6):
+        await bucket.acquire()
+    assert time.perf_counter() - started >= 4 / 50 * 0.9
+
+
+def test_backoff_is_jittered_and_honors_retry_after():
+    delays = {backoff_delay(3, base=1, cap=10) for _ in range(20)}
+    assert len(delays) > 1
+    assert all(0 <= d <= 8 for d in delays)
+    assert backoff_delay(0, base=0.01, cap=10, retry_after=2) == 2
+    assert parse_retry_after("7") == 7
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+
+
+@pytest.mark.asyncio
+async def test_only_upstream_answers_close_the_breaker():
+    breaker = resilience.get_circuit_breaker("ruc-registry")
+    breaker.record_failure()
+    breaker.record_failure()
+
+    async def broken_parser():
+        raise ValueError("unexpected payload")
+
+    with pytest.raises(ValueError):
+        await resilience.call_with_resilience("ruc-registry", broken_parser)
+    assert breaker.failures == 2
+
+    async def not_found():
+        raise UpstreamError("no such RUC", status=404)
+
+    with pytest.raises(UpstreamError):
+        await resilience.call_with_resilience("ruc-registry", not_found)
+    assert breaker.failures == 0 and breaker.state == CircuitBreaker.CLOSED
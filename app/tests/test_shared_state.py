@@ -0,0 +1,54 @@
+import asyncio
+import time
+
+import pytest
+
+
+async def wait_until(condition, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_shared_state_is_seen_by_every_worker_process(tmp_path):
+    from core.security import SQLiteRevocationList, TokenVerifier, create_access_token, verify_password
+    from core.users import SQLiteUserStore, default_users
+    from utils.resilience import SQLiteTokenBucket
+    from utils.shared_state import SQLiteState
+
+    path = str(tmp_path / "state.db")
+    schema = ["CREATE TABLE IF NOT EXISTS rate_limits (name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"]
+
+    # Two workers draw from one bucket: 4 calls at 20/s with a burst of 2
+    # take about two intervals, not one as with a bucket each
+    buckets = [SQLiteTokenBucket(SQLiteState(path, schema), "registry", rate=20, burst=2) for _ in range(2)]
+    started = time.monotonic()
+    await asyncio.gather(*(bucket.acquire() for bucket in buckets for _ in range(2)))
+    assert time.monotonic() - started >= 0.09
+
+    # A logout seen by one worker is honored by the other, cached claims or
+    # not, once its copy of the revocations is reloaded
+    first = TokenVerifier(revocations=SQLiteRevocationList(path, refresh_interval=0.05))
+    second = TokenVerifier(revocations=SQLiteRevocationList(path, refresh_interval=0.05))
+    token = create_access_token({"sub": "admin"})
+    assert first.verify(token) and second.verify(token)
+    await first.revoke(token)
+    assert first.verify(token) is None
+    await wait_until(lambda: second.verify(token) is None)
+    other = create_access_token({"sub": "analyst"})
+    assert second.verify(other)
+    await first.revoke_user("analyst")
+    await wait_until(lambda: second.verify(other) is None)
+    # Tokens issued by either worker after the logout are valid in both
+    assert second.verify(await first.issue({"sub": "analyst"}))
+    assert first.verify(await second.issue({"sub": "analyst"}))
+
+    seeded = []
+    store = SQLiteUserStore(path, seed=lambda: seeded.append(1) or default_users())
+    admin = await store.get_user("admin")
+    assert verify_password("admin", admin["hashed_password"])
+    await store.set_user({"username": "analyst", "hashed_password": "x", "full_name": "Analyst"})
+    assert (await SQLiteUserStore(path, seed=default_users).get_user("analyst"))["full_name"] == "Analyst"
+    assert seeded == [1]
@@ -0,0 +1,105 @@
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from core.database import Base
+from models.correlation import CorrelationKey
+from models.person import Person
+
+
+@pytest.mark.asyncio
+async def test_person_writes_use_single_statements_and_units_of_work(session_factory):
+    from sqlalchemy import event, func, select
+    from core.database import UnitOfWork
+    from services.person_service import PersonService
+    from schemas.person import PersonCreate, PersonUpdate
+
+    async with session_factory() as session:
+        statements = []
+        event.listen(session.bind.sync_engine, "before_cursor_execute",
+                     lambda conn, cursor, statement, *args: statements.append(statement.split()[0]))
+        service = PersonService(session)
+
+        person = await service.create_person(PersonCreate(name="Ann Lee", email="ann@example.com"))
+        assert person.created_at is not None
+        assert statements == ["INSERT", "INSERT"]  # the person with RETURNING, then its keys
+
+        statements.clear()
+        updated = await service.update_person(person.id, PersonUpdate(notes="seen on a forum"))
+        assert updated.notes == "seen on a forum" and updated.updated_at is not None
+        assert statements == ["UPDATE"]  # notes do not change the correlation keys
+
+        statements.clear()
+        updated = await service.update_person(person.id, PersonUpdate(username="annlee"))
+        assert updated.username == "annlee" and updated.name == "Ann Lee"
+        assert statements == ["UPDATE", "DELETE", "INSERT"]
+
+        statements.clear()
+        assert await service.update_person(999, PersonUpdate(notes="x")) is None
+        assert await service.delete_person(999) is False
+        assert await service.delete_person(person.id) is True
+        assert statements == ["UPDATE", "DELETE", "DELETE", "DELETE"]
+
+        # A unit of work commits several service calls at once, or none of them
+        with pytest.raises(RuntimeError):
+            async with UnitOfWork(session):
+                await service.create_person(PersonCreate(name="Bo", email="bo@example.com"))
+                raise RuntimeError("abort")
+        async with UnitOfWork(session):
+            for name in ("Cy", "Di"):
+                await service.create_person(PersonCreate(name=name, email=f"{name.lower()}@example.com"))
+        assert await session.scalar(select(func.count()).select_from(Person)) == 2
+        assert await session.scalar(select(func.count()).select_from(CorrelationKey)) == 6
+
+
+def test_write_requests_commit_their_unit_of_work_before_responding(tmp_path, monkeypatch):
+    from fastapi import Depends, FastAPI, HTTPException
+    from fastapi.testclient import TestClient
+    from sqlalchemy import func, select
+    from sqlalchemy.pool import NullPool
+    from api.unit_of_work import UnitOfWorkMiddleware, get_unit_of_work
+    from core import database
+    from schemas.person import PersonCreate
+    from services.person_service import PersonService
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'uow.db'}", poolclass=NullPool)
+
+    async def create_tables():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    asyncio.run(create_tables())
+    monkeypatch.setattr(database, "AsyncSessionLocal", sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False))
+    committed_before_response = []
+
+    app = FastAPI()
+    app.add_middleware(UnitOfWorkMiddleware)
+
+    @app.post("/persons/{name}")
+    async def create(name: str, fail: bool = False, db: AsyncSession = Depends(get_unit_of_work)):
+        service = PersonService(db)
+        for suffix in ("", "-alias"):
+            await service.create_person(PersonCreate(name=name + suffix, email=f"{name}{suffix}@example.com"))
+        if fail:
+            raise HTTPException(status_code=409, detail="conflict")
+        return {"name": name}
+
+    @app.middleware("http")
+    async def probe(request, call_next):
+        response = await call_next(request)
+        committed_before_response.append(await count_persons())
+        return response
+
+    async def count_persons():
+        async with database.AsyncSessionLocal() as session:
+            return await session.scalar(select(func.count()).select_from(Person))
+
+    with TestClient(app) as client:
+        assert client.post("/persons/ann").status_code == 200
+        assert client.post("/persons/bo", params={"fail": True}).status_code == 409
+
+    # Both writes of the first request were stored, none of the failed one
+    assert asyncio.run(count_persons()) == 2
+    assert committed_before_response[0] == 2
@@ -0,0 +1,87 @@
+import hashlib
+import math
+from array import array
+from typing import Tuple
+
+# Bits of a 64-bit word addressed by one hash, and the most hashes one
+# 128-bit digest can provide after the 32 bits that pick the word
+WORD_BITS = 64
+MAX_HASHES = 16
+
+def _false_positive_rate(items_per_word: float, hashes: int) -> float:
+    """False positive rate of a one-word blocked filter, items per word being Poisson distributed"""
+    total, probability, others = 0.0, math.exp(-items_per_word), 0
+    while others < items_per_word * 6 + 40:
+        total += probability * (1 - (1 - 1 / WORD_BITS) ** (hashes * others)) ** hashes
+        others += 1
+        probability *= items_per_word / others
+    return total
+
+def bloom_signature(item: str, words: int, hashes: int) -> Tuple[int, int]:
+    """The word an item maps to and the mask of its bits in that word
+
+    A plain function so worker processes can hash values before handing them
+    to the filter in the parent.
+    """
+    digest = int.from_bytes(hashlib.blake2b(item.encode('utf-8', 'surrogatepass'), digest_size=16).digest(), 'little')
+    word = (digest & 0xFFFFFFFF) % words
+    digest >>= 32
+    mask = 0
+    for _ in range(hashes):
+        mask |= 1 << (digest & 63)
+        digest >>= 6
+    return word, mask
+
+class BloomFilter:
+    """Fixed-size probabilistic set of strings
+
+    Register-blocked: all the bits of an item live in one 64-bit word, so a
+    lookup touches one word and costs one comparison. That needs more bits
+    per item than a classic filter for the same error rate, and the size is
+    derived for this layout. Memory is set by capacity and error_rate up
+    front and never grows; past capacity the false positive rate rises. A
+    false positive makes add() report a new item as already seen.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 1e-4):
+        if capacity <= 0 or not 0 < error_rate < 1:
+            raise ValueError("capacity must be positive and error_rate between 0 and 1")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.words, self.hashes = self._dimensions(capacity, error_rate)
+        self.bits = array('Q', bytes(8 * self.words))
+        self.count = 0
+
+    @staticmethod
+    def _dimensions(capacity: int, error_rate: float) -> Tuple[int, int]:
+        bits_per_item = 8
+        while True:
+            items_per_word = WORD_BITS / bits_per_item
+            rate, hashes = min((_false_positive_rate(items_per_word, k), k) for k in range(1, MAX_HASHES + 1))
+            if rate <= error_rate or bits_per_item >= 1024:
+                return math.ceil(capacity * bits_per_item / WORD_BITS), hashes
+            bits_per_item += 2
+
+    def signature(self, item: str) -> Tuple[int, int]:
+        return bloom_signature(item, self.words, self.hashes)
+
+    def add_signature(self, word: int, mask: int) -> bool:
+        """Add a precomputed signature, returning True when it was not in the filter yet"""
+        current = self.bits[word]
+        if current & mask == mask:
+            return False
+        self.bits[word] = current | mask
+        self.count += 1
+        return True
+
+    def add(self, item: str) -> bool:
+        """Add item, returning True when it was not in the filter yet"""
+        return self.add_signature(*self.signature(item))
+
+    def __contains__(self, item: str) -> bool:
+        word, mask = self.signature(item)
+        return self.bits[word] & mask == mask
+
+    @property
+    def nbytes(self) -> int:
+        return self.bits.itemsize * len(self.bits)
@@ -0,0 +1,112 @@
+import csv
+import json
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Iterable, List, Optional, Tuple, TypeVar, Union
+
+T = TypeVar("T")
+
+# A parsed input row: its 1-based row number and the record, or the parse error
+NumberedRecord = Tuple[int, Union[Dict[str, Any], Exception]]
+
+NDJSON = "ndjson"
+CSV = "csv"
+
+def detect_format(content_type: Optional[str], explicit: Optional[str] = None) -> str:
+    """Pick the input format from an explicit name or the request Content-Type"""
+    if explicit:
+        fmt = explicit.lower()
+        if fmt not in (NDJSON, CSV):
+            raise ValueError(f"Unsupported format: {explicit}")
+        return fmt
+    content_type = (content_type or "").lower()
+    if "csv" in content_type:
+        return CSV
+    return NDJSON
+
+async def iter_lines(chunks: AsyncIterable[bytes], encoding: str = "utf-8") -> AsyncIterator[str]:
+    """Split a stream of byte chunks into text lines without buffering the whole body"""
+    pending = b""
+    async for chunk in chunks:
+        if not chunk:
+            continue
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            yield line.rstrip(b"\r").decode(encoding, errors="replace")
+    if pending:
+        yield pending.rstrip(b"\r").decode(encoding, errors="replace")
+
+async def iter_ndjson(lines: AsyncIterable[str]) -> AsyncIterator[NumberedRecord]:
+    row = 0
+    async for line in lines:
+        if not line.strip():
+            continue
+        row += 1
+        try:
+            record = json.loads(line)
+            if not isinstance(record, dict):
+                raise ValueError("Each line must be a JSON object")
+            yield row, record
+        except ValueError as e:
+            yield row, e
+
+def _csv_value(value: str) -> Any:
+    # List and dict columns (tags, social_profiles, ...) are written as JSON
+    if value[:1] in ("[", "{"):
+        try:
+            return json.loads(value)
+        except ValueError:
+            pass
+    return value
+
+async def iter_csv(lines: AsyncIterable[str]) -> AsyncIterator[NumberedRecord]:
+    header: Optional[List[str]] = None
+    row = 0
+    record_lines: List[str] = []
+    async for line in lines:
+        record_lines.append(line)
+        # A quoted field may contain newlines: keep reading until quotes balance
+        if sum(part.count('"') for part in record_lines) % 2:
+            continue
+        text = "\n".join(record_lines)
+        record_lines = []
+        if not text.strip():
+            continue
+        values = next(csv.reader([text]))
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        row += 1
+        if len(values) != len(header):
+            yield row, ValueError(f"Expected {len(header)} columns, got {len(values)}")
+            continue
+        yield row, {name: _csv_value(value) for name, value in zip(header, values) if value != ""}
+    if record_lines:
+        yield row + 1, ValueError("Unterminated quoted field")
+
+def iter_records(chunks: AsyncIterable[bytes], fmt: str) -> AsyncIterator[NumberedRecord]:
+    """Parse an NDJSON or CSV byte stream into numbered records"""
+    lines = iter_lines(chunks)
+    return iter_csv(lines) if fmt == CSV else iter_ndjson(lines)
+
+async def numbered(records: Union[Iterable[Dict[str, Any]], AsyncIterable[Dict[str, Any]]]) -> AsyncIterator[NumberedRecord]:
+    """Number plain records so they can be fed to the bulk ingestion path"""
+    row = 0
+    if hasattr(records, "__aiter__"):
+        async for record in records:
+            row += 1
+            yield row, record
+    else:
+        for record in records:
+            row += 1
+            yield row, record
+
+async def batched(items: AsyncIterable[T], size: int) -> AsyncIterator[List[T]]:
+    """Group an async stream into lists of at most size items"""
+    batch: List[T] = []
+    async for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
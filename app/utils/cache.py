@@ -0,0 +1,225 @@
+import asyncio
+import copy
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+from utils.shared_state import SQLiteState
+
+class TTLCache:
+    """In-memory cache with per-entry expiry and a bounded number of entries
+
+    Entries expire ``ttl`` seconds after they are set. When the cache is full
+    the least recently used entry is evicted. With ``max_bytes`` and a
+    ``sizeof`` function the cache is also bounded by the estimated size of
+    its values.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: float = 300.0,
+        max_bytes: Optional[int] = None,
+        sizeof: Optional[Callable[[Any], int]] = None,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.bytes = 0
+        self._data: "OrderedDict[Hashable, Tuple[float, Any, int]]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value, or default when missing or expired"""
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        expires_at, value, _ = entry
+        if expires_at <= time.monotonic():
+            self.delete(key)
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value for ttl seconds (the cache default when omitted)"""
+        size = self.sizeof(value) if self.sizeof else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            # Never let one oversized value flush the whole cache
+            self.delete(key)
+            return
+        self.delete(key)
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._data[key] = (expires_at, value, size)
+        self.bytes += size
+        while len(self._data) > self.maxsize or (self.max_bytes is not None and self.bytes > self.max_bytes):
+            _, (_, _, evicted_size) = self._data.popitem(last=False)
+            self.bytes -= evicted_size
+
+    def delete(self, key: Hashable) -> None:
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry[2]
+
+    def clear(self) -> None:
+        self._data.clear()
+        self.bytes = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+_MISSING = object()
+
+def json_size(value: Any) -> int:
+    """Approximate the memory held by a JSON-like value by its encoded size"""
+    return len(json.dumps(value, default=str))
+
+class SingleFlight:
+    """Share one in-flight call between concurrent callers of the same key
+
+    The call is cancelled once every caller waiting on it has been
+    cancelled, so a timeout or a closed stream stops the work nobody needs.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        self._waiters: Dict[asyncio.Task, int] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._calls.get(key)
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda _, key=key, task=task: self._forget(key, task))
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        try:
+            # A cancelled caller must not cancel the call the others wait on
+            return await asyncio.shield(task)
+        finally:
+            self._leave(key, task)
+
+    def _leave(self, key: Hashable, task: asyncio.Task):
+        waiters = self._waiters.pop(task) - 1
+        if waiters:
+            self._waiters[task] = waiters
+        elif not task.done():
+            # The last caller left: callers arriving from now on start anew
+            task.cancel()
+            self._forget(key, task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+class SQLiteCacheBackend:
+    """Persistent cache store in a SQLite file, so entries survive restarts
+
+    The file can be shared by the worker processes of a server, which then
+    see each other's entries.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.state = SQLiteState(path, [
+            "CREATE TABLE IF NOT EXISTS cache_entries "
+            "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        ])
+
+    def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        """(value, expires_at) of a live entry, None when missing or expired"""
+        row = self.state.connection().execute(
+            "SELECT value, expires_at FROM cache_entries WHERE key = ? AND expires_at > ?", (key, time.time())
+        ).fetchone()
+        return (json.loads(row[0]), row[1]) if row else None
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        self.state.connection().execute(
+            "INSERT OR REPLACE INTO cache_entries (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, json.dumps(value, default=str), time.time() + ttl),
+        )
+
+    def delete(self, key: str) -> None:
+        self.state.connection().execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+
+    def purge_expired(self) -> int:
+        return self.state.connection().execute(
+            "DELETE FROM cache_entries WHERE expires_at <= ?", (time.time(),)
+        ).rowcount
+
+class ResultCache:
+    """Two-level cache for collector results with single-flight lookups
+
+    Results live in a bounded in-memory LRU and, when a backend is given,
+    in a persistent store that is consulted on memory misses. Concurrent
+    requests for the same key share one call to the collector.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        max_bytes: Optional[int] = None,
+        backend: Optional[SQLiteCacheBackend] = None,
+    ):
+        self.memory = TTLCache(maxsize=max_entries, max_bytes=max_bytes, sizeof=json_size if max_bytes else None)
+        self.backend = backend
+        self.flights = SingleFlight()
+        self.hits = 0
+        self.misses = 0
+
+    async def get_or_set(
+        self,
+        key: str,
+        ttl: float,
+        fn: Callable[[], Awaitable[Any]],
+        cacheable: Callable[[Any], bool] = lambda value: True,
+    ) -> Any:
+        """Return a copy of the cached value for key, computing and storing it on a miss
+
+        Each caller gets its own copy, so changing a result never changes
+        what the cache or the callers sharing a flight hold.
+        """
+        value = self.memory.get(key, _MISSING)
+        if value is not _MISSING:
+            self.hits += 1
+            return copy.deepcopy(value)
+        return copy.deepcopy(await self.flights.do(key, lambda: self._load(key, ttl, fn, cacheable)))
+
+    async def _load(self, key: str, ttl: float, fn, cacheable) -> Any:
+        if self.backend:
+            entry = await asyncio.to_thread(self.backend.get, key)
+            if entry is not None:
+                value, expires_at = entry
+                self.hits += 1
+                # Only for the rest of the stored entry's life, or a result
+                # read near its expiry would be served for another full ttl
+                self.memory.set(key, value, expires_at - time.time())
+                return value
+
+        self.misses += 1
+        value = await fn()
+        if cacheable(value):
+            self.memory.set(key, value, ttl)
+            if self.backend:
+                await asyncio.to_thread(self.backend.set, key, value, ttl)
+        return value
+
+    async def invalidate(self, key: str):
+        self.memory.delete(key)
+        if self.backend:
+            await asyncio.to_thread(self.backend.delete, key)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self.memory),
+            "bytes": self.memory.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "in_flight": len(self.flights),
+            "persistent": self.backend is not None,
+        }
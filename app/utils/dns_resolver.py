@@ -0,0 +1,33 @@
+import dns.asyncresolver
+import dns.resolver
+from typing import List, Optional
+from core.config import settings
+
+def build_resolver(
+    nameservers: Optional[List[str]] = None,
+    port: Optional[int] = None,
+    timeout: Optional[float] = None,
+    lifetime: Optional[float] = None,
+) -> dns.asyncresolver.Resolver:
+    """Build an async resolver from settings, overriding any given option"""
+    nameservers = nameservers if nameservers is not None else settings.DNS_NAMESERVERS
+    try:
+        resolver = dns.asyncresolver.Resolver(configure=not nameservers)
+    except dns.resolver.NoResolverConfiguration:
+        resolver = dns.asyncresolver.Resolver(configure=False)
+        nameservers = nameservers or ["8.8.8.8", "1.1.1.1"]
+    if nameservers:
+        resolver.nameservers = list(nameservers)
+    resolver.port = port if port is not None else settings.DNS_PORT
+    resolver.timeout = timeout if timeout is not None else settings.DNS_TIMEOUT
+    resolver.lifetime = lifetime if lifetime is not None else settings.DNS_LIFETIME
+    return resolver
+
+_resolver: Optional[dns.asyncresolver.Resolver] = None
+
+def get_resolver() -> dns.asyncresolver.Resolver:
+    """Return the shared, configured async resolver"""
+    global _resolver
+    if _resolver is None:
+        _resolver = build_resolver()
+    return _resolver
@@ -0,0 +1,134 @@
+import asyncio
+import mmap
+import os
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+from core.config import settings
+from core.logging import get_logger
+from utils.bloom import BloomFilter, bloom_signature
+from utils.parsers import SCANNER_KEYS, DataParser
+
+logger = get_logger(__name__)
+
+WHITESPACE = re.compile(rb'\s')
+
+# Kinds compared and reported in lower case
+CASE_INSENSITIVE_KINDS = {'emails', 'domains'}
+
+# A value found in a chunk, with its Bloom filter signature (word, mask)
+Found = Tuple[str, int, int]
+
+def _extract_range(
+    path: str, start: int, end: int, overlap: int, kinds: Tuple[str, ...], bloom: Tuple[int, int]
+) -> Dict[str, List[Found]]:
+    """Extract from the tokens that start in [start, end) of a file
+
+    The token cut by start belongs to the previous range and is skipped; the
+    token cut by end is completed from up to overlap bytes past it. Runs in
+    a worker process and maps the file itself, so only offsets and results
+    cross the process boundary. Values are hashed here too, leaving the
+    parent a single word comparison per value.
+    """
+    with open(path, 'rb') as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        size = len(mapped)
+        if start > 0 and not mapped[start - 1:start].isspace():
+            boundary = WHITESPACE.search(mapped, start, end)
+            if boundary is None:
+                return {kind: [] for kind in kinds}
+            start = boundary.start()
+        if end < size and not mapped[end - 1:end].isspace():
+            boundary = WHITESPACE.search(mapped, end, min(size, end + overlap))
+            end = boundary.start() if boundary else min(size, end + overlap)
+        # ASCII whitespace never occurs inside a multi-byte UTF-8 sequence, so cuts are clean
+        text = mapped[start:end].decode('utf-8', errors='replace')
+
+    found = DataParser.extract_all(text)
+    words, hashes = bloom
+    result: Dict[str, List[Found]] = {}
+    for kind in kinds:
+        values = found[kind]
+        if kind in CASE_INSENSITIVE_KINDS:
+            values = dict.fromkeys(value.lower() for value in values)
+        result[kind] = [(value, *bloom_signature(f"{kind}:{value}", words, hashes)) for value in values]
+    return result
+
+class FileExtractor:
+    """Stream the emails, domains, phones and usernames found in a large file
+
+    The file is memory-mapped and split into fixed-size byte ranges that are
+    scanned by a pool of worker processes, a bounded number at a time, and
+    values are deduplicated through a Bloom filter. Peak memory depends on
+    the chunk size, the number of workers and the filter capacity, not on
+    the size of the file.
+    """
+
+    def __init__(
+        self,
+        kinds: Iterable[str] = ('emails', 'domains'),
+        chunk_size: Optional[int] = None,
+        overlap: Optional[int] = None,
+        workers: Optional[int] = None,
+        dedupe_capacity: Optional[int] = None,
+        dedupe_error_rate: Optional[float] = None,
+    ):
+        self.kinds = tuple(kinds)
+        unknown = set(self.kinds) - set(SCANNER_KEYS.values())
+        if unknown:
+            raise ValueError(f"Unknown extraction kinds: {', '.join(sorted(unknown))}")
+        self.chunk_size = chunk_size or settings.EXTRACT_CHUNK_SIZE
+        self.overlap = overlap or settings.EXTRACT_MAX_TOKEN_LENGTH
+        self.workers = workers or settings.EXTRACT_WORKERS or os.cpu_count() or 1
+        self.dedupe_capacity = dedupe_capacity or settings.EXTRACT_DEDUPE_CAPACITY
+        self.dedupe_error_rate = dedupe_error_rate or settings.EXTRACT_DEDUPE_ERROR_RATE
+
+    def ranges(self, size: int) -> List[Tuple[int, int]]:
+        return [(start, min(size, start + self.chunk_size)) for start in range(0, size, self.chunk_size)]
+
+    async def extract(self, path: str) -> AsyncIterator[Tuple[str, str]]:
+        """Yield each distinct (kind, value) of the file once, in file order"""
+        size = os.path.getsize(path)
+        if size == 0:
+            return
+
+        seen = BloomFilter(self.dedupe_capacity, self.dedupe_error_rate)
+        loop = asyncio.get_running_loop()
+        ranges = iter(self.ranges(size))
+        pending = deque()
+
+        pool = ProcessPoolExecutor(max_workers=self.workers)
+        try:
+            def submit():
+                chunk = next(ranges, None)
+                if chunk is not None:
+                    pending.append(loop.run_in_executor(
+                        pool, _extract_range, path, *chunk, self.overlap, self.kinds, (seen.words, seen.hashes)
+                    ))
+
+            # Keep twice as many ranges in flight as workers, so they never idle
+            # and finished results do not pile up while the consumer is busy
+            for _ in range(self.workers * 2):
+                submit()
+            while pending:
+                found = await pending.popleft()
+                submit()
+                for kind in self.kinds:
+                    for value, word, mask in found[kind]:
+                        if seen.add_signature(word, mask):
+                            yield kind, value
+        finally:
+            # Never wait for the workers on the event loop: when the consumer
+            # stops early, drop the ranges not started yet and let the busy
+            # workers finish in the background
+            for future in pending:
+                future.cancel()
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        if seen.count > self.dedupe_capacity:
+            logger.warning(
+                "Extracted %s distinct values from %s, over the dedupe capacity of %s: "
+                "some distinct values may have been dropped as duplicates",
+                seen.count, path, self.dedupe_capacity,
+            )
@@ -1,38 +1,152 @@
 import aiohttp
 import asyncio
+import contextlib
+import socket
+import time
 from typing import Dict, Any, Optional
-from core.logging import logger
+from urllib.parse import urlsplit
+from core.config import settings
+from core.logging import get_logger
+from core.metrics import HTTP_REQUEST_DURATION, HTTP_RESPONSES
+from utils.resilience import UpstreamError, parse_retry_after
+
+logger = get_logger(__name__)
 
 class HttpClient:
-    """Async HTTP client for OSINT data collection"""
+    """Async HTTP client for OSINT data collection
+
+    The client keeps one pooled ``aiohttp.ClientSession`` open for its whole
+    lifetime, so connections, TLS sessions and DNS answers are reused across
+    calls. Use it as an async context manager, or call ``start()``/``close()``
+    explicitly (the application does this from its lifespan hook).
+    """
 
-    def __init__(self, timeout: int = 30, user_agent: str = "OSINT-Tool/1.0"):
-        self.timeout = aiohttp.ClientTimeout(total=timeout)
+    def __init__(
+        self,
+        timeout: Optional[int] = None,
+        user_agent: str = "OSINT-Tool/1.0",
+        limit: Optional[int] = None,
+        limit_per_host: Optional[int] = None,
+        keepalive_timeout: Optional[float] = None,
+        dns_cache_ttl: Optional[int] = None,
+    ):
+        self.timeout = aiohttp.ClientTimeout(total=timeout or settings.HTTP_TIMEOUT)
         self.user_agent = user_agent
+        self.limit = settings.HTTP_POOL_LIMIT if limit is None else limit
+        self.limit_per_host = settings.HTTP_POOL_LIMIT_PER_HOST if limit_per_host is None else limit_per_host
+        self.keepalive_timeout = settings.HTTP_KEEPALIVE_TIMEOUT if keepalive_timeout is None else keepalive_timeout
+        self.dns_cache_ttl = settings.HTTP_DNS_CACHE_TTL if dns_cache_ttl is None else dns_cache_ttl
         self.session: Optional[aiohttp.ClientSession] = None
 
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession(
-            timeout=self.timeout,
-            headers={"User-Agent": self.user_agent}
-        )
+        await self.start()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
+        await self.close()
+
+    async def start(self) -> "HttpClient":
+        """Open the pooled session if it is not open yet"""
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=self.dns_cache_ttl,
+                use_dns_cache=True,
+            )
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=self.timeout,
+                headers={"User-Agent": self.user_agent},
+            )
+        return self
+
+    async def close(self):
+        """Close the pooled session and all of its connections"""
+        if self.session and not self.session.closed:
             await self.session.close()
+        self.session = None
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        # Lazily open the pool when the client is used outside of the
+        # application lifespan (scripts, tests). A session is bound to the
+        # loop it was created on, so a new loop gets a fresh pool.
+        if self.session is not None and getattr(self.session, "_loop", None) is not asyncio.get_running_loop():
+            await self._discard_session()
+        await self.start()
+        return self.session
+
+    async def _discard_session(self):
+        """Drop a session of another loop, closing its pooled connections"""
+        session, self.session = self.session, None
+        connector = session.connector
+        # session.close() would have to run on the session's loop; detaching
+        # marks it closed and leaves the connector to be closed here
+        session.detach()
+        if connector is None or connector.closed:
+            return
+        if connector._loop.is_closed():
+            # Transports cannot be closed once their loop is, so end the
+            # connections themselves to release the upstream sockets
+            for conns in getattr(connector, "_conns", {}).values():
+                for protocol, _ in conns:
+                    sock = protocol.transport.get_extra_info("socket") if protocol.transport else None
+                    if sock is not None:
+                        with contextlib.suppress(OSError):
+                            sock.shutdown(socket.SHUT_RDWR)
+        await connector.close()
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """Return open, idle and in-use connection counts per host"""
+        stats: Dict[str, Any] = {
+            "open": self.session is not None and not self.session.closed,
+            "limit": self.limit,
+            "limit_per_host": self.limit_per_host,
+            "hosts": {},
+        }
+        if not stats["open"]:
+            return stats
+
+        connector = self.session.connector
+        hosts: Dict[str, Dict[str, int]] = {}
+
+        def host_entry(key) -> Dict[str, int]:
+            name = f"{key.host}:{key.port}"
+            return hosts.setdefault(name, {"open": 0, "idle": 0, "in_use": 0})
 
-    async def get(self, url: str, params: Optional[Dict[str, Any]] = None, **kwargs) -> Dict[str, Any]:
-        """Make GET request"""
-        if not self.session:
-            async with aiohttp.ClientSession(timeout=self.timeout, headers={"User-Agent": self.user_agent}) as session:
-                return await self._get(session, url, params, **kwargs)
-        else:
-            return await self._get(self.session, url, params, **kwargs)
+        for key, conns in getattr(connector, "_conns", {}).items():
+            entry = host_entry(key)
+            entry["idle"] += len(conns)
+        for key, acquired in getattr(connector, "_acquired_per_host", {}).items():
+            entry = host_entry(key)
+            entry["in_use"] += len(acquired)
+        for entry in hosts.values():
+            entry["open"] = entry["idle"] + entry["in_use"]
 
-    async def _get(self, session: aiohttp.ClientSession, url: str, params: Optional[Dict[str, Any]] = None, **kwargs) -> Dict[str, Any]:
+        stats["hosts"] = hosts
+        stats["total"] = {
+            "open": sum(e["open"] for e in hosts.values()),
+            "idle": sum(e["idle"] for e in hosts.values()),
+            "in_use": sum(e["in_use"] for e in hosts.values()),
+        }
+        return stats
+
+    async def get(self, url: str, params: Optional[Dict[str, Any]] = None, raise_for_status: bool = False, **kwargs) -> Dict[str, Any]:
+        """Make GET request
+
+        Failures are returned as ``{"error": ...}`` dicts, or raised as
+        UpstreamError (carrying the status and Retry-After) when
+        ``raise_for_status`` is set, so retry policies can act on them.
+        """
+        session = await self._get_session()
+        return await self._get(session, url, params, raise_for_status=raise_for_status, **kwargs)
+
+    async def _get(self, session: aiohttp.ClientSession, url: str, params: Optional[Dict[str, Any]] = None, raise_for_status: bool = False, **kwargs) -> Dict[str, Any]:
+        started, status = time.perf_counter(), "error"
         try:
             async with session.get(url, params=params, **kwargs) as response:
+                status = response.status
                 if response.status == 200:
                     content_type = response.headers.get('Content-Type', '')
                     if 'application/json' in content_type:
@@ -40,27 +154,62 @@ class HttpClient:
                     else:
                         return {"text": await response.text()}
                 else:
-                    logger.warning(f"HTTP {response.status} for {url}")
-                    return {"error": f"HTTP {response.status}", "status": response.status}
+                    logger.warning("HTTP %s for %s", response.status, url)
+                    return self._error_response(response, raise_for_status)
+        except UpstreamError:
+            raise
         except Exception as e:
-            logger.error(f"Request failed for {url}: {str(e)}")
+            logger.error("Request failed for %s: %s", url, e)
+            if raise_for_status:
+                raise UpstreamError(f"Request failed for {url}: {str(e)}") from e
             return {"error": str(e)}
+        finally:
+            self._observe("GET", url, status, started)
 
-    async def post(self, url: str, data: Optional[Dict[str, Any]] = None, **kwargs) -> Dict[str, Any]:
+    async def post(self, url: str, data: Optional[Dict[str, Any]] = None, raise_for_status: bool = False, **kwargs) -> Dict[str, Any]:
         """Make POST request"""
-        if not self.session:
-            async with aiohttp.ClientSession(timeout=self.timeout, headers={"User-Agent": self.user_agent}) as session:
-                return await self._post(session, url, data, **kwargs)
-        else:
-            return await self._post(self.session, url, data, **kwargs)
+        session = await self._get_session()
+        return await self._post(session, url, data, raise_for_status=raise_for_status, **kwargs)
 
-    async def _post(self, session: aiohttp.ClientSession, url: str, data: Optional[Dict[str, Any]] = None, **kwargs) -> Dict[str, Any]:
+    async def _post(self, session: aiohttp.ClientSession, url: str, data: Optional[Dict[str, Any]] = None, raise_for_status: bool = False, **kwargs) -> Dict[str, Any]:
+        started, status = time.perf_counter(), "error"
         try:
             async with session.post(url, json=data, **kwargs) as response:
+                status = response.status
                 if response.status in [200, 201]:
                     return await response.json()
                 else:
-                    return {"error": f"HTTP {response.status}", "status": response.status}
+                    return self._error_response(response, raise_for_status)
+        except UpstreamError:
+            raise
         except Exception as e:
-            logger.error(f"POST request failed for {url}: {str(e)}")
-            return {"error": str(e)}
\ No newline at end of file
+            logger.error("POST request failed for %s: %s", url, e)
+            if raise_for_status:
+                raise UpstreamError(f"POST request failed for {url}: {str(e)}") from e
+            return {"error": str(e)}
+        finally:
+            self._observe("POST", url, status, started)
+
+    @staticmethod
+    def _observe(method: str, url: str, status, started: float):
+        host = urlsplit(url).hostname or "unknown"
+        HTTP_REQUEST_DURATION.labels(host, method).observe(time.perf_counter() - started)
+        HTTP_RESPONSES.labels(host, method, str(status)).inc()
+
+    @staticmethod
+    def _error_response(response: aiohttp.ClientResponse, raise_for_status: bool) -> Dict[str, Any]:
+        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        if raise_for_status:
+            raise UpstreamError(f"HTTP {response.status} for {response.url}", status=response.status, retry_after=retry_after)
+        error = {"error": f"HTTP {response.status}", "status": response.status}
+        if retry_after is not None:
+            error["retry_after"] = retry_after
+        return error
+
+
+# Application-wide pooled client, opened and closed by the FastAPI lifespan
+http_client = HttpClient()
+
+def get_http_client() -> HttpClient:
+    """Return the shared application HTTP client"""
+    return http_client
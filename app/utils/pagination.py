@@ -0,0 +1,60 @@
+import base64
+import json
+from typing import Any, AsyncIterator, List, Optional, Type
+from pydantic import BaseModel as Schema
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+from core.config import settings
+from models.base import BaseModel
+
+def encode_cursor(last_id: int) -> str:
+    """Build the opaque cursor that resumes a listing after last_id"""
+    return base64.urlsafe_b64encode(json.dumps({"id": last_id}).encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> int:
+    """Return the id encoded in a cursor, ValueError when it is malformed"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        last_id = json.loads(base64.urlsafe_b64decode(padded.encode()))["id"]
+    except (ValueError, TypeError, KeyError) as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(last_id, int):
+        raise ValueError("Invalid cursor")
+    return last_id
+
+def keyset_page(query: Select, model: Type[BaseModel], limit: int, after_id: Optional[int] = None, skip: int = 0) -> Select:
+    """Page a query by primary key
+
+    Ids are assigned in insertion order, so they follow created_at and the
+    primary key index serves ``id > after_id`` directly however deep the
+    page is. ``skip`` is only honored without a cursor, for old clients.
+    """
+    query = query.order_by(model.id).limit(limit)
+    if after_id is not None:
+        return query.where(model.id > after_id)
+    return query.offset(skip) if skip else query
+
+def next_cursor(page: List[Any], limit: int) -> Optional[str]:
+    """Cursor of the page after this one, None on the last page"""
+    if limit <= 0 or len(page) < limit:
+        return None
+    return encode_cursor(page[-1].id)
+
+async def stream_ndjson(
+    db: AsyncSession,
+    model: Type[BaseModel],
+    schema: Type[Schema],
+    batch_size: Optional[int] = None,
+) -> AsyncIterator[str]:
+    """Yield every row of a table as NDJSON, one batch of lines at a time
+
+    Rows come from a server-side cursor as plain column tuples, so memory
+    stays flat however large the table is.
+    """
+    batch_size = batch_size or settings.EXPORT_BATCH_SIZE
+    query = select(model.__table__).order_by(model.id).execution_options(yield_per=batch_size)
+    result = await db.stream(query)
+    async for rows in result.partitions():
+        yield "".join(schema(**row._mapping).json() + "\n" for row in rows)
@@ -1,46 +1,110 @@
 import re
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 from urllib.parse import urlparse
 
+# Public suffixes made of two labels, used to find the registrable domain.
+# Not the full Public Suffix List, but it covers the registries we query most.
+MULTI_LABEL_SUFFIXES = {
+    'com.py', 'org.py', 'net.py', 'edu.py', 'gov.py', 'mil.py', 'coop.py',
+    'com.ar', 'org.ar', 'net.ar', 'gob.ar', 'edu.ar',
+    'com.br', 'org.br', 'net.br', 'gov.br', 'edu.br',
+    'com.mx', 'org.mx', 'gob.mx', 'com.co', 'gov.co', 'com.uy', 'com.bo', 'com.pe', 'com.ec',
+    'co.uk', 'org.uk', 'ac.uk', 'gov.uk', 'me.uk', 'ltd.uk', 'plc.uk',
+    'com.au', 'net.au', 'org.au', 'edu.au', 'gov.au',
+    'co.nz', 'org.nz', 'co.za', 'co.jp', 'ne.jp', 'or.jp', 'ac.jp',
+    'com.cn', 'net.cn', 'org.cn', 'co.in', 'net.in', 'org.in', 'co.kr', 'com.tw', 'com.sg',
+    'com.es', 'com.tr', 'com.ru',
+}
+
+# Patterns are compiled once at import instead of looked up on every call
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b')
+PHONE_PATTERN = re.compile(r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b')
+USERNAME_PATTERN = re.compile(r'@(\w+)')
+DOMAIN_PATTERN = re.compile(r'\b(?:[a-zA-Z0-9-]+\.)+[a-zA-Z]{2,}\b')
+DOMAIN_FORMAT_PATTERN = re.compile(r'^(?:[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?\.)+[a-zA-Z]{2,}$')
+EMAIL_FORMAT_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+TWITTER_PATTERN = re.compile(r'@(\w{1,15})')
+LINKEDIN_PATTERN = re.compile(r'linkedin\.com/in/([a-zA-Z0-9-]+)')
+GITHUB_PATTERN = re.compile(r'github\.com/([a-zA-Z0-9-]+)')
+
+# One alternation of the extraction patterns, so a text is scanned once.
+# At each position the first branch that matches wins: an email is taken
+# whole, so its domain and "@" are not matched again as a domain or mention.
+# No branch can match across whitespace or inside a purely alphabetic word,
+# so only the whitespace-separated tokens that are not plain words are scanned.
+SCANNER_PATTERN = re.compile(
+    r'(?P<email>' + EMAIL_PATTERN.pattern + r')'
+    r'|(?P<domain>' + DOMAIN_PATTERN.pattern + r')'
+    r'|(?P<phone>' + PHONE_PATTERN.pattern + r')'
+    r'|@(?P<username>\w+)'
+)
+
+# Result key of each scanner group
+SCANNER_KEYS = {
+    'email': 'emails',
+    'phone': 'phones',
+    'domain': 'domains',
+    'username': 'usernames',
+}
+
 class DataParser:
     """Utility class for parsing OSINT data"""
 
     @staticmethod
     def extract_emails(text: str) -> List[str]:
         """Extract email addresses from text"""
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        return list(set(re.findall(email_pattern, text)))
+        return list(set(EMAIL_PATTERN.findall(text)))
 
     @staticmethod
     def extract_phone_numbers(text: str) -> List[str]:
         """Extract phone numbers from text (basic implementation)"""
         # Basic phone pattern - can be enhanced
-        phone_pattern = r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b'
-        return list(set(re.findall(phone_pattern, text)))
+        return list(set(PHONE_PATTERN.findall(text)))
 
     @staticmethod
     def extract_usernames(text: str) -> List[str]:
         """Extract potential usernames from text"""
         # Look for @mentions or common username patterns
-        username_pattern = r'@(\w+)'
-        return list(set(re.findall(username_pattern, text)))
+        return list(set(USERNAME_PATTERN.findall(text)))
 
     @staticmethod
     def extract_domains(text: str) -> List[str]:
         """Extract domains from text"""
-        domain_pattern = r'\b([a-zA-Z0-9-]+\.)+[a-zA-Z]{2,}\b'
-        domains = re.findall(domain_pattern, text)
-        return list(set(domains))
+        return list(set(DOMAIN_PATTERN.findall(text)))
+
+    @staticmethod
+    def scan(text: str) -> Iterator[Tuple[str, str]]:
+        """Yield (kind, value) for every email, phone, domain and @username in one pass over text"""
+        finditer = SCANNER_PATTERN.finditer
+        for token in text.split():
+            if token.isalpha():
+                continue
+            for match in finditer(token):
+                kind = match.lastgroup
+                yield kind, match.group(kind)
+
+    @staticmethod
+    def extract_all(text: str) -> Dict[str, List[str]]:
+        """Extract emails, phones, domains and usernames from text in a single pass
+
+        Values are deduplicated in order of appearance. The domains of the
+        emails found are included in the domains.
+        """
+        found: Dict[str, Dict[str, None]] = {key: {} for key in SCANNER_KEYS.values()}
+        domains = found['domains']
+        for kind, value in DataParser.scan(text):
+            found[SCANNER_KEYS[kind]][value] = None
+            if kind == 'email':
+                domains[value.rsplit('@', 1)[1]] = None
+        return {key: list(values) for key, values in found.items()}
 
     @staticmethod
     def parse_whois(raw_whois: str) -> Dict[str, Any]:
         """Parse WHOIS data into structured format"""
         parsed = {}
-        lines = raw_whois.split('\n')
-
-        for line in lines:
-            if ':' in line:
-                key, value = line.split(':', 1)
+        for line in raw_whois.split('\n'):
+            key, separator, value = line.partition(':')
+            if separator:
                 key = key.strip().lower().replace(' ', '_')
                 value = value.strip()
                 if key and value:
@@ -48,17 +112,27 @@ class DataParser:
 
         return parsed
 
+    @staticmethod
+    def registrable_domain(domain: str) -> str:
+        """Reduce a host name to its registrable domain (e.g. www.example.com.py -> example.com.py)"""
+        domain = domain.strip().lower().rstrip('.')
+        if '://' in domain:
+            domain = urlparse(domain).hostname or ''
+        labels = [label for label in domain.split('.') if label]
+        if len(labels) <= 2:
+            return '.'.join(labels)
+        suffix_length = 2 if '.'.join(labels[-2:]) in MULTI_LABEL_SUFFIXES else 1
+        return '.'.join(labels[-(suffix_length + 1):])
+
     @staticmethod
     def validate_domain(domain: str) -> bool:
         """Validate domain format"""
-        pattern = r'^(?:[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?\.)+[a-zA-Z]{2,}$'
-        return bool(re.match(pattern, domain))
+        return bool(DOMAIN_FORMAT_PATTERN.match(domain))
 
     @staticmethod
     def validate_email(email: str) -> bool:
         """Validate email format"""
-        pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        return bool(re.match(pattern, email))
+        return bool(EMAIL_FORMAT_PATTERN.match(email))
 
     @staticmethod
     def extract_social_profiles(text: str) -> Dict[str, List[str]]:
@@ -72,15 +146,12 @@ class DataParser:
         }
 
         # Twitter handles
-        twitter_pattern = r'@(\w{1,15})'
-        profiles['twitter'] = re.findall(twitter_pattern, text)
+        profiles['twitter'] = TWITTER_PATTERN.findall(text)
 
         # LinkedIn URLs
-        linkedin_pattern = r'linkedin\.com/in/([a-zA-Z0-9-]+)'
-        profiles['linkedin'] = re.findall(linkedin_pattern, text)
+        profiles['linkedin'] = LINKEDIN_PATTERN.findall(text)
 
         # GitHub usernames
-        github_pattern = r'github\.com/([a-zA-Z0-9-]+)'
-        profiles['github'] = re.findall(github_pattern, text)
+        profiles['github'] = GITHUB_PATTERN.findall(text)
 
         return profiles
\ No newline at end of file
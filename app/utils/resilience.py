@@ -0,0 +1,245 @@
+import asyncio
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, Optional, Union
+from core.config import settings
+from core.logging import get_logger
+from utils.shared_state import SQLiteState
+
+logger = get_logger(__name__)
+
+class UpstreamError(Exception):
+    """An upstream call failed with an HTTP status or a transport error"""
+
+    def __init__(self, message: str, status: Optional[int] = None, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+    @property
+    def retryable(self) -> bool:
+        # Transport errors (no status), timeouts, throttling and server errors
+        return self.status is None or self.status in (408, 425, 429) or self.status >= 500
+
+class CircuitOpenError(Exception):
+    """The circuit breaker of an upstream is open, so the call was not made"""
+
+    def __init__(self, upstream: str, retry_in: float):
+        super().__init__(f"Circuit open for {upstream}, retry in {retry_in:.1f}s")
+        self.upstream = upstream
+        self.retry_in = retry_in
+
+def is_retryable(exc: BaseException) -> bool:
+    if isinstance(exc, UpstreamError):
+        return exc.retryable
+    return isinstance(exc, (asyncio.TimeoutError, ConnectionError, OSError))
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given in seconds or as an HTTP date"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+def backoff_delay(
+    attempt: int,
+    base: Optional[float] = None,
+    cap: Optional[float] = None,
+    retry_after: Optional[float] = None,
+) -> float:
+    """Exponential backoff with full jitter, never shorter than Retry-After"""
+    base = settings.RETRY_BASE_DELAY if base is None else base
+    cap = settings.RETRY_MAX_DELAY if cap is None else cap
+    delay = random.uniform(0, min(cap, base * (2 ** attempt)))
+    if retry_after is not None:
+        delay = max(delay, min(retry_after, cap))
+    return delay
+
+class TokenBucket:
+    """Token-bucket rate limiter: ``rate`` calls per second with bursts of ``burst``"""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        """Wait until a call is allowed
+
+        A token is reserved immediately (the balance may go negative), so
+        callers are served in arrival order without busy-waiting.
+        """
+        self._refill()
+        self.tokens -= 1
+        if self.tokens < 0:
+            await asyncio.sleep(-self.tokens / self.rate)
+
+class SQLiteTokenBucket:
+    """TokenBucket whose balance lives in a SQLite file shared by processes
+
+    Every worker process of a server draws from the same bucket, so an
+    upstream sees the configured rate in total rather than once per worker.
+    """
+
+    def __init__(self, state: SQLiteState, name: str, rate: float, burst: int = 1):
+        self.state = state
+        self.name = name
+        self.rate = rate
+        self.burst = max(1, burst)
+
+    def _reserve(self) -> float:
+        """Take a token and return how long to wait for it"""
+        with self.state.transaction() as conn:
+            row = conn.execute("SELECT tokens, updated FROM rate_limits WHERE name = ?", (self.name,)).fetchone()
+            # Wall clock time, as monotonic clocks are not comparable across processes
+            now = time.time()
+            tokens = float(self.burst) if row is None else min(self.burst, row[0] + max(0.0, now - row[1]) * self.rate)
+            tokens -= 1
+            conn.execute(
+                "INSERT OR REPLACE INTO rate_limits (name, tokens, updated) VALUES (?, ?, ?)", (self.name, tokens, now)
+            )
+        return -tokens / self.rate if tokens < 0 else 0.0
+
+    async def acquire(self):
+        """Wait until a call is allowed, as TokenBucket.acquire"""
+        wait = await asyncio.to_thread(self._reserve)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+class CircuitBreaker:
+    """Stop calling an upstream after repeated failures, then probe it again
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    calls fail fast for ``reset_timeout`` seconds. Then one trial call is let
+    through: success closes the circuit, failure opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+
+    def before_call(self):
+        """Raise CircuitOpenError when the call must not be made"""
+        if self.state == self.CLOSED:
+            return
+        now = time.monotonic()
+        retry_in = self.opened_at + self.reset_timeout - now
+        if retry_in <= 0:
+            # Let one trial call through; another one may follow if it never reports back
+            self.state = self.HALF_OPEN
+            self.opened_at = now
+            return
+        raise CircuitOpenError(self.name, max(0.0, retry_in))
+
+    def record_success(self):
+        self.state = self.CLOSED
+        self.failures = 0
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                logger.warning("Circuit opened for %s after %s failures", self.name, self.failures)
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+_rate_limiters: Dict[str, Union[TokenBucket, SQLiteTokenBucket, None]] = {}
+_circuit_breakers: Dict[str, CircuitBreaker] = {}
+_rate_limit_state: Optional[SQLiteState] = None
+
+def _shared_rate_limit_state() -> SQLiteState:
+    global _rate_limit_state
+    if _rate_limit_state is None or _rate_limit_state.path != settings.SHARED_STATE_PATH:
+        _rate_limit_state = SQLiteState(settings.SHARED_STATE_PATH, [
+            "CREATE TABLE IF NOT EXISTS rate_limits (name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+        ])
+    return _rate_limit_state
+
+def get_rate_limiter(
+    upstream: str, rate: Optional[float] = None, burst: Optional[int] = None
+) -> Union[TokenBucket, SQLiteTokenBucket, None]:
+    """Return the shared limiter of an upstream, None when it is unlimited
+
+    With SHARED_STATE_PATH set the bucket is shared by all the processes
+    using that file.
+    """
+    if upstream not in _rate_limiters:
+        rate = settings.RATE_LIMITS.get(upstream, settings.RATE_LIMIT_DEFAULT) if rate is None else rate
+        burst = settings.RATE_LIMIT_BURST if burst is None else burst
+        if not rate or rate <= 0:
+            _rate_limiters[upstream] = None
+        elif settings.SHARED_STATE_PATH:
+            _rate_limiters[upstream] = SQLiteTokenBucket(_shared_rate_limit_state(), upstream, rate, burst)
+        else:
+            _rate_limiters[upstream] = TokenBucket(rate, burst)
+    return _rate_limiters[upstream]
+
+def get_circuit_breaker(upstream: str) -> CircuitBreaker:
+    """Return the shared circuit breaker of an upstream"""
+    breaker = _circuit_breakers.get(upstream)
+    if breaker is None:
+        breaker = _circuit_breakers[upstream] = CircuitBreaker(
+            upstream,
+            failure_threshold=settings.CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+            reset_timeout=settings.CIRCUIT_BREAKER_RESET_TIMEOUT,
+        )
+    return breaker
+
+async def call_with_resilience(
+    upstream: str,
+    fn: Callable[[], Awaitable[Any]],
+    max_attempts: Optional[int] = None,
+) -> Any:
+    """Call fn under the rate limiter, circuit breaker and retry policy of an upstream
+
+    Only retryable errors are retried, with jittered exponential backoff
+    that honors Retry-After. Other errors are raised at once.
+    """
+    breaker = get_circuit_breaker(upstream)
+    limiter = get_rate_limiter(upstream)
+    attempts = max(1, max_attempts or settings.RETRY_MAX_ATTEMPTS)
+
+    for attempt in range(attempts):
+        breaker.before_call()
+        if limiter:
+            await limiter.acquire()
+        try:
+            result = await fn()
+        except Exception as e:
+            if not is_retryable(e):
+                if isinstance(e, UpstreamError):
+                    # The upstream answered; the request itself was bad
+                    breaker.record_success()
+                # Anything else failed on this side and says nothing about
+                # the upstream
+                raise
+            breaker.record_failure()
+            if attempt == attempts - 1:
+                raise
+            delay = backoff_delay(attempt, retry_after=getattr(e, "retry_after", None))
+            logger.warning("Attempt %s failed for %s: %s; retrying in %.2fs", attempt + 1, upstream, e, delay)
+            await asyncio.sleep(delay)
+        else:
+            breaker.record_success()
+            return result
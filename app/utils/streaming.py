@@ -0,0 +1,18 @@
+import json
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Optional
+
+def sse_event(event: str, data: Any, id: Optional[str] = None) -> str:
+    """Format one Server-Sent Events message; data that is not a string is sent as JSON"""
+    if not isinstance(data, str):
+        data = json.dumps(data, default=str)
+    lines = [f"id: {id}"] if id is not None else []
+    lines.append(f"event: {event}")
+    lines.extend(f"data: {line}" for line in data.splitlines() or [""])
+    return "\n".join(lines) + "\n\n"
+
+async def sse_stream(events: AsyncIterable[Dict[str, Any]]) -> AsyncIterator[str]:
+    """Format collector events ({"event": ..., **payload}) as Server-Sent Events, then an end event"""
+    async for event in events:
+        payload = {key: value for key, value in event.items() if key != "event"}
+        yield sse_event(event["event"], payload)
+    yield sse_event("end", {})